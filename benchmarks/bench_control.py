@@ -0,0 +1,218 @@
+"""구독자 수백 명이 붙은 제어 소켓이 타이머 틱을 늦추는지 잽니다.
+
+메인 스레드는 Tk의 countdown처럼 정해진 간격으로 깨어나 늦은 정도를 기록하고,
+몇 틱마다 상태 이벤트를 publish() 합니다. 자식 프로세스는 구독자 여러 개를 붙여
+이벤트가 도착하기까지 걸린 시간을 재고, 동시에 query/start 명령의 왕복 시간도
+잽니다. 구독자가 없을 때와 붙었을 때의 틱 지연을 비교합니다.
+
+    python benchmarks/bench_control.py
+    python benchmarks/bench_control.py --clients 1000 --events 100 --json
+"""
+
+import argparse
+import json
+import os
+import select
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pomodoro_control import ControlServer, MainThreadCalls  # noqa: E402
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(seconds):
+    return {
+        "count": len(seconds),
+        "p50_ms": percentile(seconds, 0.50) * 1000 if seconds else None,
+        "p99_ms": percentile(seconds, 0.99) * 1000 if seconds else None,
+        "max_ms": max(seconds) * 1000 if seconds else None,
+    }
+
+
+async def run_clients(path, clients, events):
+    """구독자 clients개와 명령을 보내는 클라이언트 하나를 돌립니다."""
+    import asyncio
+
+    delivery = []
+    round_trips = []
+    done = asyncio.Event()
+
+    async def subscriber():
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b'{"command": "subscribe"}\n')
+        await writer.drain()
+        await reader.readline()
+        received = 0
+        while received < events:
+            line = await reader.readline()
+            if not line:
+                break
+            arrived = time.monotonic()
+            message = json.loads(line)
+            if "event" in message:
+                delivery.append(arrived - message["state"]["published_at"])
+                received += 1
+        writer.close()
+
+    async def commander():
+        reader, writer = await asyncio.open_unix_connection(path)
+        commands = (b'{"command": "query"}\n', b'{"command": "start"}\n')
+        sent = 0
+        while not done.is_set():
+            started = time.monotonic()
+            writer.write(commands[sent % 2])
+            await writer.drain()
+            await reader.readline()
+            round_trips.append(time.monotonic() - started)
+            sent += 1
+            await asyncio.sleep(0.01)
+        writer.close()
+
+    command_task = asyncio.ensure_future(commander())
+    await asyncio.gather(*(subscriber() for _ in range(clients)))
+    done.set()
+    await command_task
+    return delivery, round_trips
+
+
+def run_child(path, clients, events):
+    import asyncio
+
+    delivery, round_trips = asyncio.run(run_clients(path, clients, events))
+    print(
+        json.dumps(
+            {
+                "delivery": latency_summary(delivery),
+                "command_round_trip": latency_summary(round_trips),
+            }
+        )
+    )
+
+
+class TickLoop:
+    """Tk mainloop 대신 select로 잠들었다가 틱마다 깨어나는 메인 스레드입니다."""
+
+    def __init__(self, server, calls, tick_seconds, publish_every):
+        self.server = server
+        self.calls = calls
+        self.tick_seconds = tick_seconds
+        self.publish_every = publish_every
+        self.state = {"mode": "집중", "running": False, "deadline": None}
+
+    def execute(self, command, message):
+        self.state["running"] = command == "start" or self.state["running"]
+        return {"ok": True, "state": dict(self.state)}
+
+    def run(self, ticks=None, until=None):
+        """틱마다 늦어진 시간(초)의 목록을 반환합니다."""
+        lateness = []
+        next_tick = time.monotonic() + self.tick_seconds
+        count = 0
+        while (ticks is None or count < ticks) and (until is None or not until()):
+            timeout = max(0.0, next_tick - time.monotonic())
+            readable, _, _ = select.select([self.calls], [], [], timeout)
+            if readable:
+                self.calls.run_pending()
+            now = time.monotonic()
+            if now < next_tick:
+                continue
+            lateness.append(now - next_tick)
+            count += 1
+            if count % self.publish_every == 0:
+                self.server.publish(
+                    "tick", dict(self.state, published_at=time.monotonic())
+                )
+            next_tick += self.tick_seconds
+        return lateness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--tick-ms", type=float, default=20.0)
+    parser.add_argument("--publish-every", type=int, default=5, help="몇 틱마다")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.clients, args.events)
+        return None
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "control.sock")
+        calls = MainThreadCalls()
+        server = ControlServer(path, None, calls)
+        loop = TickLoop(server, calls, args.tick_ms / 1000, args.publish_every)
+        server.execute = loop.execute
+        server.start()
+        while not os.path.exists(path):
+            time.sleep(0.01)
+
+        baseline = loop.run(ticks=args.events * args.publish_every)
+        child = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--child",
+                path,
+                "--clients",
+                str(args.clients),
+                "--events",
+                str(args.events),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        # 구독자가 모두 붙을 때까지도 틱은 계속 돕니다.
+        connecting = loop.run(
+            until=lambda: server.subscriber_count() >= args.clients
+            or child.poll() is not None
+        )
+        loaded = loop.run(until=lambda: child.poll() is not None)
+        output = child.stdout.read()
+        server.close()
+        calls.close()
+    if child.returncode != 0:
+        sys.exit("구독자 프로세스가 실패했습니다.")
+
+    results = {
+        "clients": args.clients,
+        "events": args.events,
+        "tick_ms": args.tick_ms,
+        "subscribers_dropped": server.subscribers_dropped,
+        "tick_lateness_idle": latency_summary(baseline),
+        "tick_lateness_connecting": latency_summary(connecting),
+        "tick_lateness_loaded": latency_summary(loaded),
+    }
+    results.update(json.loads(output.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    print(f"구독자 {args.clients}명, 이벤트 {args.events}개, 틱 {args.tick_ms:g}ms")
+    for name, summary in results.items():
+        if not isinstance(summary, dict):
+            continue
+        values = ", ".join(
+            f"{key} {value:.3f}" if isinstance(value, float) else f"{key} {value}"
+            for key, value in summary.items()
+        )
+        print(f"  {name}: {values}")
+    print(f"  끊긴 구독자: {results['subscribers_dropped']}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""카운트다운 오차(drift)와 깨어남 지터를 측정합니다.
+
+기본은 가상 시계로 8시간 근무를 흉내 내며, 매 콜백이 무작위로 늦게 불리고
+가끔은 모달 창처럼 몇 초씩 멈추는 상황을 만듭니다. 예전 방식(after(1000)마다
+1초씩 빼기)이 쌓는 오차와 마감 시각 기반 엔진의 오차를 나란히 보여줍니다.
+
+    python benchmarks/bench_drift.py
+    python benchmarks/bench_drift.py --hours 8 --jitter-ms 15 --json
+    python benchmarks/bench_drift.py --realtime 120
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pomodoro_engine import PomodoroEngine, TimerSettings  # noqa: E402
+
+
+class VirtualClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def make_settings(work_minutes, rest_minutes):
+    return TimerSettings(
+        work_minutes=work_minutes,
+        rest_minutes=rest_minutes,
+        force_rest=False,
+        long_rest_cycle_threshold=None,
+        long_rest_duration=None,
+    )
+
+
+def callback_delay(rng, jitter_ms, stall_probability, stall_ms):
+    delay = rng.uniform(0, jitter_ms) / 1000
+    if rng.random() < stall_probability:
+        delay += rng.uniform(0, stall_ms) / 1000
+    return delay
+
+
+def simulate_legacy(hours, rng, jitter_ms, stall_probability, stall_ms):
+    """after(1000)을 이어 붙이던 예전 방식: 늦어진 만큼 그대로 쌓입니다."""
+    target = int(hours * 3600)
+    elapsed = 0.0
+    for _ in range(target):
+        elapsed += 1.0 + callback_delay(rng, jitter_ms, stall_probability, stall_ms)
+    return {"counted_seconds": target, "error_ms": (elapsed - target) * 1000}
+
+
+def simulate_engine(hours, rng, jitter_ms, stall_probability, stall_ms, work, rest):
+    clock = VirtualClock()
+    settings = make_settings(work, rest)
+    engine = PomodoroEngine(settings, clock=clock)
+    engine.start()
+    end = hours * 3600
+    while clock.time < end:
+        wakeup = engine.next_wakeup()
+        clock.time = max(clock.time, wakeup) + callback_delay(
+            rng, jitter_ms, stall_probability, stall_ms
+        )
+        engine.poll()
+    summary = engine.drift.summary()
+    summary["cycles"] = engine.pomodoro_cycles_today
+    summary["focus_seconds"] = engine.total_work_seconds_today
+    return summary
+
+
+def run_realtime(seconds):
+    """실제 시계와 time.sleep으로 깨어남 지터를 잽니다."""
+    settings = make_settings(1, 1)
+    engine = PomodoroEngine(settings)
+    engine.start()
+    end = engine.now() + seconds
+    while engine.now() < end:
+        wakeup = engine.next_wakeup()
+        time.sleep(max(0.0, wakeup - engine.now()))
+        engine.poll()
+    return engine.drift.summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--jitter-ms", type=float, default=15.0)
+    parser.add_argument("--stall-probability", type=float, default=0.001)
+    parser.add_argument("--stall-ms", type=float, default=3000.0)
+    parser.add_argument("--work-minutes", type=int, default=25)
+    parser.add_argument("--rest-minutes", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--realtime", type=float, metavar="SECONDS", help="실제 시계로 측정"
+    )
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.realtime:
+        results = {"realtime": run_realtime(args.realtime)}
+    else:
+        results = {
+            "hours": args.hours,
+            "legacy": simulate_legacy(
+                args.hours,
+                random.Random(args.seed),
+                args.jitter_ms,
+                args.stall_probability,
+                args.stall_ms,
+            ),
+            "deadline": simulate_engine(
+                args.hours,
+                random.Random(args.seed),
+                args.jitter_ms,
+                args.stall_probability,
+                args.stall_ms,
+                args.work_minutes,
+                args.rest_minutes,
+            ),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    for name, summary in results.items():
+        if not isinstance(summary, dict):
+            continue
+        print(f"[{name}]")
+        for key, value in summary.items():
+            if isinstance(value, float):
+                print(f"  {key}: {value:.3f}")
+            else:
+                print(f"  {key}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
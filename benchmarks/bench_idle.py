@@ -0,0 +1,141 @@
+"""창을 켜 두기만 했을 때 CPU 시간과 깨어나는 횟수를 분당으로 잽니다. (디스플레이 필요)
+
+상태마다 새 프로세스에서 PomodoroApp을 켜고, 잠깐 기다린 뒤 정해진 시간 동안
+다음 값을 잽니다. 디스플레이가 없는 환경에서는 Xvfb로 실행하세요.
+
+- idle: 켜 두기만 함
+- running: 집중 타이머가 도는 중
+- minimized: 타이머가 도는 채로 창을 최소화함
+
+cpu_ms_per_minute는 프로세스 CPU 시간(사용자 + 커널), wakeups_per_minute는
+자발적 문맥 교환 횟수(select에서 잠들었다 깨어난 횟수에 가깝습니다),
+scheduler_runs_per_minute는 예약 실행기가 콜백을 실행하러 깨어난 횟수입니다.
+설정 파일은 임시 폴더에 만들므로 실제 설정을 건드리지 않습니다.
+
+    xvfb-run -a python benchmarks/bench_idle.py --seconds 60
+    python benchmarks/bench_idle.py --seconds 20 --json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATES = ("idle", "running", "minimized")
+
+
+def usage_counters():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime, usage.ru_nvcsw
+
+
+def run_child(state, seconds, warmup):
+    """새 프로세스 안에서 한 상태를 재고 분당 값을 JSON으로 출력합니다."""
+    sys.path.insert(0, REPO_ROOT)
+    import tkinter as tk
+
+    import refresh_pomodoro
+
+    root = tk.Tk()
+    app = refresh_pomodoro.PomodoroApp(root)
+    root.update()
+    if state in ("running", "minimized"):
+        app.start_timer()
+    if state == "minimized":
+        root.iconify()
+    measured = {}
+
+    def begin():
+        measured["started"] = time.perf_counter()
+        measured["usage"] = usage_counters()
+        measured["scheduler_runs"] = app.scheduler.wakeups
+        root.after(int(seconds * 1000), finish)
+
+    def finish():
+        elapsed = time.perf_counter() - measured["started"]
+        cpu, switches = usage_counters()
+        start_cpu, start_switches = measured["usage"]
+        per_minute = 60 / elapsed
+        measured["result"] = {
+            "seconds": elapsed,
+            "cpu_ms_per_minute": (cpu - start_cpu) * 1000 * per_minute,
+            "wakeups_per_minute": (switches - start_switches) * per_minute,
+            "scheduler_runs_per_minute": (
+                app.scheduler.wakeups - measured["scheduler_runs"]
+            )
+            * per_minute,
+        }
+        root.quit()
+
+    root.after(int(warmup * 1000), begin)
+    root.mainloop()
+    app.on_closing()
+    print(json.dumps(measured["result"]))
+
+
+def run_state(state, seconds, warmup, config_home):
+    env = dict(os.environ, XDG_CONFIG_HOME=config_home)
+    process = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--child",
+            state,
+            "--seconds",
+            str(seconds),
+            "--warmup",
+            str(warmup),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:  # 디스플레이가 없는 경우 등
+        sys.exit(process.stderr.strip())
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="상태마다 잴 시간")
+    parser.add_argument(
+        "--warmup", type=float, default=2.0, help="켜고 나서 재기 전까지 기다릴 시간"
+    )
+    parser.add_argument(
+        "--states", nargs="+", choices=STATES, default=list(STATES), metavar="STATE"
+    )
+    parser.add_argument("--child", choices=STATES, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.seconds, args.warmup)
+        return None
+
+    results = {"seconds": args.seconds}
+    with tempfile.TemporaryDirectory() as config_home:
+        for state in args.states:
+            results[state] = run_state(state, args.seconds, args.warmup, config_home)
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    print(f"상태마다 {args.seconds:g}초 (분당)")
+    print(f"  {'':12}{'CPU ms':>10}{'wakeups':>10}{'scheduler':>10}")
+    for state in args.states:
+        row = results[state]
+        print(
+            f"  {state:12}{row['cpu_ms_per_minute']:10.1f}"
+            f"{row['wakeups_per_minute']:10.1f}"
+            f"{row['scheduler_runs_per_minute']:10.1f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""휴식 오버레이가 화면에 뜨기까지 걸리는 시간을 잽니다. (디스플레이 필요)
+
+예전 방식(휴식마다 전체 화면 Toplevel을 새로 만들기)과 미리 만들어 둔
+RestOverlay를 deiconify하는 방식을 비교합니다. 디스플레이가 없는 환경에서는
+Xvfb로 실행하세요.
+
+    xvfb-run -a python benchmarks/bench_overlay.py --rounds 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk  # noqa: E402
+
+from refresh_pomodoro import (  # noqa: E402
+    COLOR_LABEL_MUTED,
+    FONT_FAMILY,
+    FONT_SIZE_OVERLAY_CLICK_PROMPT,
+    FONT_SIZE_OVERLAY_MESSAGE,
+    FONT_SIZE_OVERLAY_TIME,
+    RestOverlay,
+)
+
+MESSAGE = "쉬는 시간이에요!\n5분 동안 잠시 쉬어가세요."
+
+
+def build_legacy_overlay(root):
+    """예전 show_overlay_window가 휴식마다 하던 일을 그대로 흉내 냅니다."""
+    window = tk.Toplevel(root)
+    window.attributes("-fullscreen", True)
+    window.attributes("-topmost", True)
+    window.attributes("-alpha", 0.92)
+    window.configure(bg="black")
+    tk.Label(
+        window,
+        text=MESSAGE,
+        font=(FONT_FAMILY, FONT_SIZE_OVERLAY_MESSAGE, "bold"),
+        fg="white",
+        bg="black",
+        justify="center",
+    ).pack(expand=False, pady=(window.winfo_screenheight() // 4.5, 15))
+    tk.Label(
+        window,
+        text="05:00",
+        font=(FONT_FAMILY, FONT_SIZE_OVERLAY_TIME, "bold"),
+        fg="white",
+        bg="black",
+    ).pack(pady=15)
+    tk.Label(
+        window,
+        text="",
+        font=(FONT_FAMILY, FONT_SIZE_OVERLAY_CLICK_PROMPT),
+        fg=COLOR_LABEL_MUTED,
+        bg="black",
+        justify="center",
+    ).pack(pady=(20, 0))
+    return window
+
+
+def measure_legacy(root, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        window = build_legacy_overlay(root)
+        window.wait_visibility()
+        samples.append(time.perf_counter() - started)
+        window.destroy()
+        root.update()
+    return samples
+
+
+def measure_pooled(root, rounds):
+    started = time.perf_counter()
+    overlay = RestOverlay(root, lambda event=None: None)
+    root.update_idletasks()
+    build_seconds = time.perf_counter() - started
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        overlay.show(MESSAGE)
+        overlay.set_text(overlay.time_label, "05:00")
+        overlay.window.wait_visibility()
+        samples.append(time.perf_counter() - started)
+        overlay.hide()
+        root.update()
+    return build_seconds, samples, list(overlay.show_latencies)
+
+
+def summarize(samples):
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    if not samples_ms:
+        return {}
+    return {
+        "rounds": len(samples_ms),
+        "mean_ms": statistics.fmean(samples_ms),
+        "median_ms": statistics.median(samples_ms),
+        "max_ms": samples_ms[-1],
+    }
+
+
+def run(rounds):
+    root = tk.Tk()
+    root.geometry("200x100")
+    root.update()
+    legacy = measure_legacy(root, rounds)
+    build_seconds, pooled, map_latencies = measure_pooled(root, rounds)
+    root.destroy()
+    return {
+        "legacy_rebuild": summarize(legacy),
+        "pooled_show": summarize(pooled),
+        "pooled_map_latency": summarize(map_latencies),
+        "pooled_build_once_ms": build_seconds * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+    results = run(args.rounds)
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    for name, summary in results.items():
+        if isinstance(summary, dict):
+            details = ", ".join(f"{key}={value:.2f}" for key, value in summary.items())
+            print(f"{name}: {details}")
+        else:
+            print(f"{name}: {summary:.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""예약 실행기(힙, 타이밍 휠)와 Tk after의 예약/취소/실행 비용을 비교합니다.
+
+가짜 시계로 예약 N개를 넣고(insert), 절반을 다시 예약하고(rearm: 취소 + 넣기),
+모두 취소하고(cancel), 시간을 흘려 모두 실행하는(expire) 비용을 재서 한 번에
+걸린 시간(µs)으로 보여 줍니다. Tk after는 창 없이 Tcl 인터프리터로 잽니다.
+
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py --timers 100000 --skip-tk --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pomodoro_scheduler import (  # noqa: E402
+    SCHEDULER_HEAP,
+    SCHEDULER_WHEEL,
+    create_scheduler,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def noop():
+    pass
+
+
+def bench_scheduler(backend, delays, step_seconds):
+    """한 예약 실행기의 단계별 µs/회를 반환합니다."""
+    clock = FakeClock()
+    scheduler = create_scheduler(backend, clock=clock)
+    count = len(delays)
+    results = {}
+
+    started = time.perf_counter()
+    calls = [scheduler.call_later(delay, noop) for delay in delays]
+    results["insert"] = (time.perf_counter() - started) / count
+
+    # 서버가 전환마다 하는 일: 예전 예약을 취소하고 새 마감 시각으로 넣기
+    half = count // 2
+    started = time.perf_counter()
+    for index in range(half):
+        scheduler.cancel(calls[index])
+        calls[index] = scheduler.call_later(delays[-index - 1], noop)
+    results["rearm"] = (time.perf_counter() - started) / max(1, half)
+
+    started = time.perf_counter()
+    for call in calls:
+        scheduler.cancel(call)
+    results["cancel"] = (time.perf_counter() - started) / count
+
+    for delay in delays:
+        scheduler.call_later(delay, noop)
+    end = clock.now + max(delays) + step_seconds
+    started = time.perf_counter()
+    ran = 0
+    while ran < count and clock.now < end:
+        deadline = scheduler.next_deadline()
+        if deadline is None:
+            break
+        # 바깥 루프처럼 다음 마감 시각에 깨어나되, 너무 촘촘하면 step만큼 묶습니다.
+        clock.now = max(deadline, clock.now + step_seconds)
+        ran += scheduler.run_due()
+    results["expire"] = (time.perf_counter() - started) / count
+    results["wakeups"] = scheduler.wakeups
+    return results
+
+
+def bench_tk_after(delays):
+    """창 없는 Tcl 인터프리터에서 after/after_cancel을 잽니다. (실제 시계)"""
+    import tkinter
+
+    interp = tkinter.Tcl()
+    count = len(delays)
+    results = {}
+    fired = [0]
+
+    def on_timer():
+        fired[0] += 1
+
+    milliseconds = [int(delay * 1000) for delay in delays]
+    started = time.perf_counter()
+    ids = [interp.after(ms, on_timer) for ms in milliseconds]
+    results["insert"] = (time.perf_counter() - started) / count
+
+    half = count // 2
+    started = time.perf_counter()
+    for index in range(half):
+        interp.after_cancel(ids[index])
+        ids[index] = interp.after(milliseconds[-index - 1], on_timer)
+    results["rearm"] = (time.perf_counter() - started) / max(1, half)
+
+    started = time.perf_counter()
+    for after_id in ids:
+        interp.after_cancel(after_id)
+    results["cancel"] = (time.perf_counter() - started) / count
+
+    # 실행은 실제 시간이 흘러야 하므로 모두 1초 안에 끝나도록 줄여서 잽니다.
+    for ms in milliseconds:
+        interp.after(ms % 1000, on_timer)
+    started = time.perf_counter()
+    wakeups = 0
+    while fired[0] < count:
+        interp.dooneevent()
+        wakeups += 1
+    elapsed = time.perf_counter() - started
+    results["expire"] = max(0.0, elapsed - 1.0) / count  # 기다린 1초는 뺍니다.
+    results["wakeups"] = wakeups
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument(
+        "--max-delay", type=float, default=1500.0, help="예약 시각 범위(초)"
+    )
+    parser.add_argument(
+        "--step-ms", type=float, default=10.0, help="실행 단계에서 깨어나는 최소 간격"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-tk", action="store_true", help="Tk after는 재지 않음")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    delays = [rng.uniform(0, args.max_delay) for _ in range(args.timers)]
+    step_seconds = args.step_ms / 1000
+
+    results = {"timers": args.timers, "max_delay": args.max_delay}
+    for backend in (SCHEDULER_HEAP, SCHEDULER_WHEEL):
+        results[backend] = bench_scheduler(backend, delays, step_seconds)
+    if not args.skip_tk:
+        try:
+            results["tk_after"] = bench_tk_after(delays)
+        except ImportError as e:
+            print(f"Tk after는 건너뜁니다: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    print(f"예약 {args.timers}개, 0~{args.max_delay:g}초 (µs/회)")
+    print(f"  {'':10}{'insert':>10}{'rearm':>10}{'cancel':>10}{'expire':>10}")
+    for name in (SCHEDULER_HEAP, SCHEDULER_WHEEL, "tk_after"):
+        if name not in results:
+            continue
+        row = results[name]
+        values = "".join(
+            f"{row[key] * 1e6:10.2f}" for key in ("insert", "rearm", "cancel", "expire")
+        )
+        print(f"  {name:10}{values}   (깨어남 {row['wakeups']}번)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""사용자 수천 명의 타이머를 한 프로세스에서 돌릴 때의 메모리와 알림 지연을 잽니다.
+
+1. 사용자 N명을 만들고 모두 시작한 뒤 사용자 한 명이 차지하는 메모리를 잽니다.
+2. 실제 소켓으로 서버를 열고, 자식 프로세스가 연결 몇 개로 모든 사용자를 구독합니다.
+   집중/휴식 시간을 몇 초로 줄여 전환을 많이 일으키고, 서버가 예정 시각보다
+   늦게 깨어난 정도와 클라이언트가 알림을 받기까지 걸린 시간을 잽니다.
+
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --tenants 10000 --seconds 30 --json
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pomodoro_engine import DEFAULT_TIMER_SETTINGS  # noqa: E402
+from pomodoro_scheduler import (  # noqa: E402
+    SCHEDULER_BACKENDS,
+    SCHEDULER_HEAP,
+    create_scheduler,
+)
+from pomodoro_server import TimerServer  # noqa: E402
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(seconds):
+    return {
+        "count": len(seconds),
+        "p50_ms": percentile(seconds, 0.50) * 1000 if seconds else None,
+        "p99_ms": percentile(seconds, 0.99) * 1000 if seconds else None,
+        "max_ms": max(seconds) * 1000 if seconds else None,
+    }
+
+
+def bench_settings(work_seconds, rest_seconds):
+    # 분 단위 설정에 소수를 넣어 몇 초짜리 세션을 만듭니다.
+    return DEFAULT_TIMER_SETTINGS._replace(
+        work_minutes=work_seconds / 60,
+        rest_minutes=rest_seconds / 60,
+        force_rest=False,
+        long_rest_cycle_threshold=None,
+    )
+
+
+def measure_memory(tenants, settings, scheduler_backend):
+    """시작한 사용자 한 명이 차지하는 바이트 수 (엔진, 예약 핸들 포함)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    server = TimerServer(create_scheduler(scheduler_backend))
+    for index in range(tenants):
+        tenant = server.add_tenant(f"user{index}", settings)
+        tenant.engine.start()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return total / tenants
+
+
+async def run_clients(address, tenants, connections, seconds):
+    """연결 connections개로 사용자 tenants명을 나눠 구독하고 알림 지연을 잽니다."""
+    import asyncio
+
+    delivery = []
+    subscribed = 0
+
+    async def client(users):
+        nonlocal subscribed
+        reader, writer = await asyncio.open_unix_connection(address)
+        for user in users:
+            writer.write(json.dumps({"user": user, "command": "subscribe"}).encode())
+            writer.write(b"\n")
+        await writer.drain()
+        replies = 0
+        while replies < len(users):
+            if "ok" in json.loads(await reader.readline()):
+                replies += 1
+        subscribed += 1
+        if subscribed == connections:
+            print("subscribed", flush=True)
+        stop_at = time.time() + seconds
+        while True:
+            try:
+                line = await asyncio.wait_for(
+                    reader.readline(), max(0.0, stop_at - time.time())
+                )
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            arrived = time.time()
+            message = json.loads(line)
+            if message.get("event") == "mode_changed" and message.get("due"):
+                delivery.append(arrived - message["due"])
+        writer.close()
+
+    users = [f"user{index}" for index in range(tenants)]
+    await asyncio.gather(
+        *(client(users[index::connections]) for index in range(connections))
+    )
+    return delivery
+
+
+def run_child(address, tenants, connections, seconds):
+    import asyncio
+
+    delivery = asyncio.run(run_clients(address, tenants, connections, seconds))
+    print(json.dumps({"client_delivery": latency_summary(delivery)}))
+
+
+async def run_server(args, settings, address):
+    import asyncio
+
+    server = TimerServer(create_scheduler(args.scheduler))
+    for index in range(args.tenants):
+        server.add_tenant(f"user{index}", settings)
+    listener = await server.start_serving(path=address)
+    child = await asyncio.create_subprocess_exec(
+        sys.executable,
+        os.path.abspath(__file__),
+        "--child",
+        address,
+        "--tenants",
+        str(args.tenants),
+        "--connections",
+        str(args.connections),
+        "--seconds",
+        str(args.seconds),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    await child.stdout.readline()  # "subscribed"
+
+    # 모두 같은 순간에 전환하지 않도록 집중 시간 동안 나눠서 시작합니다.
+    loop = asyncio.get_running_loop()
+    spread = args.work_seconds / args.tenants
+    for index, tenant in enumerate(server.tenants.values()):
+        loop.call_later(index * spread, tenant.engine.start)
+    output, _ = await child.communicate()
+    listener.close()
+    await listener.wait_closed()
+    if child.returncode != 0:
+        sys.exit("구독자 프로세스가 실패했습니다.")
+    results = {
+        "transitions": server.transitions,
+        "notifications_sent": server.notifications_sent,
+        "subscribers_dropped": server.subscribers_dropped,
+        "server_lateness": latency_summary(list(server.lateness)),
+    }
+    results.update(json.loads(output.decode().strip().splitlines()[-1]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--work-seconds", type=float, default=6.0)
+    parser.add_argument("--rest-seconds", type=float, default=3.0)
+    parser.add_argument(
+        "--scheduler", choices=sorted(SCHEDULER_BACKENDS), default=SCHEDULER_HEAP
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.tenants, args.connections, args.seconds)
+        return None
+
+    import asyncio
+
+    settings = bench_settings(args.work_seconds, args.rest_seconds)
+    results = {
+        "tenants": args.tenants,
+        "connections": args.connections,
+        "seconds": args.seconds,
+        "scheduler": args.scheduler,
+        "bytes_per_tenant": measure_memory(args.tenants, settings, args.scheduler),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        address = os.path.join(directory, "server.sock")
+        results.update(asyncio.run(run_server(args, settings, address)))
+    # 리눅스는 KiB, macOS는 바이트
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024
+    results["max_rss_mib"] = max_rss / (1024 * 1024)
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    print(
+        f"사용자 {args.tenants}명, 연결 {args.connections}개, {args.seconds:g}초"
+        f" (집중 {args.work_seconds:g}초 / 휴식 {args.rest_seconds:g}초,"
+        f" {args.scheduler})"
+    )
+    print(f"  사용자당 메모리: {results['bytes_per_tenant']:.0f} B")
+    print(f"  최대 RSS: {results['max_rss_mib']:.1f} MiB")
+    print(f"  전환 {results['transitions']}번, 알림 {results['notifications_sent']}개")
+    for name in ("server_lateness", "client_delivery"):
+        values = ", ".join(
+            f"{key} {value:.3f}" if isinstance(value, float) else f"{key} {value}"
+            for key, value in results[name].items()
+        )
+        print(f"  {name}: {values}")
+    print(f"  끊긴 구독자: {results['subscribers_dropped']}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
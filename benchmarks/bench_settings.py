@@ -0,0 +1,208 @@
+"""기록이 많이 쌓였을 때 설정을 불러오고 저장하는 데 걸리는 시간을 잽니다.
+
+bench_stats.py와 같은 방식으로 여러 해치 세션을 기록 파일(SQLite)에 넣고, 날짜별
+합계도 채운 뒤, 프로그램이 켜지고 꺼질 때와 세션이 끝날 때 하는 일을 한 단계씩
+잽니다. 설정 파일과 기록 파일은 임시 폴더에 만듭니다.
+
+- load_settings: 설정 파일 읽기와 검사 (parse_timer_settings_dict)
+- open_history: 기록 파일 열기와 오늘 합계 읽기 (load_today_stats)
+- save_settings: SettingsPersister.flush (임시 파일 + fsync + 바꿔 끼우기)
+- record_session: 세션 한 건 덧붙이기 (세션이 끝날 때마다)
+- read_all_sessions: 모든 세션 읽기 (이진 세션 기록을 처음 켤 때 옮기는 양)
+
+    python benchmarks/bench_settings.py
+    python benchmarks/bench_settings.py --sessions 100000 --rounds 20 --json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_stats import generate_rows  # noqa: E402
+from pomodoro_engine import (  # noqa: E402
+    DEFAULT_MEAL_TIMES,
+    MODE_WORK,
+    meal_times_from_dict,
+    parse_timer_settings_dict,
+)
+from pomodoro_history import (  # noqa: E402
+    HISTORY_FILENAME,
+    SessionHistory,
+    SessionRecord,
+)
+from pomodoro_scheduler import Scheduler  # noqa: E402
+from pomodoro_storage import (  # noqa: E402
+    SETTINGS_FILENAME,
+    SettingsPersister,
+    atomic_write_json,
+    read_json,
+)
+
+STEPS = (
+    "load_settings",
+    "open_history",
+    "save_settings",
+    "record_session",
+    "read_all_sessions",
+)
+
+
+def settings_dict(cycles_today):
+    """PomodoroApp.settings_snapshot()과 같은 키의 설정"""
+    return {
+        "work_minutes": "25",
+        "rest_minutes": "5",
+        "always_on_top": False,
+        "force_rest": True,
+        "use_meal_alert": True,
+        "meal_times": dict(DEFAULT_MEAL_TIMES),
+        "use_long_rest_suggestion": True,
+        "long_rest_cycle_threshold": "4",
+        "long_rest_duration": "15",
+        "long_rest_prompt_timeout_seconds": 60,
+        "long_rest_prompt_default_accept": True,
+        "resume_policy": "continue",
+        "resume_max_downtime_seconds": 3600,
+        "use_binary_session_log": False,
+        "use_control_socket": True,
+        "use_status_file": True,
+        "metrics_port": None,
+        "scheduler_backend": "heap",
+        "total_work_seconds_today": cycles_today * 25 * 60,
+        "pomodoro_cycles_today": cycles_today,
+        "last_saved_date": str(datetime.date.today()),
+    }
+
+
+def build_history(path, rows):
+    """세션과 날짜별 합계를 한 번에 채웁니다. (record()를 10만 번 부르지 않도록)"""
+    history = SessionHistory(path)
+    with history._conn:
+        history._conn.executemany(
+            "INSERT INTO sessions (day, started_at, ended_at, mode,"
+            " planned_seconds, actual_seconds, focus_seconds, interruption)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        history._conn.execute(
+            "INSERT INTO daily_totals"
+            " (day, focus_seconds, pomodoro_cycles, sessions, interruptions)"
+            " SELECT day, SUM(focus_seconds),"
+            " SUM(mode = ? AND interruption IS NULL), COUNT(*),"
+            " SUM(interruption IS NOT NULL) FROM sessions GROUP BY day",
+            (MODE_WORK,),
+        )
+    history.close()
+
+
+def timed(samples, step, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    samples[step].append(time.perf_counter() - started)
+    return result
+
+
+def load_settings(path):
+    loaded = read_json(path)
+    settings, _ = parse_timer_settings_dict(loaded)
+    return settings, meal_times_from_dict(loaded)
+
+
+def open_history(path):
+    history = SessionHistory(path)
+    totals = history.daily_totals(str(datetime.date.today()))
+    history.close()
+    return totals
+
+
+def run_rounds(directory, rounds):
+    settings_path = os.path.join(directory, SETTINGS_FILENAME)
+    history_path = os.path.join(directory, HISTORY_FILENAME)
+    atomic_write_json(settings_path, settings_dict(0))
+    samples = {step: [] for step in STEPS}
+
+    snapshot = {"cycles": 0}
+    persister = SettingsPersister(
+        Scheduler(), settings_path, lambda: settings_dict(snapshot["cycles"])
+    )
+    history = SessionHistory(history_path)
+    now = time.time()
+    try:
+        for index in range(rounds):
+            timed(samples, "load_settings", load_settings, settings_path)
+            timed(samples, "open_history", open_history, history_path)
+            snapshot["cycles"] = index + 1  # 내용이 같으면 쓰지 않으므로 바꿔 줍니다.
+            timed(samples, "save_settings", persister.flush)
+            record = SessionRecord(
+                str(datetime.date.today()),
+                now + index * 1800,
+                now + index * 1800 + 1500,
+                MODE_WORK,
+                1500,
+                1500,
+                1500,
+                None,
+            )
+            timed(samples, "record_session", history.record, record)
+            timed(
+                samples,
+                "read_all_sessions",
+                history.sessions_between,
+                "",
+                "9999-12-31",
+            )
+    finally:
+        history.close()
+    return {
+        step: {
+            "median_ms": statistics.median(values) * 1000,
+            "max_ms": max(values) * 1000,
+        }
+        for step, values in samples.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=float, default=5.0)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    rows = generate_rows(args.years, args.sessions, random.Random(args.seed))
+    with tempfile.TemporaryDirectory() as directory:
+        build_history(os.path.join(directory, HISTORY_FILENAME), rows)
+        results = {"sessions": args.sessions, "rounds": args.rounds}
+        results.update(run_rounds(directory, args.rounds))
+        results["history_bytes"] = os.path.getsize(
+            os.path.join(directory, HISTORY_FILENAME)
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    print(
+        f"세션 {args.sessions}개 ({results['history_bytes'] / 1024 / 1024:.1f} MiB),"
+        f" {args.rounds}번 (ms)"
+    )
+    print(f"  {'':20}{'중앙값':>7}{'최대':>8}")  # 한글은 두 칸
+    for step in STEPS:
+        print(
+            f"  {step:20}{results[step]['median_ms']:10.3f}"
+            f"{results[step]['max_ms']:10.3f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""프로그램을 켜서 첫 화면이 그려지기까지 걸리는 시간을 잽니다. (디스플레이 필요)
+
+설정 패널을 처음 펼칠 때 만드는 지금 방식(lazy)과, 켤 때 모두 만들던 예전
+방식(eager)을 매번 새 프로세스에서 번갈아 실행해 비교합니다. 설정 파일은
+임시 폴더에 만들므로 실제 설정을 건드리지 않습니다. 디스플레이가 없는
+환경에서는 Xvfb로 실행하세요.
+
+    xvfb-run -a python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("lazy", "eager")
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def run_child(mode):
+    """새 프로세스 안에서 한 번 켜 보고 단계별 시간(ms)을 JSON으로 출력합니다."""
+    started = time.perf_counter()
+    sys.path.insert(0, REPO_ROOT)
+    import tkinter as tk
+
+    import refresh_pomodoro
+
+    imported = time.perf_counter()
+    if mode == "eager":
+        # 예전처럼 접혀 있어도 설정 패널을 만들어 둡니다.
+        original_init = refresh_pomodoro.CollapsibleFrame.__init__
+
+        def eager_init(self, *args, **kwargs):
+            original_init(self, *args, **kwargs)
+            self.ensure_built()
+
+        refresh_pomodoro.CollapsibleFrame.__init__ = eager_init
+
+    root = tk.Tk()
+    app = refresh_pomodoro.PomodoroApp(root)
+    constructed = time.perf_counter()
+    root.update_idletasks()
+    first_frame = time.perf_counter()
+    widgets = count_widgets(root)
+
+    expand_started = time.perf_counter()
+    app.all_settings_collapsible.toggle()
+    root.update_idletasks()
+    expanded = time.perf_counter()
+
+    app.on_closing()
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                "construct_ms": (constructed - imported) * 1000,
+                "first_frame_ms": (first_frame - started) * 1000,
+                "first_expand_ms": (expanded - expand_started) * 1000,
+                "widgets_at_start": widgets,
+            }
+        )
+    )
+
+
+def run_once(mode, config_home):
+    env = dict(os.environ, XDG_CONFIG_HOME=config_home)
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:  # 디스플레이가 없는 경우 등
+        sys.exit(process.stderr.strip())
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    summary = {}
+    for key in samples[0]:
+        values = [sample[key] for sample in samples]
+        if key.endswith("_ms"):
+            summary[key] = statistics.median(values)
+            summary[key.replace("_ms", "_min_ms")] = min(values)
+        else:
+            summary[key] = max(values)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child)
+        return None
+
+    samples = {mode: [] for mode in MODES}
+    with tempfile.TemporaryDirectory() as config_home:
+        run_once("lazy", config_home)  # 설정 폴더와 파일을 미리 만들어 둡니다.
+        for _ in range(args.runs):
+            for mode in MODES:
+                samples[mode].append(run_once(mode, config_home))
+    results = {"runs": args.runs}
+    for mode in MODES:
+        results[mode] = summarize(samples[mode])
+    results["first_frame_saved_ms"] = (
+        results["eager"]["first_frame_ms"] - results["lazy"]["first_frame_ms"]
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    for mode in MODES:
+        print(f"[{mode}]")
+        for key, value in results[mode].items():
+            if isinstance(value, float):
+                print(f"  {key}: {value:.3f}")
+            else:
+                print(f"  {key}: {value}")
+    print(f"첫 화면까지 줄어든 시간: {results['first_frame_saved_ms']:.3f}ms (중앙값)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
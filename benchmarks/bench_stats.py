@@ -0,0 +1,169 @@
+"""여러 해 동안 쌓인 세션 기록으로 통계 계산 속도를 잽니다.
+
+5년 동안 10만 개의 세션(집중 6 : 휴식 4, 열에 하나는 중단)을 무작위로 만들어
+기록 파일(SQLite)과 이진 세션 기록 파일에 넣은 뒤, 열 불러오기와 통계 계산
+시간을 NumPy와 순수 파이썬 각각으로 측정하고 결과가 모두 같은지도 확인합니다.
+
+    python benchmarks/bench_stats.py
+    python benchmarks/bench_stats.py --years 5 --sessions 100000 --json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pomodoro_stats  # noqa: E402
+from pomodoro_engine import END_STOPPED, MODE_REST, MODE_WORK  # noqa: E402
+from pomodoro_history import SessionHistory, SessionRecord, day_key  # noqa: E402
+from pomodoro_session_log import SessionLog  # noqa: E402
+
+
+def generate_rows(years, sessions, rng):
+    """sessions 표에 넣을 (day, started_at, ...) 행을 시간 순으로 만듭니다."""
+    end = time.time()
+    start = end - years * 365 * 86400
+    rows = []
+    for started_at in sorted(rng.uniform(start, end) for _ in range(sessions)):
+        if rng.random() < 0.6:
+            mode, planned = MODE_WORK, 25 * 60
+        else:
+            mode, planned = MODE_REST, 5 * 60
+        interruption = END_STOPPED if rng.random() < 0.1 else None
+        actual = planned if interruption is None else rng.randrange(planned)
+        focus = actual if mode == MODE_WORK else 0
+        rows.append(
+            (
+                day_key(started_at + actual),
+                started_at,
+                started_at + actual,
+                mode,
+                planned,
+                actual,
+                focus,
+                interruption,
+            )
+        )
+    return rows
+
+
+def build_history(path, rows):
+    history = SessionHistory(path)
+    with history._conn:
+        history._conn.executemany(
+            "INSERT INTO sessions (day, started_at, ended_at, mode,"
+            " planned_seconds, actual_seconds, focus_seconds, interruption)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    history.close()
+
+
+def build_session_log(path, rows):
+    log = SessionLog(path)
+    log.extend(SessionRecord(*row) for row in rows)
+    log.close()
+
+
+def best_of(repeat, func, *args):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def measure(load, path, use_numpy, repeat, today):
+    load_ms, columns = best_of(repeat, lambda: load(path, use_numpy=use_numpy))
+    compute_ms, stats = best_of(
+        repeat, lambda: pomodoro_stats.compute_stats(columns, today=today)
+    )
+    summary = {
+        "load_ms": load_ms,
+        "compute_ms": compute_ms,
+        "total_ms": load_ms + compute_ms,
+        "days": len(stats.days),
+        "weeks": len(stats.weekly),
+        "months": len(stats.monthly),
+        "current_streak": stats.current_streak,
+        "longest_streak": stats.longest_streak,
+    }
+    return summary, stats
+
+
+def stats_equal(a, b):
+    """backend 이름을 빼고 비교합니다. (이동 평균은 부동소수 오차만 허용)"""
+    return a._replace(backend="", rolling_average_seconds=None) == b._replace(
+        backend="", rolling_average_seconds=None
+    ) and all(
+        abs(x - y) < 1e-6
+        for x, y in zip(a.rolling_average_seconds, b.rolling_average_seconds)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=float, default=5.0)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    rows = generate_rows(args.years, args.sessions, random.Random(args.seed))
+    today = datetime.date.today()
+    results = {"years": args.years, "sessions": args.sessions}
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_path = os.path.join(directory, "history.sqlite3")
+        log_path = os.path.join(directory, "sessions.bin")
+        build_history(sqlite_path, rows)
+        build_session_log(log_path, rows)
+        sources = {
+            "sqlite": (pomodoro_stats.load_columns, sqlite_path),
+            "binary": (pomodoro_stats.load_log_columns, log_path),
+        }
+        backends = {"python": False}
+        if pomodoro_stats.numpy_available():
+            backends["numpy"] = True
+        all_stats = []
+        for source, (load, path) in sources.items():
+            for backend, use_numpy in backends.items():
+                results[f"{source}_{backend}"], stats = measure(
+                    load, path, use_numpy, args.repeat, today
+                )
+                all_stats.append(stats)
+        results["file_bytes"] = {
+            source: os.path.getsize(path) for source, (_, path) in sources.items()
+        }
+        results["backends_agree"] = all(
+            stats_equal(all_stats[0], stats) for stats in all_stats[1:]
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+        return results
+    print(f"{args.years:g}년, 세션 {args.sessions}개")
+    for name, summary in results.items():
+        if not isinstance(summary, dict):
+            continue
+        print(f"[{name}]")
+        for key, value in summary.items():
+            if isinstance(value, float):
+                print(f"  {key}: {value:.3f}")
+            else:
+                print(f"  {key}: {value}")
+    print(f"결과 일치: {results['backends_agree']}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""타이머 정확도와 화면 비용 벤치마크를 한 번에 돌려 JSON 파일 하나로 모읍니다.
+
+- drift: 긴 시간 동안 쌓이는 카운트다운 오차 (bench_drift.py)
+- overlay: 휴식 오버레이가 뜨기까지 걸리는 시간 (bench_overlay.py)
+- startup: 켜서 첫 화면까지 걸리는 시간 (bench_startup.py)
+- idle: 대기/실행/최소화 상태의 분당 CPU 시간과 깨어남 (bench_idle.py)
+- settings: 기록이 많을 때 설정 불러오기/저장 시간 (bench_settings.py)
+
+각 벤치마크를 --json으로 따로 실행하고, 결과에 실행 환경(파이썬, 플랫폼, 커밋)을
+붙여 저장합니다. 디스플레이가 필요한 것은 DISPLAY가 없으면 xvfb-run으로 감싸고,
+xvfb-run도 없으면 건너뛴 이유를 남깁니다. --compare로 예전 결과와 숫자를 나란히
+비교하면 느려진 곳이 바로 보입니다.
+
+    python benchmarks/run_suite.py --output results.json
+    python benchmarks/run_suite.py --quick --only drift settings
+    python benchmarks/run_suite.py --output new.json --compare results.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+# 이름 -> (스크립트, 기본 인자, --quick 인자, 디스플레이 필요 여부)
+BENCHMARKS = {
+    "drift": ("bench_drift.py", ["--hours", "8"], ["--hours", "1"], False),
+    "overlay": ("bench_overlay.py", ["--rounds", "20"], ["--rounds", "5"], True),
+    "startup": ("bench_startup.py", ["--runs", "5"], ["--runs", "2"], True),
+    "idle": ("bench_idle.py", ["--seconds", "60"], ["--seconds", "10"], True),
+    "settings": (
+        "bench_settings.py",
+        ["--sessions", "100000", "--rounds", "20"],
+        ["--sessions", "20000", "--rounds", "5"],
+        False,
+    ),
+}
+# --compare에서 이만큼(비율) 넘게 바뀐 값에 표시합니다.
+COMPARE_THRESHOLD = 0.10
+
+
+def display_wrapper():
+    """디스플레이가 필요한 벤치마크 앞에 붙일 명령. 쓸 수 없으면 None."""
+    if sys.platform in ("win32", "darwin") or os.environ.get("DISPLAY"):
+        return []
+    xvfb_run = shutil.which("xvfb-run")
+    if xvfb_run is None:
+        return None
+    return [xvfb_run, "-a"]
+
+
+def git_commit():
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return process.stdout.strip() or None
+
+
+def run_benchmark(name, quick):
+    script, arguments, quick_arguments, needs_display = BENCHMARKS[name]
+    prefix = []
+    if needs_display:
+        prefix = display_wrapper()
+        if prefix is None:
+            return {"skipped": "DISPLAY가 없고 xvfb-run도 없습니다."}
+    command = prefix + [
+        sys.executable,
+        os.path.join(BENCHMARK_DIR, script),
+        *(quick_arguments if quick else arguments),
+        "--json",
+    ]
+    started = time.perf_counter()
+    process = subprocess.run(command, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if process.returncode != 0:
+        lines = (process.stderr or process.stdout).strip().splitlines()
+        return {"failed": lines[-1] if lines else f"종료 코드 {process.returncode}"}
+    try:
+        results = json.loads(process.stdout)
+    except ValueError:
+        return {"failed": "JSON 결과를 읽지 못했습니다."}
+    results["elapsed_seconds"] = elapsed
+    return results
+
+
+def flatten(results, prefix=""):
+    """중첩된 결과를 {"idle.running.cpu_ms_per_minute": 값} 같은 숫자 dict로 폅니다."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(results, baseline, threshold=COMPARE_THRESHOLD):
+    """(이름, 예전 값, 지금 값, 변화율, 표시 여부) 목록을 반환합니다."""
+    current = flatten(results["benchmarks"])
+    previous = flatten(baseline.get("benchmarks", {}))
+    rows = []
+    for path in sorted(current.keys() & previous.keys()):
+        if path.endswith("elapsed_seconds"):
+            continue
+        old, new = previous[path], current[path]
+        change = (new - old) / abs(old) if old else None
+        flagged = change is not None and abs(change) > threshold
+        rows.append((path, old, new, change, flagged))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=sorted(BENCHMARKS),
+        metavar="NAME",
+        help=f"일부만 실행 ({', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--quick", action="store_true", help="짧게 돌립니다.")
+    parser.add_argument(
+        "--output", metavar="FILE", help="결과 JSON을 저장할 파일 (없으면 출력)"
+    )
+    parser.add_argument("--compare", metavar="FILE", help="예전 결과 JSON과 비교")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=COMPARE_THRESHOLD * 100,
+        help="비교할 때 표시할 변화율(%%)",
+    )
+    args = parser.parse_args(argv)
+
+    results = {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": git_commit(),
+        "quick": args.quick,
+        "benchmarks": {},
+    }
+    for name in args.only or BENCHMARKS:
+        print(f"{name} ...", file=sys.stderr, flush=True)
+        results["benchmarks"][name] = outcome = run_benchmark(name, args.quick)
+        for status in ("skipped", "failed"):
+            if status in outcome:
+                print(f"  {status}: {outcome[status]}", file=sys.stderr)
+
+    text = json.dumps(results, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"{args.output}에 저장했습니다.", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold / 100)
+        print(f"{args.compare}와 비교 (±{args.threshold:g}% 넘으면 !)", file=sys.stderr)
+        for path, old, new, change, flagged in rows:
+            change_text = "" if change is None else f"{change * 100:+.1f}%"
+            print(
+                f"{'!' if flagged else ' '} {path:55}{old:14.3f}{new:14.3f}"
+                f"{change_text:>10}",
+                file=sys.stderr,
+            )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""상태 표시줄이나 스크립트가 쓰는 제어/상태 소켓입니다. (Tk 없이 동작)
+
+유닉스 소켓에 JSON을 한 줄씩 주고받습니다. "id"를 넣으면 답에도 그대로 붙여 줍니다.
+
+    {"command": "query"}      -> {"ok": true, "state": {...}}
+    {"command": "start"}      -> {"ok": true, "state": {...}}  (stop, skip도 같음)
+    {"command": "subscribe"}  -> 답 뒤로 상태가 바뀔 때마다 {"event": ..., "state": {...}}
+    {"command": "metrics"}    -> {"ok": true, "metrics": {콜백 이름: 지연 요약}}
+                                 (창은 "render": 건너뛴 화면 갱신 수도 함께)
+
+state의 deadline은 time.time() 기준 마감 시각이라, 남은 시간은 받는 쪽에서
+계산하면 됩니다. 그래서 매초의 Tick은 보내지 않습니다.
+
+asyncio 이벤트 루프는 따로 스레드에서 돌고, 타이머를 바꾸는 명령만
+MainThreadCalls로 메인 스레드(Tk나 데몬의 select 루프)에 넘깁니다. query는
+마지막으로 받은 상태로 바로 답하므로 메인 스레드를 기다리지 않습니다.
+"""
+
+import collections
+import math
+import os
+import re
+import socket
+import sys
+import threading
+import time
+
+from pomodoro_instance import decode_message, encode_message
+
+CONTROL_SOCKET_FILENAME = "refresh_pomodoro_control.sock"
+
+COMMAND_QUERY = "query"
+COMMAND_SUBSCRIBE = "subscribe"
+COMMAND_START = "start"
+COMMAND_STOP = "stop"
+COMMAND_SKIP = "skip"
+COMMAND_METRICS = "metrics"
+# 타이머를 바꾸거나 메인 스레드가 쓰는 값을 읽으므로 메인 스레드에서 실행할 명령
+MAIN_THREAD_COMMANDS = (COMMAND_START, COMMAND_STOP, COMMAND_SKIP, COMMAND_METRICS)
+
+# 보내지 못하고 쌓인 이벤트가 이만큼을 넘으면 읽지 않는 구독자로 보고 끊습니다.
+SUBSCRIBER_BUFFER_LIMIT_BYTES = 256 * 1024
+# 메인 스레드가 이 시간 안에 명령을 처리하지 못하면 오류로 답합니다.
+COMMAND_TIMEOUT_SECONDS = 5.0
+MAX_LINE_BYTES = 64 * 1024
+# 상태 표시줄 여러 개가 한꺼번에 다시 붙어도 연결을 놓치지 않을 만큼
+LISTEN_BACKLOG = 1024
+
+
+def supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+def control_socket_path(settings_path):
+    """제어 소켓 경로. 설정 파일과 같은 폴더를 씁니다."""
+    return os.path.join(os.path.dirname(settings_path), CONTROL_SOCKET_FILENAME)
+
+
+def event_name(event):
+    """엔진 이벤트 이름을 ModeChanged -> mode_changed 처럼 바꿉니다."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", type(event).__name__).lower()
+
+
+def engine_state(engine, wall_clock=time.time):
+    """엔진 상태를 JSON으로 보낼 수 있는 dict로 만듭니다."""
+    deadline = None
+    if engine.is_counting_down():
+        deadline = wall_clock() + (engine.deadline - engine.now())
+    return {
+        "mode": engine.mode,
+        "running": engine.is_running,
+        "deadline": deadline,
+        "remaining_seconds": engine.remaining_seconds,
+        "rest_finished": engine.rest_finished,
+        "awaiting_long_rest_answer": engine.awaiting_long_rest_answer,
+        "total_work_seconds_today": engine.total_work_seconds_today,
+        "pomodoro_cycles_today": engine.pomodoro_cycles_today,
+    }
+
+
+def send_to_subscriber(writer, line):
+    """asyncio StreamWriter에 한 줄을 보냅니다. 끊겼거나 너무 밀렸으면 False.
+
+    읽지 않는 구독자 때문에 메모리가 계속 늘지 않도록, 보내지 못하고 쌓인 양이
+    SUBSCRIBER_BUFFER_LIMIT_BYTES를 넘으면 연결을 닫습니다.
+    """
+    transport = writer.transport
+    if transport.is_closing():
+        return False
+    if transport.get_write_buffer_size() > SUBSCRIBER_BUFFER_LIMIT_BYTES:
+        writer.close()
+        return False
+    writer.write(line)
+    return True
+
+
+class MainThreadCalls:
+    """다른 스레드에서 메인 스레드로 함수 실행을 넘기는 통로입니다.
+
+    call_soon()은 아무 스레드에서나 부를 수 있고, 메인 스레드는 fileno()를
+    읽을 수 있게 되면(Tk createfilehandler, select) run_pending()을 부르면 됩니다.
+    """
+
+    def __init__(self):
+        self._pending = collections.deque()
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def call_soon(self, callback, *args):
+        self._pending.append((callback, args))
+        try:
+            self._writer.send(b"\0")
+        except OSError:
+            pass  # 깨우는 바이트가 이미 가득 차 있으면 그걸로 충분합니다.
+
+    def run_pending(self):
+        """넘어온 함수를 모두 실행하고 실행한 개수를 반환합니다."""
+        try:
+            while self._reader.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        ran = 0
+        while self._pending:
+            callback, args = self._pending.popleft()
+            callback(*args)
+            ran += 1
+        return ran
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+class ControlServer:
+    """JSON 줄 단위 제어 소켓을 asyncio 스레드 하나로 처리합니다.
+
+    execute(명령, 메시지)는 메인 스레드에서 불리며 답(dict)을 반환해야 합니다.
+    메인 스레드는 상태가 바뀔 때마다 publish()로 새 상태를 알려 주면 되고,
+    구독자에게 보내는 일은 모두 이벤트 루프 스레드가 합니다.
+    """
+
+    def __init__(self, path, execute, main_thread_calls, wall_clock=time.time):
+        self.path = path
+        self.execute = execute
+        self.main_thread_calls = main_thread_calls
+        self.wall_clock = wall_clock
+        self.loop = None
+        self.events_published = 0
+        self.subscribers_dropped = 0
+        self._state = {}
+        self._server = None
+        self._thread = None
+        self._clients = set()
+        self._subscribers = set()
+
+    def start(self):
+        """이벤트 루프 스레드를 띄웁니다. 기다리지 않고 바로 돌아옵니다."""
+        self._thread = threading.Thread(
+            target=self._run, name="pomodoro-control", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, timeout=1.0):
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass  # 이미 닫힌 루프
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def publish(self, event, state):
+        """메인 스레드에서 새 상태를 알립니다. 구독자가 없으면 저장만 합니다."""
+        self._state = state
+        loop = self.loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._broadcast, event, state)
+        except RuntimeError:
+            pass
+
+    def current_state(self):
+        """마지막 상태에 남은 시간만 지금 시각으로 다시 계산해 반환합니다."""
+        state = dict(self._state)
+        deadline = state.get("deadline")
+        if deadline is not None:
+            state["remaining_seconds"] = max(
+                0, math.ceil(deadline - self.wall_clock())
+            )
+        return state
+
+    def _run(self):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        try:
+            try:
+                os.unlink(self.path)  # 잠금을 잡은 쪽만 여기 오므로 남은 소켓은 예전 것
+            except FileNotFoundError:
+                pass
+            self._server = loop.run_until_complete(
+                asyncio.start_unix_server(
+                    self._handle_client,
+                    path=self.path,
+                    limit=MAX_LINE_BYTES,
+                    backlog=LISTEN_BACKLOG,
+                )
+            )
+            os.chmod(self.path, 0o600)
+        except OSError as e:
+            print(f"제어 소켓을 열지 못했어요: {e}", file=sys.stderr)
+            loop.close()
+            return
+        self.loop = loop
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _shutdown(self):
+        import asyncio
+
+        self._server.close()
+        for writer in tuple(self._clients):
+            writer.close()
+        tasks = [
+            task
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _handle_client(self, reader, writer):
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # 한 줄이 MAX_LINE_BYTES보다 김
+                    break
+                if not line:
+                    break
+                reply = await self._reply(line, writer)
+                writer.write(encode_message(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            self._subscribers.discard(writer)
+            writer.close()
+
+    async def _reply(self, line, writer):
+        try:
+            message = decode_message(line)
+        except ValueError:
+            return {"ok": False, "error": "JSON 객체를 한 줄에 하나씩 보내 주세요."}
+        command = message.get("command")
+        if command == COMMAND_QUERY:
+            reply = {"ok": True, "state": self.current_state()}
+        elif command == COMMAND_SUBSCRIBE:
+            self._subscribers.add(writer)
+            reply = {"ok": True, "state": self.current_state()}
+        elif command in MAIN_THREAD_COMMANDS:
+            reply = await self._run_on_main_thread(command, message)
+        else:
+            reply = {"ok": False, "error": f"알 수 없는 명령이에요: {command}"}
+        if "id" in message:
+            reply["id"] = message["id"]
+        return reply
+
+    async def _run_on_main_thread(self, command, message):
+        import asyncio
+
+        loop = self.loop
+        future = loop.create_future()
+
+        def run():
+            try:
+                reply = self.execute(command, message)
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            try:
+                loop.call_soon_threadsafe(_set_result, future, reply)
+            except RuntimeError:
+                pass  # 답을 기다리던 루프가 이미 닫힘
+
+        self.main_thread_calls.call_soon(run)
+        try:
+            return await asyncio.wait_for(future, COMMAND_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": "타이머가 바빠서 명령을 처리하지 못했어요."}
+
+    def _broadcast(self, event, state):
+        self.events_published += 1
+        line = encode_message({"event": event, "state": state})
+        for writer in tuple(self._subscribers):
+            if not send_to_subscriber(writer, line):
+                self._subscribers.discard(writer)
+                self.subscribers_dropped += 1
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
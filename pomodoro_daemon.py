@@ -0,0 +1,562 @@
+"""화면 없이 터미널에서 도는 뽀모도로 데몬입니다. (Tk 없이 동작)
+
+GUI(PomodoroApp)와 같은 엔진, 같은 설정 파일(refresh_pomodoro_settings.json),
+같은 기록 파일을 씁니다. 매초 깨어나지 않고 다음 마감 시각(세션 끝, 식사 알림)
+까지 잠들어 있다가, 알림은 표준 출력, 훅 명령, 터미널 벨로 보냅니다. 긴 휴식
+제안에는 답할 화면이 없으므로 기다리지 않고 기본 선택을 바로 따릅니다. 창이나 데몬이 이미 켜져 있으면 명령만 넘기고 끝납니다.
+
+    python pomodoro_daemon.py                  # 바로 집중 시작
+    python pomodoro_daemon.py --bell --hook 'notify-send 뽀모도로 "$POMODORO_MESSAGE"'
+    python pomodoro_daemon.py show             # 켜져 있는 쪽의 상태 보기
+    python pomodoro_daemon.py stop
+
+설정은 읽기만 하고, 파일이 바뀌면 다음 전환 때 다시 읽습니다.
+"""
+
+import argparse
+import datetime
+import math
+import os
+import select
+import signal
+import subprocess
+import sys
+import time
+
+import pomodoro_instance
+from pomodoro_control import (
+    ControlServer,
+    MainThreadCalls,
+    control_socket_path,
+    engine_state,
+    event_name,
+)
+from pomodoro_engine import (
+    END_CLOSED,
+    MEAL_CHECK_MAX_SLEEP_SECONDS,
+    MODE_LONG_REST,
+    MODE_REST,
+    MODE_WORK,
+    RESUME_DEFAULT_POLICY,
+    RESUME_MAX_DOWNTIME_SECONDS,
+    RESUME_POLICIES,
+    TIMER_SETTING_LABELS,
+    LongRestSuggested,
+    MealSchedule,
+    ModeChanged,
+    PomodoroEngine,
+    RestFinished,
+    SessionCompleted,
+    SettingsInvalid,
+    Stopped,
+    Tick,
+    meal_times_from_dict,
+    parse_timer_settings_dict,
+)
+from pomodoro_history import HISTORY_FILENAME, SessionHistory
+from pomodoro_scheduler import SCHEDULER_HEAP, create_scheduler
+from pomodoro_status_file import StatusWriter, status_file_path
+from pomodoro_storage import (
+    CHECKPOINT_FILENAME,
+    get_settings_path,
+    load_checkpoint,
+    read_json,
+    read_scheduler_backend,
+    save_checkpoint,
+)
+
+# 훅 명령에 넘기는 알림 종류 (POMODORO_EVENT)
+NOTIFY_MODE_CHANGED = "mode_changed"
+NOTIFY_LONG_REST_SUGGESTED = "long_rest_suggested"
+NOTIFY_REST_FINISHED = "rest_finished"
+NOTIFY_STOPPED = "stopped"
+NOTIFY_MEAL = "meal"
+NOTIFY_SETTINGS_INVALID = "settings_invalid"
+
+# 설정 파일의 수정 시각 대신 기억해 두는 값
+_SETTINGS_NEVER_READ = object()  # 아직 한 번도 읽지 않음
+_SETTINGS_MISSING = object()  # 파일이 없어서 기본값을 씀
+
+
+class Notifier:
+    """알림 한 건을 표준 출력, 훅 명령, 터미널 벨로 보냅니다.
+
+    훅 명령은 셸로 실행하고 기다리지 않습니다. 알림 내용은 환경 변수
+    POMODORO_EVENT, POMODORO_MODE, POMODORO_MESSAGE, POMODORO_REMAINING_SECONDS로
+    넘깁니다.
+    """
+
+    def __init__(self, stream=sys.stdout, hook=None, bell=False):
+        self.stream = stream
+        self.hook = hook
+        self.bell = bell
+        self.sent = 0
+        self._hook_processes = []
+
+    def notify(self, event, message, mode="", remaining_seconds=0):
+        self.sent += 1
+        if self.stream is not None:
+            stamp = datetime.datetime.now().strftime("%H:%M:%S")
+            print(f"[{stamp}] {message}", file=self.stream, flush=True)
+        if self.bell:
+            self._ring()
+        if self.hook:
+            self._run_hook(event, message, mode, remaining_seconds)
+
+    def _ring(self):
+        # 표준 출력을 파일로 돌려 두었어도 들리도록 터미널에 직접 씁니다.
+        try:
+            with open("/dev/tty", "w") as tty:
+                tty.write("\a")
+        except OSError:
+            sys.stderr.write("\a")
+            sys.stderr.flush()
+
+    def _run_hook(self, event, message, mode, remaining_seconds):
+        # 끝난 훅 프로세스를 치워서 좀비가 쌓이지 않게 합니다.
+        self._hook_processes = [p for p in self._hook_processes if p.poll() is None]
+        env = dict(
+            os.environ,
+            POMODORO_EVENT=event,
+            POMODORO_MODE=mode,
+            POMODORO_MESSAGE=message,
+            POMODORO_REMAINING_SECONDS=str(remaining_seconds),
+        )
+        try:
+            process = subprocess.Popen(
+                self.hook, shell=True, env=env, stdin=subprocess.DEVNULL
+            )
+        except OSError as e:
+            print(f"훅 명령을 실행하지 못했어요: {e}", file=sys.stderr)
+            return
+        self._hook_processes.append(process)
+
+
+class PomodoroDaemon:
+    """PomodoroApp과 같은 규칙으로 화면 없이 도는 타이머입니다.
+
+    countdown처럼 매초 깨어나는 대신 엔진의 마감 시각에만 poll()을 부르고,
+    run()은 스케줄러의 다음 마감 시각까지 select/sleep으로 잠들어 있습니다.
+    진행 중인 세션은 전환할 때만 기록해 두어 깨어나는 횟수를 늘리지 않습니다.
+    """
+
+    def __init__(self, notifier, settings_path=None, auto_continue=False):
+        self.notifier = notifier
+        self.settings_path = settings_path or get_settings_path()
+        self.auto_continue = auto_continue
+        directory = os.path.dirname(self.settings_path)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_FILENAME)
+        self.resume_policy = RESUME_DEFAULT_POLICY
+        self.resume_max_downtime = RESUME_MAX_DOWNTIME_SECONDS
+        self.use_binary_session_log = False
+        self.session_log = None
+        self.server = None
+        self.use_control_socket = True
+        self.control_server = None
+        self.main_thread_calls = None
+        self.use_status_file = True
+        self.status_writer = None
+        self.metrics_port = None
+        self.metrics_server = None
+
+        self.engine_call = None
+        self.meal_check_call = None
+        self._settings_mtime = _SETTINGS_NEVER_READ
+        self._meal_times = None
+
+        # 예약 방식은 켤 때만 정합니다. (reload_settings로 바꾸지 않음)
+        try:
+            self.scheduler_backend = read_scheduler_backend(self.settings_path)
+        except ValueError as e:
+            print(f"{e} ({SCHEDULER_HEAP}을 씁니다.)", file=sys.stderr)
+            self.scheduler_backend = SCHEDULER_HEAP
+        self.scheduler = create_scheduler(self.scheduler_backend)
+        self.engine = PomodoroEngine(clock=self.scheduler.clock)
+        self.engine.subscribe(self.on_engine_event)
+        self.meal_schedule = MealSchedule()
+        self.history = SessionHistory(os.path.join(directory, HISTORY_FILENAME))
+
+        self.reload_settings()
+        self.load_today_stats()
+        self.open_session_log()
+
+    def reload_settings(self):
+        """설정 파일이 바뀌었으면 다시 읽습니다. 다시 읽었으면 True를 반환합니다."""
+        try:
+            mtime = os.stat(self.settings_path).st_mtime_ns
+        except OSError:
+            mtime = _SETTINGS_MISSING
+        if mtime == self._settings_mtime:
+            return False
+        self._settings_mtime = mtime
+        try:
+            settings = read_json(self.settings_path)
+        except (OSError, ValueError):
+            settings = {}
+        if not isinstance(settings, dict):
+            settings = {}
+        timer_settings, invalid_fields = parse_timer_settings_dict(
+            settings, previous=self.engine.settings
+        )
+        for field in invalid_fields:
+            label = TIMER_SETTING_LABELS.get(field, field)
+            print(f"설정의 {label} 값이 잘못되어 이전 값을 씁니다.", file=sys.stderr)
+        self.engine.update_settings(timer_settings)
+
+        self.resume_policy = settings.get("resume_policy", RESUME_DEFAULT_POLICY)
+        if self.resume_policy not in RESUME_POLICIES:
+            self.resume_policy = RESUME_DEFAULT_POLICY
+        self.resume_max_downtime = settings.get(
+            "resume_max_downtime_seconds", RESUME_MAX_DOWNTIME_SECONDS
+        )
+        self.use_binary_session_log = settings.get("use_binary_session_log", False)
+        self.use_control_socket = settings.get("use_control_socket", True)
+        self.use_status_file = settings.get("use_status_file", True)
+        self.metrics_port = settings.get("metrics_port")
+
+        # 식사 시간이 그대로면 알림 목록을 다시 만들지 않습니다. set_times는
+        # 확인한 시각을 지금으로 당기므로, 곧 울릴 알림을 건너뛸 수 있습니다.
+        meal_times = meal_times_from_dict(settings)
+        if meal_times != self._meal_times:
+            self._meal_times = meal_times
+            self.meal_schedule.set_times(meal_times)
+            self.schedule_meal_check()
+        return True
+
+    def load_today_stats(self):
+        totals = self.history.daily_totals(str(datetime.date.today()))
+        self.engine.total_work_seconds_today = totals.focus_seconds
+        self.engine.pomodoro_cycles_today = totals.pomodoro_cycles
+
+    def open_session_log(self):
+        if not self.use_binary_session_log:
+            return
+        from pomodoro_session_log import (
+            SESSION_LOG_FILENAME,
+            SessionLog,
+            SessionLogError,
+        )
+
+        path = os.path.join(os.path.dirname(self.settings_path), SESSION_LOG_FILENAME)
+        try:
+            self.session_log = SessionLog(path)
+        except (OSError, SessionLogError) as e:
+            print(f"세션 기록 파일을 열지 못했어요: {e}", file=sys.stderr)
+            return
+        if not len(self.session_log):
+            self.session_log.extend(self.history.sessions_between("", "9999-12-31"))
+
+    def resume_session(self):
+        """지난번에 끝나지 않은 세션 기록이 있으면 resume_policy대로 이어갑니다."""
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint is None:
+            return False
+        resumed = self.engine.resume(
+            checkpoint, self.resume_policy, self.resume_max_downtime
+        )
+        self.load_today_stats()
+        self.save_checkpoint()
+        self.schedule_engine()
+        return resumed
+
+    def save_checkpoint(self):
+        try:
+            save_checkpoint(self.checkpoint_path, self.engine.checkpoint())
+        except OSError as e:
+            print(f"세션 기록 중 오류: {e}", file=sys.stderr)
+
+    def remaining_seconds(self):
+        """매초 poll()하지 않으므로 남은 시간은 마감 시각에서 바로 계산합니다."""
+        if not self.engine.is_counting_down():
+            return self.engine.remaining_seconds
+        return max(0, math.ceil(self.engine.deadline - self.scheduler.clock()))
+
+    def start_control_server(self):
+        """상태 표시줄/스크립트가 쓰는 제어 소켓을 엽니다. (pomodoro_control)"""
+        if not self.use_control_socket or self.control_server is not None:
+            return
+        self.main_thread_calls = MainThreadCalls()
+        self.control_server = ControlServer(
+            control_socket_path(self.settings_path),
+            self.handle_control_command,
+            self.main_thread_calls,
+        )
+        self.control_server.publish("ready", engine_state(self.engine))
+        self.control_server.start()
+
+    def open_status_file(self):
+        """상태 표시줄이 읽을 상태 파일을 엽니다. (pomodoro_status_file)"""
+        if not self.use_status_file or self.status_writer is not None:
+            return
+        try:
+            self.status_writer = StatusWriter(status_file_path(self.settings_path))
+        except (OSError, ValueError) as e:
+            print(f"상태 파일을 열지 못했어요: {e}", file=sys.stderr)
+            return
+        self.status_writer.write(engine_state(self.engine))
+
+    def start_metrics(self, port=None):
+        """예약 콜백의 지연을 재기 시작하고 /metrics를 엽니다. (pomodoro_metrics)"""
+        port = port or self.metrics_port
+        if not port or self.metrics_server is not None:
+            return
+        from pomodoro_metrics import CallbackMetrics, MetricsServer
+
+        metrics = CallbackMetrics()
+        metrics_server = MetricsServer(metrics, port)
+        try:
+            metrics_server.start()
+        except OSError as e:
+            print(f"지연 측정 포트를 열지 못했어요: {e}", file=sys.stderr)
+            return
+        self.scheduler.metrics = metrics
+        self.metrics_server = metrics_server
+
+    def publish_state(self, event):
+        """제어 소켓 구독자와 상태 파일에 바뀐 상태를 알립니다."""
+        if self.control_server is None and self.status_writer is None:
+            return
+        state = engine_state(self.engine)
+        if self.control_server is not None:
+            self.control_server.publish(event_name(event), state)
+        if self.status_writer is not None:
+            self.status_writer.write(state)
+
+    def handle_control_command(self, command, message):
+        if command == "metrics":
+            if self.scheduler.metrics is None:
+                return {"ok": False, "error": "--metrics-port를 주면 켜져요."}
+            return {"ok": True, "metrics": self.scheduler.metrics.snapshot()}
+        if command == "start":
+            self.start()
+        elif command == "stop":
+            self.stop()
+        elif command == "skip":
+            if not self.engine.can_end_rest():
+                return {"ok": False, "error": "지금은 휴식을 넘길 수 없어요."}
+            self.engine.end_rest()
+        return {"ok": True, "state": engine_state(self.engine)}
+
+    def status(self):
+        return {
+            "mode": self.engine.mode,
+            "remaining_seconds": self.remaining_seconds(),
+            "rest_finished": self.engine.rest_finished,
+            "total_work_seconds_today": self.engine.total_work_seconds_today,
+            "pomodoro_cycles_today": self.engine.pomodoro_cycles_today,
+        }
+
+    def start(self):
+        """멈춰 있으면 집중을 시작하고, 강제 휴식이 끝나 기다리는 중이면 넘어갑니다."""
+        self.reload_settings()
+        if not self.engine.is_running:
+            self.engine.start()
+        elif self.engine.rest_finished:
+            self.engine.end_rest()
+
+    def stop(self):
+        self.engine.stop()
+
+    def handle_command(self, command, message):
+        if command == pomodoro_instance.COMMAND_START:
+            self.start()
+        elif command == pomodoro_instance.COMMAND_STOP:
+            self.stop()
+        elif command != pomodoro_instance.COMMAND_SHOW:
+            return {"ok": False, "error": f"알 수 없는 명령이에요: {command}"}
+        return dict(ok=True, **self.status())
+
+    def schedule_engine(self):
+        """다음 전환 시각(세션 끝)에 한 번만 깨어납니다."""
+        self.scheduler.cancel(self.engine_call)
+        self.engine_call = None
+        if self.engine.is_counting_down():
+            self.engine_call = self.scheduler.call_at(
+                self.engine.deadline, self.on_engine_deadline
+            )
+
+    def on_engine_deadline(self):
+        self.engine_call = None
+        self.reload_settings()  # 엔진은 전환할 때 설정을 읽습니다.
+        self.engine.poll()
+        self.schedule_engine()
+
+    def on_engine_event(self, event):
+        if isinstance(event, ModeChanged):
+            minutes = event.duration_seconds // 60
+            if event.mode == MODE_WORK:
+                message = f"집중! 🔥 {minutes}분 동안 집중해요."
+            elif event.mode == MODE_REST:
+                message = f"휴식 시간 🧘 {minutes}분 동안 잠시 쉬어가세요."
+            elif event.mode == MODE_LONG_REST:
+                message = f"긴 휴식 시간 😌 {minutes}분 동안 편안하게 쉬세요."
+            else:
+                message = event.mode
+            self.notifier.notify(
+                NOTIFY_MODE_CHANGED, message, event.mode, event.duration_seconds
+            )
+            self.save_checkpoint()
+            self.schedule_engine()
+        elif isinstance(event, SessionCompleted):
+            record = self.history.record_session(event)
+            if self.session_log is not None:
+                self.session_log.append(record)
+        elif isinstance(event, LongRestSuggested):
+            choice = "긴 휴식" if event.default_accept else "짧은 휴식"
+            self.notifier.notify(
+                NOTIFY_LONG_REST_SUGGESTED,
+                f"벌써 {event.cycles}번째 뽀모도로를 마쳤어요! {choice}으로 넘어가요.",
+                self.engine.mode,
+            )
+            # 답할 화면이 없으므로 대기 시간과 상관없이 바로 기본 선택을 적용합니다.
+            # (이어지는 ModeChanged에서 세션 기록과 다음 깨어날 시각을 맞춥니다.)
+            self.engine.answer_long_rest(event.default_accept)
+        elif isinstance(event, RestFinished):
+            self.save_checkpoint()
+            if self.auto_continue:
+                self.scheduler.call_later(0, self.engine.end_rest)
+            else:
+                self.notifier.notify(
+                    NOTIFY_REST_FINISHED,
+                    "휴식 끝! start 명령으로 다음 집중을 시작하세요.",
+                    event.mode,
+                )
+        elif isinstance(event, SettingsInvalid):
+            label = TIMER_SETTING_LABELS.get(event.field, event.field)
+            self.notifier.notify(
+                NOTIFY_SETTINGS_INVALID,
+                f"{label}을 확인해주세요. 타이머를 멈춥니다.",
+            )
+        elif isinstance(event, Stopped):
+            self.scheduler.cancel(self.engine_call)
+            self.engine_call = None
+            self.save_checkpoint()
+            self.notifier.notify(NOTIFY_STOPPED, "잠시 멈춤 ⏸️", event.previous_mode)
+        if not isinstance(event, Tick):
+            self.publish_state(event)
+
+    def schedule_meal_check(self):
+        self.scheduler.cancel(self.meal_check_call)
+        self.meal_check_call = self.scheduler.call_later(
+            self.meal_schedule.seconds_until_next_check(), self.check_meal_time
+        )
+
+    def check_meal_time(self):
+        self.meal_check_call = None
+        new_day, due_meals = self.meal_schedule.check()
+        if new_day:
+            self.engine.reset_daily_stats()
+        for meal_name in due_meals:
+            self.notifier.notify(
+                NOTIFY_MEAL,
+                f"{meal_name} 시간이에요! 🍚 맛있는 식사 하세요!",
+                self.engine.mode,
+            )
+        self.schedule_meal_check()
+
+    def run(self):
+        """신호(SIGTERM, Ctrl+C)를 받을 때까지 예약을 실행합니다."""
+        while True:
+            deadline = self.scheduler.next_deadline()
+            if deadline is None:
+                timeout = MEAL_CHECK_MAX_SLEEP_SECONDS
+            else:
+                timeout = max(0.0, deadline - self.scheduler.clock())
+            watched = [
+                f for f in (self.server, self.main_thread_calls) if f is not None
+            ]
+            if watched:
+                readable, _, _ = select.select(watched, [], [], timeout)
+                if self.server in readable:
+                    self.server.accept_ready(self.handle_command)
+                if self.main_thread_calls in readable:
+                    self.main_thread_calls.run_pending()
+            else:
+                time.sleep(timeout)
+            self.scheduler.run_due()
+
+    def close(self):
+        if self.engine.is_counting_down():
+            # 진행 중인 세션은 끝내지 않고 기록만 남겨 두고, 다음에 켤 때
+            # resume_policy대로 이어갑니다. 기록을 지우는 것은 멈춤뿐입니다.
+            self.save_checkpoint()
+        elif self.engine.is_running:  # 이어갈 카운트다운이 없는 경우
+            self.engine.stop(END_CLOSED)
+        self.scheduler.cancel(self.engine_call)
+        self.scheduler.cancel(self.meal_check_call)
+        self.history.close()
+        if self.session_log is not None:
+            self.session_log.close()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        if self.control_server is not None:
+            self.control_server.close()
+            self.control_server = None
+            self.main_thread_calls.close()
+        if self.status_writer is not None:
+            self.status_writer.close(engine_state(self.engine))
+            self.status_writer = None
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+            self.metrics_server = None
+
+
+def _exit_on_signal(signum, frame):
+    raise SystemExit(0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=pomodoro_instance.HAND_OFF_COMMANDS,
+        default=pomodoro_instance.COMMAND_START,
+        help="켜져 있는 창이나 데몬이 있으면 그쪽에 넘길 명령 (기본: start)",
+    )
+    parser.add_argument("--hook", help="알림마다 셸로 실행할 명령")
+    parser.add_argument("--bell", action="store_true", help="알림마다 터미널 벨")
+    parser.add_argument(
+        "--quiet", action="store_true", help="알림을 표준 출력에 쓰지 않습니다."
+    )
+    parser.add_argument(
+        "--auto-continue",
+        action="store_true",
+        help="강제 휴식이 끝나면 start 명령을 기다리지 않고 바로 집중을 시작합니다.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="예약 콜백의 지연을 재고 localhost의 이 포트로 내보냅니다. (/metrics)",
+    )
+    args = parser.parse_args(argv)
+
+    server = pomodoro_instance.claim_or_hand_off([args.command], print_reply=True)
+    if args.command != pomodoro_instance.COMMAND_START:
+        # 넘길 곳이 없으면 멈추거나 보여줄 타이머도 없습니다.
+        if server is not None:
+            server.close()
+        sys.exit("켜져 있는 리프레시 뽀모도로가 없어요.")
+    notifier = Notifier(
+        stream=None if args.quiet else sys.stdout, hook=args.hook, bell=args.bell
+    )
+    daemon = PomodoroDaemon(notifier, auto_continue=args.auto_continue)
+    daemon.server = server
+    if server is not None:  # 제어 소켓과 상태 파일도 잠금을 잡은 쪽만 씁니다.
+        daemon.open_status_file()
+        daemon.start_control_server()
+        daemon.start_metrics(args.metrics_port)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        if not daemon.resume_session():
+            daemon.start()
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,759 @@
+"""뽀모도로 타이머 상태 머신입니다. (Tk 없이 동작)
+
+화면(PomodoroApp)과 분리되어 있어서 디스플레이 없이도 집중/휴식/긴 휴식
+전환 규칙을 그대로 돌릴 수 있습니다. 화면 쪽은 subscribe()로 이벤트를 받아
+표시만 담당합니다.
+"""
+
+import bisect
+import collections
+import datetime
+import math
+import time
+
+MODE_READY = "준비"
+MODE_WORK = "집중"
+MODE_REST = "휴식"
+MODE_LONG_REST = "긴 휴식"
+MODE_STOPPED = "정지됨"
+
+REST_MODES = (MODE_REST, MODE_LONG_REST)
+
+# 세션이 끝난 이유
+END_COMPLETED = "completed"  # 정해진 시간을 다 채움
+END_SKIPPED = "skipped"  # 휴식 중 화면을 클릭해서 일찍 끝냄
+END_STOPPED = "stopped"  # 정지 버튼
+END_CLOSED = "closed"  # 프로그램 종료
+END_ABANDONED = "abandoned"  # 세션 중에 꺼진 뒤 다시 켰을 때 이어가지 않음
+
+# 깨어난 시각이 초 경계보다 이만큼 이르더라도 경계에 도달한 것으로 봅니다.
+# (Tk after는 ms 단위로 반올림되어 아주 조금 일찍 깨어날 수 있음)
+TICK_TOLERANCE_SECONDS = 0.002
+
+# 바쁜 동안 놓친 식사 알림은 이 시간 안이면 늦게라도 보여줍니다.
+MEAL_ALERT_CATCH_UP_SECONDS = 30 * 60
+# 절전/시계 변경에 대비해 식사 알림 시각은 이 간격마다 한 번씩 다시 계산합니다.
+MEAL_CHECK_MAX_SLEEP_SECONDS = 15 * 60
+
+# --- 엔진 이벤트 ---
+# 남은 시간이 바뀔 때마다 발생
+Tick = collections.namedtuple("Tick", "mode remaining_seconds")
+# 모드가 바뀔 때 발생 (duration_seconds: 새 모드의 길이)
+ModeChanged = collections.namedtuple(
+    "ModeChanged", "previous_mode mode duration_seconds"
+)
+# 한 세션(집중/휴식/긴 휴식)이 끝났을 때 발생
+# started_at/ended_at은 wall_clock 기준 시각(초), reason은 END_* 중 하나입니다.
+SessionCompleted = collections.namedtuple(
+    "SessionCompleted",
+    "mode started_at ended_at planned_seconds focus_seconds reason",
+)
+# 오늘 통계가 바뀌었을 때 발생
+StatsChanged = collections.namedtuple(
+    "StatsChanged", "total_work_seconds_today pomodoro_cycles_today"
+)
+# 긴 휴식을 제안할 때 발생 (answer_long_rest()로 응답하거나,
+# timeout_seconds가 지나면 default_accept대로 진행)
+LongRestSuggested = collections.namedtuple(
+    "LongRestSuggested", "cycles duration_minutes timeout_seconds default_accept"
+)
+# 강제 휴식이 끝나고 사용자의 클릭을 기다릴 때 발생
+RestFinished = collections.namedtuple("RestFinished", "mode")
+# 설정값이 잘못돼서 전환을 못 했을 때 발생 (field: TimerSettings 필드 이름)
+SettingsInvalid = collections.namedtuple("SettingsInvalid", "field")
+# 타이머가 멈췄을 때 발생
+Stopped = collections.namedtuple("Stopped", "previous_mode")
+
+# 진행 중인 세션을 다시 시작할 때 쓰는 기록 (PomodoroEngine.checkpoint())
+# 시각은 모두 wall_clock 기준 초이고, saved_at은 이 기록을 만든 시각입니다.
+SessionCheckpoint = collections.namedtuple(
+    "SessionCheckpoint",
+    "mode started_at deadline planned_seconds focus_seconds saved_at",
+)
+
+# 프로그램이 꺼져 있던 시간을 어떻게 볼지 (PomodoroEngine.resume())
+RESUME_CONTINUE = "continue"  # 꺼져 있던 동안에도 타이머가 흐른 것으로 봄
+RESUME_PAUSE = "pause"  # 꺼진 시점에 멈춰 있다가 이어서 진행
+RESUME_DISCARD = "discard"  # 이어가지 않고 중단된 세션으로 기록만 함
+RESUME_POLICIES = (RESUME_CONTINUE, RESUME_PAUSE, RESUME_DISCARD)
+RESUME_DEFAULT_POLICY = RESUME_CONTINUE
+# 이보다 오래 꺼져 있었으면 정책과 상관없이 이어가지 않습니다.
+RESUME_MAX_DOWNTIME_SECONDS = 60 * 60
+
+# 긴 휴식 제안에 답이 없을 때 기본 선택을 적용하기까지 기다리는 시간(초)
+LONG_REST_PROMPT_TIMEOUT_SECONDS = 60
+LONG_REST_PROMPT_DEFAULT_ACCEPT = True
+
+# 엔진이 전환 시점에 읽는 설정값. 검사가 끝난 값만 담기며 바꿀 수 없습니다.
+# 긴 휴식 제안이 꺼져 있으면 long_rest_* 값은 None 입니다.
+# long_rest_prompt_timeout이 0이면 답을 받을 때까지 기다립니다.
+TimerSettings = collections.namedtuple(
+    "TimerSettings",
+    "work_minutes rest_minutes force_rest long_rest_cycle_threshold long_rest_duration"
+    " long_rest_prompt_timeout long_rest_prompt_default",
+    defaults=(LONG_REST_PROMPT_TIMEOUT_SECONDS, LONG_REST_PROMPT_DEFAULT_ACCEPT),
+)
+
+DEFAULT_TIMER_SETTINGS = TimerSettings(
+    work_minutes=25,
+    rest_minutes=5,
+    force_rest=True,
+    long_rest_cycle_threshold=4,
+    long_rest_duration=15,
+)
+
+DEFAULT_MEAL_TIMES = {"점심": "12:00", "저녁": "17:30"}
+
+# TimerSettings 필드 이름 -> 화면에 보여줄 이름
+TIMER_SETTING_LABELS = {
+    "work_minutes": "집중 시간",
+    "rest_minutes": "휴식 시간",
+    "long_rest_cycle_threshold": "긴 휴식 반복 횟수",
+    "long_rest_duration": "긴 휴식 추천 시간",
+    "long_rest_prompt_timeout": "긴 휴식 제안 대기 시간",
+}
+# 화면의 입력칸으로 고치는 필드 (나머지는 설정 파일에만 있습니다)
+TIMER_ENTRY_FIELDS = (
+    "work_minutes",
+    "rest_minutes",
+    "long_rest_cycle_threshold",
+    "long_rest_duration",
+)
+
+
+def parse_positive_integer(val_str):
+    """양의 정수 문자열이면 int로, 아니면 None을 반환합니다."""
+    try:
+        value = int(val_str)
+    except (TypeError, ValueError):
+        return None
+    if value <= 0:
+        return None
+    return value
+
+
+def parse_meal_time(time_str):
+    """HH:MM 형식이면 datetime.time으로, 아니면 None을 반환합니다."""
+    try:
+        return datetime.datetime.strptime(time_str, "%H:%M").time()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_timer_settings(
+    work_minutes,
+    rest_minutes,
+    force_rest,
+    use_long_rest_suggestion,
+    long_rest_cycle_threshold,
+    long_rest_duration,
+    previous=DEFAULT_TIMER_SETTINGS,
+    long_rest_prompt_timeout=LONG_REST_PROMPT_TIMEOUT_SECONDS,
+    long_rest_prompt_default=LONG_REST_PROMPT_DEFAULT_ACCEPT,
+):
+    """입력칸 문자열을 검사해 (TimerSettings, 잘못된 필드 이름 튜플)을 반환합니다.
+
+    잘못된 값은 previous의 값을 그대로 써서, 입력 중인 값 때문에 타이머가
+    멈추거나 경고창이 뜨지 않도록 합니다.
+    """
+    invalid_fields = []
+
+    def parse(field, val_str):
+        value = parse_positive_integer(val_str)
+        if value is None:
+            invalid_fields.append(field)
+            return getattr(previous, field)
+        return value
+
+    parsed_work_minutes = parse("work_minutes", work_minutes)
+    parsed_rest_minutes = parse("rest_minutes", rest_minutes)
+    if use_long_rest_suggestion:
+        threshold = parse("long_rest_cycle_threshold", long_rest_cycle_threshold)
+        duration = parse("long_rest_duration", long_rest_duration)
+        if threshold is None or duration is None:
+            threshold = duration = None
+    else:
+        threshold = duration = None
+    if (
+        not isinstance(long_rest_prompt_timeout, (int, float))
+        or long_rest_prompt_timeout < 0
+    ):
+        invalid_fields.append("long_rest_prompt_timeout")
+        long_rest_prompt_timeout = previous.long_rest_prompt_timeout
+    settings = TimerSettings(
+        work_minutes=parsed_work_minutes,
+        rest_minutes=parsed_rest_minutes,
+        force_rest=bool(force_rest),
+        long_rest_cycle_threshold=threshold,
+        long_rest_duration=duration,
+        long_rest_prompt_timeout=long_rest_prompt_timeout,
+        long_rest_prompt_default=bool(long_rest_prompt_default),
+    )
+    return settings, tuple(invalid_fields)
+
+
+def parse_timer_settings_dict(settings, previous=DEFAULT_TIMER_SETTINGS):
+    """설정 파일(JSON)과 같은 키를 쓰는 dict로 parse_timer_settings()를 부릅니다.
+
+    없는 키는 기본값을 씁니다. 화면 없이 도는 데몬이나 서버가 씁니다.
+    """
+    defaults = DEFAULT_TIMER_SETTINGS
+    return parse_timer_settings(
+        settings.get("work_minutes", str(defaults.work_minutes)),
+        settings.get("rest_minutes", str(defaults.rest_minutes)),
+        settings.get("force_rest", defaults.force_rest),
+        settings.get("use_long_rest_suggestion", True),
+        settings.get(
+            "long_rest_cycle_threshold", str(defaults.long_rest_cycle_threshold)
+        ),
+        settings.get("long_rest_duration", str(defaults.long_rest_duration)),
+        previous=previous,
+        long_rest_prompt_timeout=settings.get(
+            "long_rest_prompt_timeout_seconds", LONG_REST_PROMPT_TIMEOUT_SECONDS
+        ),
+        long_rest_prompt_default=settings.get(
+            "long_rest_prompt_default_accept", LONG_REST_PROMPT_DEFAULT_ACCEPT
+        ),
+    )
+
+
+def meal_times_from_dict(settings, default_enabled=True):
+    """설정 dict에서 {이름: "HH:MM"} 식사 알림 목록을 꺼냅니다. 꺼져 있으면 빈 dict."""
+    if not settings.get("use_meal_alert", default_enabled):
+        return {}
+    meal_times = dict(DEFAULT_MEAL_TIMES)
+    loaded = settings.get("meal_times")
+    if isinstance(loaded, dict):
+        meal_times.update(loaded)
+    return meal_times
+
+
+def _before_minute(current):
+    """current가 속한 분이 시작되기 바로 전 시각
+
+    12:00:30에 켜거나 설정을 고쳐도 12:00 알림은 아직 확인하지 않은 것으로 둡니다.
+    """
+    return current.replace(second=0, microsecond=0) - datetime.timedelta(
+        microseconds=1
+    )
+
+
+class MealSchedule:
+    """식사 알림 시각을 정렬해 두고 다음에 깨어날 시각을 계산합니다.
+
+    알림 시각은 set_times()가 불릴 때(설정이 바뀔 때)만 다시 파싱합니다.
+    check()는 마지막 확인 이후 지나간 알림을 모두 돌려주므로, 컴퓨터가 바빠
+    늦게 깨어나도 알림을 놓치지 않습니다.
+    """
+
+    def __init__(
+        self, now=datetime.datetime.now, catch_up_seconds=MEAL_ALERT_CATCH_UP_SECONDS
+    ):
+        self._now = now
+        self.catch_up_seconds = catch_up_seconds
+        self._alerts = []  # (datetime.time, 이름) 을 시각 순으로 정렬
+        self._shown_today = set()
+        current = now()
+        self.today = current.date()
+        self._last_checked = _before_minute(current)
+
+    def set_times(self, meal_times):
+        """{이름: "HH:MM"}으로 알림 목록을 다시 만들고 잘못된 이름 목록을 반환합니다."""
+        alerts = []
+        invalid_names = []
+        for meal_name, time_str in meal_times.items():
+            meal_time = parse_meal_time(time_str)
+            if meal_time is None:
+                invalid_names.append(meal_name)
+            else:
+                alerts.append((meal_time, meal_name))
+        alerts.sort()
+        self._alerts = alerts
+        # 설정을 고친 분보다 이전 시각은 따라잡지 않습니다.
+        self._last_checked = max(self._last_checked, _before_minute(self._now()))
+        return invalid_names
+
+    def _roll_over(self, current):
+        if current.date() == self.today:
+            return False
+        self.today = current.date()
+        self._shown_today.clear()
+        if self._last_checked.date() != self.today:
+            self._last_checked = datetime.datetime.combine(
+                self.today, datetime.time.min
+            )
+        return True
+
+    def check(self):
+        """(날짜가 바뀌었는지, 지금 보여줄 식사 이름 목록)을 반환합니다."""
+        current = self._now()
+        new_day = self._roll_over(current)
+        due = []
+        for meal_time, meal_name in self._alerts:
+            if meal_name in self._shown_today:
+                continue
+            alert_at = datetime.datetime.combine(self.today, meal_time)
+            if alert_at > current:
+                break
+            if alert_at <= self._last_checked:
+                continue
+            self._shown_today.add(meal_name)
+            if (current - alert_at).total_seconds() <= self.catch_up_seconds:
+                due.append(meal_name)
+        self._last_checked = current
+        return new_day, due
+
+    def next_alert_at(self):
+        """다음 알림(없으면 자정) 시각을 datetime으로 반환합니다."""
+        start = bisect.bisect_right(
+            self._alerts, (self._last_checked.time(), chr(0x10FFFF))
+        )
+        if self._last_checked.date() != self.today:
+            start = 0
+        for meal_time, meal_name in self._alerts[start:]:
+            if meal_name not in self._shown_today:
+                return datetime.datetime.combine(self.today, meal_time)
+        return datetime.datetime.combine(
+            self.today + datetime.timedelta(days=1), datetime.time.min
+        )
+
+    def seconds_until_next_check(self, max_sleep=MEAL_CHECK_MAX_SLEEP_SECONDS):
+        delay = (self.next_alert_at() - self._now()).total_seconds()
+        return min(max(0.0, delay), max_sleep)
+
+
+class DriftReport:
+    """깨어난 시각이 예정보다 얼마나 늦었는지(지터)와 세션 종료 오차를 모읍니다."""
+
+    __slots__ = (
+        "wakeups",
+        "wakeup_lateness_total",
+        "wakeup_lateness_max",
+        "transitions",
+        "transition_error_total",
+        "transition_error_max",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.wakeups = 0
+        self.wakeup_lateness_total = 0.0
+        self.wakeup_lateness_max = 0.0
+        self.transitions = 0
+        self.transition_error_total = 0.0
+        self.transition_error_max = 0.0
+
+    def record_wakeup(self, lateness):
+        self.wakeups += 1
+        self.wakeup_lateness_total += lateness
+        if lateness > self.wakeup_lateness_max:
+            self.wakeup_lateness_max = lateness
+
+    def record_transition(self, error):
+        self.transitions += 1
+        self.transition_error_total += error
+        if error > self.transition_error_max:
+            self.transition_error_max = error
+
+    def summary(self):
+        """ms 단위 요약을 dict로 반환합니다."""
+        return {
+            "wakeups": self.wakeups,
+            "wakeup_lateness_mean_ms": (
+                self.wakeup_lateness_total / self.wakeups * 1000
+                if self.wakeups
+                else 0.0
+            ),
+            "wakeup_lateness_max_ms": self.wakeup_lateness_max * 1000,
+            "transitions": self.transitions,
+            "transition_error_mean_ms": (
+                self.transition_error_total / self.transitions * 1000
+                if self.transitions
+                else 0.0
+            ),
+            "transition_error_max_ms": self.transition_error_max * 1000,
+        }
+
+    def format(self):
+        summary = self.summary()
+        return (
+            f"깨어남 {summary['wakeups']}회 "
+            f"(평균 {summary['wakeup_lateness_mean_ms']:.2f}ms, "
+            f"최대 {summary['wakeup_lateness_max_ms']:.2f}ms 늦음) / "
+            f"전환 {summary['transitions']}회 "
+            f"(평균 {summary['transition_error_mean_ms']:.2f}ms, "
+            f"최대 {summary['transition_error_max_ms']:.2f}ms 오차)"
+        )
+
+
+class PomodoroEngine:
+    """집중/휴식/긴 휴식 전환 규칙을 담당하는 타이머 엔진입니다.
+
+    settings는 검사가 끝난 TimerSettings이고, clock은 초 단위 단조
+    시계, wall_clock은 기록용 실제 시각(time.time)입니다. 화면 없이 여러
+    엔진을 돌리거나 테스트할 때 바꿔 끼웁니다.
+
+    남은 시간은 1초씩 빼는 대신 절대 마감 시각(deadline)에서 매번 계산하므로,
+    콜백이 늦게 불려도 타이머가 밀리지 않습니다.
+
+    서버 하나가 사용자 수천 명의 엔진을 함께 돌릴 수 있도록 __slots__로 둡니다.
+    """
+
+    __slots__ = (
+        "settings",
+        "_clock",
+        "_wall_clock",
+        "_listeners",
+        "mode",
+        "remaining_seconds",
+        "is_running",
+        "awaiting_long_rest_answer",
+        "rest_finished",
+        "deadline",
+        "decision_deadline",
+        "total_work_seconds_today",
+        "pomodoro_cycles_today",
+        "drift",
+        "_session_started_at",
+        "_session_started_wall",
+        "_planned_seconds",
+        "_suggested_long_rest_minutes",
+        "_expected_wakeup",
+    )
+
+    def __init__(
+        self,
+        settings=DEFAULT_TIMER_SETTINGS,
+        clock=time.monotonic,
+        wall_clock=time.time,
+    ):
+        self.settings = settings
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._listeners = []
+
+        self.mode = MODE_READY
+        self.remaining_seconds = 0
+        self.is_running = False
+        self.awaiting_long_rest_answer = False
+        self.rest_finished = False
+        self.deadline = None
+        self.decision_deadline = None
+        self.total_work_seconds_today = 0
+        self.pomodoro_cycles_today = 0
+        self.drift = DriftReport()
+        self._session_started_at = None
+        self._session_started_wall = None
+        self._planned_seconds = 0
+        self._suggested_long_rest_minutes = None
+        self._expected_wakeup = None
+
+    def now(self):
+        return self._clock()
+
+    def update_settings(self, settings):
+        """새 설정 묶음으로 통째로 바꿉니다. 다음 전환부터 적용됩니다."""
+        self.settings = settings
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, event):
+        for listener in tuple(self._listeners):
+            listener(event)
+
+    def start(self):
+        if self.is_running:
+            return False
+        self.is_running = True
+        return self._start_work()
+
+    def is_counting_down(self):
+        return (
+            self.is_running
+            and self.deadline is not None
+            and not self.awaiting_long_rest_answer
+            and not self.rest_finished
+        )
+
+    def current_focus_seconds(self):
+        """지금 진행 중인 집중 세션에서 쌓인 집중 시간(초)입니다."""
+        if not self.is_running or self.mode != MODE_WORK:
+            return 0
+        if self._session_started_at is None:
+            return 0
+        elapsed = min(self._clock(), self.deadline) - self._session_started_at
+        return max(0, int(elapsed))
+
+    def next_wakeup(self):
+        """다음 초 경계(남은 시간 표시가 바뀌는 시각)를 반환합니다.
+
+        긴 휴식 제안에 답을 기다리는 중이면 기본 선택을 적용할 시각을,
+        기다릴 일이 없으면 None을 반환합니다. 호출한 쪽은 이 시각에
+        poll()을 불러주면 됩니다.
+        """
+        if self.awaiting_long_rest_answer and self.decision_deadline is not None:
+            self._expected_wakeup = None
+            return self.decision_deadline
+        if not self.is_counting_down():
+            self._expected_wakeup = None
+            return None
+        now = self._clock()
+        left = self.deadline - now - TICK_TOLERANCE_SECONDS
+        if left <= 0:
+            wakeup = now
+        else:
+            wakeup = self.deadline - (math.ceil(left) - 1)
+        self._expected_wakeup = wakeup
+        return wakeup
+
+    def poll(self):
+        """마감 시각 기준으로 남은 시간을 다시 계산하고 필요하면 다음 모드로 넘깁니다."""
+        if (
+            self.awaiting_long_rest_answer
+            and self.decision_deadline is not None
+            and self._clock() >= self.decision_deadline
+        ):
+            self.answer_long_rest(self.settings.long_rest_prompt_default)
+            return
+        if not self.is_counting_down():
+            return
+        now = self._clock()
+        if self._expected_wakeup is not None:
+            self.drift.record_wakeup(max(0.0, now - self._expected_wakeup))
+            self._expected_wakeup = None
+        left = self.deadline - now - TICK_TOLERANCE_SECONDS
+        remaining = max(0, math.ceil(left))
+        if remaining != self.remaining_seconds:
+            self.remaining_seconds = remaining
+            self._emit(Tick(self.mode, remaining))
+        if left <= 0:
+            self.drift.record_transition(max(0.0, now - self.deadline))
+            self._finish_session()
+
+    def answer_long_rest(self, accepted):
+        if not self.awaiting_long_rest_answer:
+            return
+        self.awaiting_long_rest_answer = False
+        self.decision_deadline = None
+        minutes = self._suggested_long_rest_minutes
+        self._suggested_long_rest_minutes = None
+        if accepted:
+            self._enter_mode(MODE_LONG_REST, minutes * 60)
+        else:
+            self._start_rest()
+
+    def can_end_rest(self):
+        if not self.is_running or self.mode not in REST_MODES:
+            return False
+        if self.mode == MODE_LONG_REST or self.rest_finished:
+            return True
+        return not self.settings.force_rest
+
+    def end_rest(self):
+        """휴식을 끝내고 바로 다음 집중을 시작합니다. (오버레이 클릭)"""
+        if not self.can_end_rest():
+            return False
+        self._complete_session(reason=END_SKIPPED)
+        return self._start_work()
+
+    def stop(self, reason=END_STOPPED):
+        if self.is_running and self.mode == MODE_WORK:
+            focus_seconds = self.current_focus_seconds()
+            self.total_work_seconds_today += focus_seconds
+            self._complete_session(focus_seconds, reason)
+            self._emit_stats()
+        elif self.is_running:
+            self._complete_session(reason=reason)
+        previous_mode = self.mode
+        self.is_running = False
+        self.mode = MODE_STOPPED
+        self.awaiting_long_rest_answer = False
+        self.decision_deadline = None
+        self.rest_finished = False
+        self.deadline = None
+        self._session_started_at = None
+        self._expected_wakeup = None
+        self._emit(Stopped(previous_mode))
+
+    def checkpoint(self):
+        """진행 중인 세션을 다시 이어가는 데 필요한 값을 SessionCheckpoint로 반환합니다.
+
+        카운트다운 중이 아니면(멈춤, 긴 휴식 답 대기, 강제 휴식 끝) None 입니다.
+        """
+        if not self.is_counting_down() or self._session_started_at is None:
+            return None
+        now = self._clock()
+        wall_now = self._wall_clock()
+        return SessionCheckpoint(
+            self.mode,
+            self._session_started_wall,
+            wall_now + (self.deadline - now),
+            self._planned_seconds,
+            self.current_focus_seconds(),
+            wall_now,
+        )
+
+    def resume(
+        self,
+        checkpoint,
+        policy=RESUME_DEFAULT_POLICY,
+        max_downtime=RESUME_MAX_DOWNTIME_SECONDS,
+    ):
+        """checkpoint()로 남긴 세션을 이어서 시작합니다. 이어갔으면 True를 반환합니다.
+
+        꺼져 있던 시간(saved_at부터 지금까지)은 policy에 따라 처리합니다.
+        RESUME_CONTINUE는 원래 마감 시각을 그대로 쓰므로 이미 지났으면 바로 다음
+        모드로 넘어가고, RESUME_PAUSE는 꺼져 있던 시간만큼 마감을 미룹니다.
+        이어가지 않을 때는 그때까지의 집중 시간을 END_ABANDONED로 기록합니다.
+        """
+        if self.is_running:
+            return False
+        wall_now = self._wall_clock()
+        downtime = wall_now - checkpoint.saved_at
+        if (
+            policy not in (RESUME_CONTINUE, RESUME_PAUSE)
+            or downtime < 0  # 시계가 거꾸로 간 경우
+            or (max_downtime is not None and downtime > max_downtime)
+        ):
+            self._abandon(checkpoint)
+            return False
+        if policy == RESUME_PAUSE:
+            left = checkpoint.deadline - checkpoint.saved_at
+        else:
+            left = checkpoint.deadline - wall_now
+        now = self._clock()
+        previous_mode = self.mode
+        self.is_running = True
+        self.mode = checkpoint.mode
+        self.rest_finished = False
+        self.deadline = now + max(0.0, left)
+        # 집중 시간은 마감 시각에서 거꾸로 계산하므로 시작 시각도 마감에 맞춥니다.
+        self._session_started_at = self.deadline - checkpoint.planned_seconds
+        self._session_started_wall = checkpoint.started_at
+        self._planned_seconds = checkpoint.planned_seconds
+        self.remaining_seconds = max(0, math.ceil(left - TICK_TOLERANCE_SECONDS))
+        self._expected_wakeup = None
+        self._emit(ModeChanged(previous_mode, self.mode, checkpoint.planned_seconds))
+        self.poll()  # 마감이 이미 지났으면 여기서 다음 모드로 넘어갑니다.
+        return True
+
+    def _abandon(self, checkpoint):
+        focus_seconds = checkpoint.focus_seconds if checkpoint.mode == MODE_WORK else 0
+        self._emit(
+            SessionCompleted(
+                checkpoint.mode,
+                checkpoint.started_at,
+                checkpoint.saved_at,
+                checkpoint.planned_seconds,
+                focus_seconds,
+                END_ABANDONED,
+            )
+        )
+        if focus_seconds:
+            self.total_work_seconds_today += focus_seconds
+            self._emit_stats()
+
+    def reset_daily_stats(self):
+        self.total_work_seconds_today = 0
+        self.pomodoro_cycles_today = 0
+        self._emit_stats()
+
+    def _emit_stats(self):
+        self._emit(
+            StatsChanged(self.total_work_seconds_today, self.pomodoro_cycles_today)
+        )
+
+    def _enter_mode(self, mode, duration_seconds):
+        previous_mode = self.mode
+        now = self._clock()
+        self.mode = mode
+        self.remaining_seconds = duration_seconds
+        self.rest_finished = False
+        self.deadline = now + duration_seconds
+        self._session_started_at = now
+        self._session_started_wall = self._wall_clock()
+        self._planned_seconds = duration_seconds
+        self._expected_wakeup = None
+        self._emit(ModeChanged(previous_mode, mode, duration_seconds))
+
+    def _start_work(self):
+        work_minutes = self.settings.work_minutes
+        if work_minutes is None:
+            self.stop()
+            self._emit(SettingsInvalid("work_minutes"))
+            return False
+        self._enter_mode(MODE_WORK, work_minutes * 60)
+        return True
+
+    def _start_rest(self):
+        rest_minutes = self.settings.rest_minutes
+        if rest_minutes is None:
+            self.stop()
+            self._emit(SettingsInvalid("rest_minutes"))
+            return False
+        self._enter_mode(MODE_REST, rest_minutes * 60)
+        return True
+
+    def _complete_session(self, focus_seconds=0, reason=END_COMPLETED):
+        if self._session_started_at is None:
+            return  # 이미 기록한 세션 (예: 강제 휴식이 끝나고 클릭을 기다리는 중)
+        self._session_started_at = None
+        self._emit(
+            SessionCompleted(
+                self.mode,
+                self._session_started_wall,
+                self._wall_clock(),
+                self._planned_seconds,
+                focus_seconds,
+                reason,
+            )
+        )
+
+    def _finish_session(self):
+        if self.mode == MODE_WORK:
+            # 마감 시각에 끝난 것으로 보므로 집중 시간은 계획한 길이와 같습니다.
+            focus_seconds = self._planned_seconds
+            self.total_work_seconds_today += focus_seconds
+            self.pomodoro_cycles_today += 1
+            self._complete_session(focus_seconds)
+            self._emit_stats()
+            settings = self.settings
+            threshold = settings.long_rest_cycle_threshold
+            duration = settings.long_rest_duration
+            if (
+                threshold is not None
+                and duration is not None
+                and self.pomodoro_cycles_today > 0
+                and self.pomodoro_cycles_today % threshold == 0
+            ):
+                # 답을 기다리는 동안에도 엔진은 멈추지 않고, 시간이 지나면
+                # 기본 선택을 적용합니다. (poll/next_wakeup 참고)
+                timeout = settings.long_rest_prompt_timeout
+                self.awaiting_long_rest_answer = True
+                self._suggested_long_rest_minutes = duration
+                self.decision_deadline = self._clock() + timeout if timeout else None
+                self._emit(
+                    LongRestSuggested(
+                        self.pomodoro_cycles_today,
+                        duration,
+                        timeout,
+                        settings.long_rest_prompt_default,
+                    )
+                )
+                return
+            self._start_rest()
+        elif self.mode == MODE_REST and self.settings.force_rest:
+            # 강제 휴식은 시간이 끝나도 사용자가 화면을 클릭할 때까지 기다립니다.
+            self.rest_finished = True
+            self._complete_session()
+            self._emit(RestFinished(self.mode))
+        else:
+            self._complete_session()
+            self._start_work()
@@ -0,0 +1,157 @@
+"""끝난 세션을 차곡차곡 쌓아 두는 기록 저장소입니다. (Tk 없이 동작)
+
+세션 한 건마다 sessions 표에 한 줄을 덧붙이고, 같은 트랜잭션에서 날짜별
+합계(daily_totals)도 함께 갱신합니다. 그래서 "오늘 집중 시간"은 다시 더할
+필요 없이 날짜 하나로 바로 찾을 수 있습니다.
+"""
+
+import collections
+import datetime
+import sqlite3
+
+from pomodoro_engine import END_COMPLETED, MODE_WORK
+
+HISTORY_FILENAME = "refresh_pomodoro_history.sqlite3"
+
+# 기록 한 건. 시각은 time.time() 기준 초, day는 끝난 날짜(YYYY-MM-DD) 입니다.
+# interruption은 끝까지 채운 세션이면 None, 아니면 끝난 이유(END_*) 입니다.
+SessionRecord = collections.namedtuple(
+    "SessionRecord",
+    "day started_at ended_at mode planned_seconds actual_seconds focus_seconds"
+    " interruption",
+)
+
+# 날짜별 합계
+DailyTotals = collections.namedtuple(
+    "DailyTotals", "focus_seconds pomodoro_cycles sessions interruptions"
+)
+EMPTY_DAILY_TOTALS = DailyTotals(0, 0, 0, 0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    planned_seconds INTEGER NOT NULL,
+    actual_seconds INTEGER NOT NULL,
+    focus_seconds INTEGER NOT NULL,
+    interruption TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day TEXT PRIMARY KEY,
+    focus_seconds INTEGER NOT NULL DEFAULT 0,
+    pomodoro_cycles INTEGER NOT NULL DEFAULT 0,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    interruptions INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def day_key(timestamp):
+    """time.time() 값을 기록용 날짜 문자열(현지 시간 기준)로 바꿉니다."""
+    return datetime.date.fromtimestamp(timestamp).isoformat()
+
+
+class SessionHistory:
+    """SQLite 파일에 세션 기록과 날짜별 합계를 저장합니다."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self._conn = sqlite3.connect(path)
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            # 파일을 쓸 수 없어도 프로그램은 돌아가야 하므로 메모리에만 기록합니다.
+            print(f"기록 파일을 열지 못해 메모리에만 기록합니다: {e}")
+            self.path = ":memory:"
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+        self._totals_cache = {}
+
+    def close(self):
+        self._conn.close()
+
+    def record(self, record):
+        """세션 한 건을 덧붙이고 그 날의 합계를 함께 갱신합니다."""
+        interrupted = record.interruption is not None
+        cycles = 1 if record.mode == MODE_WORK and not interrupted else 0
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (day, started_at, ended_at, mode,"
+                " planned_seconds, actual_seconds, focus_seconds, interruption)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                record,
+            )
+            self._conn.execute(
+                "INSERT INTO daily_totals"
+                " (day, focus_seconds, pomodoro_cycles, sessions, interruptions)"
+                " VALUES (?, ?, ?, 1, ?)"
+                " ON CONFLICT (day) DO UPDATE SET"
+                " focus_seconds = focus_seconds + excluded.focus_seconds,"
+                " pomodoro_cycles = pomodoro_cycles + excluded.pomodoro_cycles,"
+                " sessions = sessions + 1,"
+                " interruptions = interruptions + excluded.interruptions",
+                (record.day, record.focus_seconds, cycles, int(interrupted)),
+            )
+        totals = self._totals_cache.get(record.day)
+        if totals is not None:
+            self._totals_cache[record.day] = DailyTotals(
+                totals.focus_seconds + record.focus_seconds,
+                totals.pomodoro_cycles + cycles,
+                totals.sessions + 1,
+                totals.interruptions + int(interrupted),
+            )
+
+    def record_session(self, event):
+        """pomodoro_engine.SessionCompleted 이벤트를 기록합니다."""
+        record = SessionRecord(
+            day=day_key(event.ended_at),
+            started_at=event.started_at,
+            ended_at=event.ended_at,
+            mode=event.mode,
+            planned_seconds=event.planned_seconds,
+            actual_seconds=max(0, int(round(event.ended_at - event.started_at))),
+            focus_seconds=event.focus_seconds,
+            interruption=None if event.reason == END_COMPLETED else event.reason,
+        )
+        self.record(record)
+        return record
+
+    def daily_totals(self, day):
+        """그 날의 합계를 반환합니다. 한 번 읽은 날짜는 메모리에서 바로 돌려줍니다."""
+        totals = self._totals_cache.get(day)
+        if totals is None:
+            row = self._conn.execute(
+                "SELECT focus_seconds, pomodoro_cycles, sessions, interruptions"
+                " FROM daily_totals WHERE day = ?",
+                (day,),
+            ).fetchone()
+            totals = DailyTotals(*row) if row else EMPTY_DAILY_TOTALS
+            self._totals_cache[day] = totals
+        return totals
+
+    def import_daily_totals(self, day, focus_seconds, pomodoro_cycles):
+        """예전 설정 파일에만 남아 있던 오늘 통계를 합계 표로 옮깁니다.
+
+        그 날 합계가 이미 있으면 아무것도 하지 않습니다.
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO daily_totals"
+                " (day, focus_seconds, pomodoro_cycles) VALUES (?, ?, ?)",
+                (day, focus_seconds, pomodoro_cycles),
+            )
+        self._totals_cache.pop(day, None)
+
+    def sessions_between(self, first_day, last_day):
+        """first_day부터 last_day까지(포함)의 세션을 시간 순으로 반환합니다."""
+        rows = self._conn.execute(
+            "SELECT day, started_at, ended_at, mode, planned_seconds,"
+            " actual_seconds, focus_seconds, interruption FROM sessions"
+            " WHERE day BETWEEN ? AND ? ORDER BY started_at",
+            (first_day, last_day),
+        )
+        return [SessionRecord(*row) for row in rows]
@@ -0,0 +1,209 @@
+"""프로그램이 하나만 켜지도록 잠금 파일과 유닉스 소켓으로 관리합니다. (Tk 없이 동작)
+
+처음 켠 프로그램은 잠금 파일을 잡고 소켓을 열어 둡니다. 두 번째로 켠
+프로그램은 잠금을 잡지 못하면 Tk를 불러오지 않은 채 소켓으로 명령(show,
+start, stop)만 넘기고 바로 끝납니다. fcntl이나 유닉스 소켓이 없는 OS(Windows)
+에서는 잠그지 않고 예전처럼 그냥 켜집니다.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+from pomodoro_storage import get_settings_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_FILENAME = "refresh_pomodoro.lock"
+SOCKET_FILENAME = "refresh_pomodoro.sock"
+
+COMMAND_SHOW = "show"
+COMMAND_START = "start"
+COMMAND_STOP = "stop"
+HAND_OFF_COMMANDS = (COMMAND_SHOW, COMMAND_START, COMMAND_STOP)
+
+# 먼저 켠 프로그램이 아직 소켓을 열고 있는 중일 수 있으므로 잠깐 다시 시도합니다.
+CONNECT_RETRY_SECONDS = 2.0
+CONNECT_RETRY_INTERVAL_SECONDS = 0.02
+# 먼저 켠 프로그램이 창을 띄우는 중이면 답이 늦을 수 있습니다.
+REPLY_TIMEOUT_SECONDS = 5.0
+# 연결한 쪽이 명령을 보내기까지 기다리는 시간 (메인 스레드에서 읽으므로 짧게)
+REQUEST_TIMEOUT_SECONDS = 0.2
+
+
+def supported():
+    return fcntl is not None and hasattr(socket, "AF_UNIX")
+
+
+def runtime_paths(settings_path=None):
+    """(잠금 파일, 소켓) 경로. 설정 파일과 같은 폴더를 씁니다."""
+    directory = os.path.dirname(settings_path or get_settings_path())
+    return (
+        os.path.join(directory, LOCK_FILENAME),
+        os.path.join(directory, SOCKET_FILENAME),
+    )
+
+
+def parse_command(argv):
+    """명령줄에서 넘길 명령을 찾습니다. 없으면 show 입니다."""
+    for arg in argv:
+        if arg in HAND_OFF_COMMANDS:
+            return arg
+    return COMMAND_SHOW
+
+
+def format_status(reply):
+    """show 명령의 답을 한 줄로 만듭니다."""
+    mins, secs = divmod(int(reply.get("remaining_seconds", 0)), 60)
+    text = f"{reply.get('mode', '?')} {mins:02d}:{secs:02d}"
+    if "pomodoro_cycles_today" in reply:
+        focus_minutes = reply.get("total_work_seconds_today", 0) // 60
+        text += (
+            f" · 오늘 뽀모도로 {reply['pomodoro_cycles_today']}번,"
+            f" 집중 {focus_minutes}분"
+        )
+    return text
+
+
+def encode_message(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode_message(line):
+    message = json.loads(line.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("JSON 객체가 아닙니다.")
+    return message
+
+
+class InstanceServer:
+    """먼저 켠 프로그램이 잡고 있는 잠금과 명령 소켓입니다.
+
+    소켓은 논블로킹이라 Tk의 createfilehandler나 select로 읽을 수 있을 때만
+    accept_ready()를 부르면 됩니다. 잠금은 close()하거나 프로세스가 끝날 때
+    풀립니다.
+    """
+
+    def __init__(self, lock_file, sock, socket_path):
+        self.lock_file = lock_file
+        self.sock = sock
+        self.socket_path = socket_path
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def accept_ready(self, dispatch):
+        """대기 중인 연결을 모두 받아 dispatch(명령, 메시지)의 결과를 답합니다."""
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            with conn:
+                conn.settimeout(REQUEST_TIMEOUT_SECONDS)
+                try:
+                    message = decode_message(conn.makefile("rb").readline())
+                    reply = dispatch(message.get("command"), message)
+                except (OSError, ValueError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                try:
+                    conn.sendall(encode_message(reply))
+                except OSError:
+                    pass  # 답을 기다리지 않고 끊은 경우
+
+    def close(self):
+        try:
+            self.sock.close()
+        finally:
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            self.lock_file.close()
+
+
+def claim(settings_path=None):
+    """잠금을 잡고 명령 소켓을 엽니다. 다른 프로그램이 이미 잡고 있으면 None."""
+    lock_path, socket_path = runtime_paths(settings_path)
+    lock_file = open(lock_path, "a+")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(f"{os.getpid()}\n")
+    lock_file.flush()
+    # 잠금을 잡았으니 남아 있는 소켓 파일은 비정상 종료한 예전 프로그램의 것입니다.
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(socket_path)
+        sock.listen(16)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        lock_file.close()
+        raise
+    return InstanceServer(lock_file, sock, socket_path)
+
+
+def send_command(command, settings_path=None, retry_seconds=CONNECT_RETRY_SECONDS):
+    """켜져 있는 프로그램에 명령을 보내고 답(dict)을 반환합니다."""
+    _, socket_path = runtime_paths(settings_path)
+    give_up_at = time.monotonic() + retry_seconds
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(socket_path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+            if time.monotonic() >= give_up_at:
+                raise
+            time.sleep(CONNECT_RETRY_INTERVAL_SECONDS)
+    with sock:
+        sock.settimeout(REPLY_TIMEOUT_SECONDS)
+        sock.sendall(encode_message({"command": command}))
+        line = sock.makefile("rb").readline()
+    if not line:
+        raise ConnectionError("답을 받지 못했습니다.")
+    return decode_message(line)
+
+
+def claim_or_hand_off(argv, settings_path=None, print_reply=False):
+    """먼저 켠 프로그램이 있으면 명령을 넘기고 종료, 없으면 InstanceServer를 반환합니다.
+
+    지원하지 않는 OS에서는 None을 반환하고 그냥 켜지게 둡니다. print_reply가
+    참이면 넘긴 뒤 켜져 있는 쪽의 상태를 한 줄로 출력합니다.
+    """
+    if not supported():
+        return None
+    try:
+        server = claim(settings_path)
+    except OSError as e:
+        print(f"다른 창 확인을 건너뜁니다: {e}", file=sys.stderr)
+        return None
+    if server is not None:
+        return server
+    command = parse_command(argv)
+    try:
+        reply = send_command(command, settings_path)
+    except (OSError, ValueError) as e:
+        print(f"이미 켜져 있는 리프레시 뽀모도로에 연결하지 못했어요: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not reply.get("ok"):
+        print(reply.get("error", "명령을 처리하지 못했어요."), file=sys.stderr)
+        sys.exit(1)
+    if print_reply:
+        print(format_status(reply))
+    sys.exit(0)
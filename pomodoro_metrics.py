@@ -0,0 +1,262 @@
+"""예약 실행기 콜백이 예정보다 얼마나 늦게, 얼마나 오래 돌았는지 모읍니다. (Tk 없이 동작)
+
+Scheduler.metrics에 CallbackMetrics를 넣으면 run_due()가 콜백마다 늦은 시간
+(실제 시작 - 예약 시각)과 실행 시간을 이름별 히스토그램에 기록합니다. 넣지 않으면
+(기본값 None) 콜백마다 None 비교 한 번만 더 합니다.
+
+히스토그램은 HDR 히스토그램처럼 마이크로초 값을 2의 거듭제곱 구간으로 나누고
+구간마다 같은 간격의 칸을 두어, 값의 크기와 관계없이 상대 오차 1/64 안에서
+백분위를 계산합니다.
+
+모은 값은 localhost HTTP로 볼 수 있습니다.
+
+    GET /metrics   Prometheus 텍스트 형식
+    GET /          사람이 읽는 표 (format())
+"""
+
+import threading
+import time
+
+# 한 구간을 나누는 칸 수의 비트 수. 7이면 구간마다 64칸이라 상대 오차는 1/64입니다.
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+METRICS_HOST = "127.0.0.1"
+
+METRIC_LATENESS = "pomodoro_callback_lateness_seconds"
+METRIC_DURATION = "pomodoro_callback_duration_seconds"
+
+
+def _bucket_index(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (
+        SUB_BUCKET_COUNT
+        + (shift - 1) * SUB_BUCKET_HALF
+        + (value >> shift)
+        - SUB_BUCKET_HALF
+    )
+
+
+def _bucket_upper_bound(index):
+    """칸 index에 들어가는 가장 큰 값 (마이크로초)"""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift, sub = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+    shift += 1
+    return ((sub + SUB_BUCKET_HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """초 단위 값을 마이크로초 로그-선형 칸에 세는 히스토그램입니다."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds < 0:
+            seconds = 0.0
+        index = _bucket_index(int(seconds * 1_000_000))
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """값의 fraction(0~1)이 이 값 이하입니다. (초, 칸의 위쪽 끝)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self):
+        """ms 단위 요약을 dict로 반환합니다."""
+        summary = {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+        for quantile in SUMMARY_QUANTILES:
+            summary[f"p{quantile * 100:g}_ms"] = self.percentile(quantile) * 1000
+        return summary
+
+
+class CallbackMetrics:
+    """콜백 이름별로 늦은 시간과 실행 시간 히스토그램을 둡니다.
+
+    record()는 메인 스레드에서, 읽기는 HTTP 스레드에서 하므로 잠금을 씁니다.
+    """
+
+    def __init__(self, wall_clock=time.time):
+        self.wall_clock = wall_clock
+        self.started_at = wall_clock()
+        self._lateness = {}
+        self._duration = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, lateness, duration):
+        with self._lock:
+            lateness_histogram = self._lateness.get(name)
+            if lateness_histogram is None:
+                lateness_histogram = self._lateness[name] = LatencyHistogram()
+                self._duration[name] = LatencyHistogram()
+            lateness_histogram.record(lateness)
+            self._duration[name].record(duration)
+
+    def reset(self):
+        with self._lock:
+            self._lateness.clear()
+            self._duration.clear()
+            self.started_at = self.wall_clock()
+
+    def snapshot(self):
+        """{이름: {"lateness": 요약, "duration": 요약}}을 반환합니다. (ms 단위)"""
+        with self._lock:
+            return {
+                name: {
+                    "lateness": histogram.summary(),
+                    "duration": self._duration[name].summary(),
+                }
+                for name, histogram in sorted(self._lateness.items())
+            }
+
+    def format(self):
+        """사람이 읽는 표. 늦은 시간과 실행 시간을 ms로 보여 줍니다."""
+        header = (
+            ("콜백", -20),
+            ("횟수", 8),
+            ("늦음 p50", 10),
+            ("p99", 9),
+            ("최대", 9),
+            ("실행 p50", 10),
+            ("p99", 9),
+            ("최대", 9),
+        )
+        lines = ["".join(_pad(text, width) for text, width in header)]
+        for name, summary in self.snapshot().items():
+            lateness = summary["lateness"]
+            duration = summary["duration"]
+            lines.append(
+                f"{name:<20}{lateness['count']:>8}"
+                f"{lateness['p50_ms']:>10.2f}{lateness['p99_ms']:>9.2f}"
+                f"{lateness['max_ms']:>9.2f}"
+                f"{duration['p50_ms']:>10.2f}{duration['p99_ms']:>9.2f}"
+                f"{duration['max_ms']:>9.2f}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 형식(summary)으로 내보냅니다."""
+        lines = []
+        with self._lock:
+            for metric, histograms, help_text in (
+                (METRIC_LATENESS, self._lateness, "예약 시각보다 늦게 시작한 시간"),
+                (METRIC_DURATION, self._duration, "콜백 실행 시간"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} summary")
+                for name, histogram in sorted(histograms.items()):
+                    label = _label_value(name)
+                    for quantile in SUMMARY_QUANTILES:
+                        lines.append(
+                            f'{metric}{{callback="{label}",quantile="{quantile:g}"}}'
+                            f" {histogram.percentile(quantile):.6f}"
+                        )
+                    lines.append(
+                        f'{metric}_sum{{callback="{label}"}} {histogram.total:.6f}'
+                    )
+                    lines.append(
+                        f'{metric}_count{{callback="{label}"}} {histogram.count}'
+                    )
+                lines.append(f"# TYPE {metric}_max gauge")
+                for name, histogram in sorted(histograms.items()):
+                    lines.append(
+                        f'{metric}_max{{callback="{_label_value(name)}"}}'
+                        f" {histogram.max:.6f}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _pad(text, width):
+    """한글은 터미널에서 두 칸을 차지하므로 그만큼 덜 채웁니다. 음수 폭은 왼쪽 정렬."""
+    wide = sum(1 for char in text if ord(char) >= 0x1100)
+    padding = " " * max(0, abs(width) - len(text) - wide)
+    return text + padding if width < 0 else padding + text
+
+
+def _label_value(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """localhost에서 /metrics(Prometheus)와 /(표)를 내보내는 작은 HTTP 서버입니다."""
+
+    def __init__(self, metrics, port, host=METRICS_HOST):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """HTTP 스레드를 띄웁니다. 포트를 열지 못하면 OSError가 납니다."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    body = metrics.prometheus_text()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/":
+                    body = metrics.format()
+                    content_type = "text/plain; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # 스크랩할 때마다 stderr에 찍지 않습니다.
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # port=0이면 OS가 고른 포트
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pomodoro-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._thread = None
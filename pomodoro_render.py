@@ -0,0 +1,63 @@
+"""위젯에 마지막으로 그린 값을 기억해 두고 바뀐 것만 Tk에 넘깁니다. (Tk 없이 동작)
+
+label.config(text=...)는 글자가 같아도 매번 Tcl을 한 번 왕복하고 위젯을 다시
+그리게 합니다. 매초 불리는 표시 갱신이 WidgetRenderer를 거치면 바뀐 옵션만
+config 하고, 같은 값이면 아무것도 부르지 않습니다. 건너뛴 호출 수는 counters()로
+볼 수 있습니다.
+
+캐시가 실제 위젯과 어긋나지 않도록, 한 번 WidgetRenderer로 그리기 시작한 옵션과
+바인딩은 항상 WidgetRenderer로만 바꿔야 합니다.
+"""
+
+_MISSING = object()
+
+
+class WidgetRenderer:
+    """위젯별 옵션 값과 이벤트 바인딩을 기억하는 작은 화면 모델입니다."""
+
+    def __init__(self):
+        self._options = {}  # 위젯 -> {옵션: 마지막으로 설정한 값}
+        self._bindings = {}  # (위젯, 이벤트) -> 마지막으로 바인딩한 함수
+        self.applied = 0
+        self.skipped = 0
+
+    def configure(self, widget, **options):
+        """바뀐 옵션만 config 합니다. Tk를 불렀으면 True를 반환합니다."""
+        rendered = self._options.setdefault(widget, {})
+        changed = {
+            name: value
+            for name, value in options.items()
+            if rendered.get(name, _MISSING) != value
+        }
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.config(**changed)
+        rendered.update(changed)
+        self.applied += 1
+        return True
+
+    def bind(self, widget, sequence, callback):
+        """callback이 바뀌었을 때만 bind 합니다. None이면 unbind 합니다."""
+        key = (widget, sequence)
+        if self._bindings.get(key) == callback:
+            self.skipped += 1
+            return False
+        if callback is None:
+            widget.unbind(sequence)
+            self._bindings.pop(key, None)
+        else:
+            widget.bind(sequence, callback)
+            self._bindings[key] = callback
+        self.applied += 1
+        return True
+
+    def forget(self, widget):
+        """위젯을 없앴거나 직접 바꿨을 때 기억해 둔 값을 버립니다."""
+        self._options.pop(widget, None)
+        for key in [key for key in self._bindings if key[0] is widget]:
+            del self._bindings[key]
+
+    def counters(self):
+        """{"applied": Tk를 부른 횟수, "skipped": 같은 값이라 건너뛴 횟수}"""
+        return {"applied": self.applied, "skipped": self.skipped}
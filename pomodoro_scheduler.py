@@ -0,0 +1,386 @@
+"""타이머, 오버레이, 식사 알림이 함께 쓰는 예약 실행기입니다. (Tk 없이 동작)
+
+모든 예약은 하나의 힙에 마감 시각 순서로 들어가고, 바깥쪽(Tk after, sleep 등)은
+next_deadline()에 한 번만 깨어나서 run_due()를 부르면 됩니다.
+
+예약이 아주 많은 서버에서는 같은 방식으로 쓰는 TimingWheelScheduler(계층형
+타이밍 휠)를 대신 쓸 수 있습니다. create_scheduler()로 고릅니다.
+"""
+
+import heapq
+import itertools
+import math
+import operator
+import time
+
+SCHEDULER_HEAP = "heap"
+SCHEDULER_WHEEL = "wheel"
+
+# 타이밍 휠 기본값: 10ms 눈금, 한 단에 64칸, 4단 (64**4 눈금 = 약 46시간)
+WHEEL_TICK_SECONDS = 0.01
+WHEEL_SLOT_BITS = 6
+WHEEL_LEVELS = 4
+# 부동소수점 오차로 마감 눈금을 하나 놓치지 않도록 (눈금 단위)
+WHEEL_TICK_EPSILON = 1e-6
+
+
+class ScheduledCall:
+    """call_at()이 돌려주는 예약 핸들입니다."""
+
+    __slots__ = ("when", "callback", "args", "name", "cancelled")
+
+    def __init__(self, when, callback, args, name):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.name = name
+        self.cancelled = False
+
+
+def _run_measured(clock, call, metrics):
+    """예약 하나를 실행하고 늦은 시간과 실행 시간을 metrics에 기록합니다."""
+    started = clock()
+    try:
+        call.callback(*call.args)
+    finally:
+        metrics.record(call.name, started - call.when, clock() - started)
+
+
+def _run_call(clock, call, metrics):
+    if metrics is None:
+        call.callback(*call.args)
+    else:
+        _run_measured(clock, call, metrics)
+
+
+class Scheduler:
+    """마감 시각 힙 하나로 모든 예약을 관리합니다.
+
+    on_reschedule은 가장 이른 마감 시각이 바뀌었을 때 불리는 함수로,
+    바깥 이벤트 루프가 깨어날 시각을 다시 맞추는 데 씁니다.
+    metrics에 pomodoro_metrics.CallbackMetrics를 넣으면 콜백마다 늦은 시간과
+    실행 시간을 기록합니다. profiler에 pomodoro_tk_profiler.CallbackProfiler를
+    넣으면 한 번에 깨어나 실행하는 예약을 하나씩 따로 잽니다.
+    """
+
+    def __init__(self, clock=time.monotonic, on_reschedule=None):
+        self.clock = clock
+        self.on_reschedule = on_reschedule
+        self.metrics = None
+        self.profiler = None
+        self.wakeups = 0
+        self.calls_run = 0
+        self._heap = []
+        self._counter = itertools.count()
+        self._running = False
+
+    def __len__(self):
+        return sum(1 for _, _, call in self._heap if not call.cancelled)
+
+    def call_at(self, when, callback, *args, name=None):
+        if name is None:
+            name = getattr(callback, "__name__", "callback")
+        call = ScheduledCall(when, callback, args, name)
+        previous_deadline = self.next_deadline()
+        heapq.heappush(self._heap, (when, next(self._counter), call))
+        if previous_deadline is None or when < previous_deadline:
+            self._notify()
+        return call
+
+    def call_later(self, delay, callback, *args, name=None):
+        return self.call_at(self.clock() + delay, callback, *args, name=name)
+
+    def cancel(self, call):
+        if call is None or call.cancelled:
+            return
+        call.cancelled = True
+        # 맨 앞 예약을 취소했을 때만 깨어날 시각이 바뀝니다.
+        if self._heap and self._heap[0][2] is call:
+            self._drop_cancelled()
+            self._notify()
+
+    def next_deadline(self):
+        self._drop_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self):
+        """마감 시각이 지난 예약을 모두 실행하고 실행한 개수를 반환합니다."""
+        now = self.clock()
+        self.wakeups += 1
+        # 실행 중에 새로 들어온 예약은 다음 번에 실행합니다. (무한 반복 방지)
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap)[2])
+        ran = 0
+        metrics = self.metrics
+        profiler = self.profiler
+        self._running = True
+        try:
+            for call in due:
+                if call.cancelled:
+                    continue
+                call.cancelled = True  # 한 번만 실행되도록
+                if profiler is not None:
+                    profiler.run_scheduled(call, _run_call, self.clock, call, metrics)
+                elif metrics is None:
+                    call.callback(*call.args)
+                else:
+                    _run_measured(self.clock, call, metrics)
+                ran += 1
+        finally:
+            self._running = False
+        self.calls_run += ran
+        return ran
+
+    def _drop_cancelled(self):
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+
+    def _notify(self):
+        # run_due() 중에는 끝난 뒤 한 번에 다시 맞추므로 알리지 않습니다.
+        if self.on_reschedule and not self._running:
+            self.on_reschedule()
+
+
+class WheelCall(ScheduledCall):
+    """TimingWheelScheduler의 예약 핸들. 들어 있는 칸을 기억해 바로 뺄 수 있습니다."""
+
+    __slots__ = ("tick", "bucket", "level")
+
+    def __init__(self, when, callback, args, name, tick):
+        # 예약마다 불리므로 super().__init__()을 거치지 않고 바로 채웁니다.
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.name = name
+        self.cancelled = False
+        self.tick = tick
+        self.bucket = None
+        self.level = None  # 휠의 단, 바로 실행할 예약이나 범위 밖 예약은 None
+
+
+class TimingWheelScheduler:
+    """계층형 타이밍 휠로 예약을 관리합니다. Scheduler와 같은 방식으로 씁니다.
+
+    시각을 tick_seconds 눈금으로 나누고, 단마다 2**slot_bits 칸을 둡니다. 예약은
+    마감 눈금이 지금 눈금과 처음 달라지는 자리의 단에 들어가므로 넣기와 취소가
+    예약 수와 관계없이 O(1)이고, 같은 눈금의 예약은 한 번에 실행합니다. 위쪽 단의
+    칸에 다다르면 그 칸의 예약을 아래 단으로 내려 보냅니다.
+
+    단마다 빈 칸 여부를 비트로 들고 있어서 next_deadline()도 칸을 하나씩 보지
+    않고 바로 찾습니다. 다만 위쪽 단의 예약은 칸 시작 시각(아래 단으로 내릴 때)을
+    돌려주므로, 예약 하나에 많아야 levels번 더 깨어납니다. 실행은 마감 시각보다
+    최대 눈금 하나만큼 늦을 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        clock=time.monotonic,
+        on_reschedule=None,
+        tick_seconds=WHEEL_TICK_SECONDS,
+        slot_bits=WHEEL_SLOT_BITS,
+        levels=WHEEL_LEVELS,
+    ):
+        self.clock = clock
+        self.on_reschedule = on_reschedule
+        self.metrics = None
+        self.profiler = None
+        self.tick_seconds = tick_seconds
+        self.slot_bits = slot_bits
+        self.levels = levels
+        self.wakeups = 0
+        self.calls_run = 0
+        self._slot_mask = (1 << slot_bits) - 1
+        self._wheels = [
+            [{} for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self._occupied = [0] * levels  # 단마다 예약이 있는 칸의 비트
+        self._ready = {}  # 마감 눈금이 이미 지난 예약
+        self._overflow = {}  # 휠 한 바퀴보다 먼 예약
+        self._count = 0
+        self._current = self._tick_floor(clock())  # 여기까지의 눈금은 처리함
+        self._running = False
+
+    def __len__(self):
+        return self._count
+
+    def _tick_floor(self, when):
+        return math.floor(when / self.tick_seconds + WHEEL_TICK_EPSILON)
+
+    def call_at(self, when, callback, *args, name=None):
+        if name is None:
+            name = getattr(callback, "__name__", "callback")
+        tick = math.ceil(when / self.tick_seconds - WHEEL_TICK_EPSILON)
+        call = WheelCall(when, callback, args, name, tick)
+        notify = self.on_reschedule is not None and not self._running
+        if notify:
+            previous = self._next_event_tick()
+        self._place(call)
+        self._count += 1
+        if notify and (previous is None or min(tick, self._current) < previous):
+            self._notify()
+        return call
+
+    def call_later(self, delay, callback, *args, name=None):
+        return self.call_at(self.clock() + delay, callback, *args, name=name)
+
+    def cancel(self, call):
+        if call is None or call.cancelled:
+            return
+        call.cancelled = True
+        self._count -= 1
+        bucket = call.bucket
+        if bucket is None:
+            return
+        # 마지막 예약이 빠져 칸이 비면 깨어날 시각이 바뀔 수 있습니다.
+        notify = (
+            len(bucket) == 1 and self.on_reschedule is not None and not self._running
+        )
+        if notify:
+            previous = self._next_event_tick()
+        del bucket[call]
+        call.bucket = None
+        level = call.level
+        if level is not None and not bucket:
+            index = (call.tick >> (self.slot_bits * level)) & self._slot_mask
+            self._occupied[level] &= ~(1 << index)
+        if notify and self._next_event_tick() != previous:
+            self._notify()
+
+    def next_deadline(self):
+        tick = self._next_event_tick()
+        return None if tick is None else tick * self.tick_seconds
+
+    def run_due(self):
+        """마감 눈금이 지난 예약을 모두 실행하고 실행한 개수를 반환합니다."""
+        target = self._tick_floor(self.clock())
+        self.wakeups += 1
+        due = []
+        self._take_ready(due)
+        while True:
+            tick = self._next_event_tick()
+            if tick is None or tick > target:
+                break
+            self._advance_to(tick, due)
+        if target > self._current:
+            self._current = target
+        # 같은 눈금에 모인 예약도 마감 시각, 넣은 순서대로 실행합니다.
+        if len(due) > 1:
+            due.sort(key=operator.attrgetter("when"))
+        ran = 0
+        metrics = self.metrics
+        profiler = self.profiler
+        self._running = True
+        try:
+            for call in due:
+                if call.cancelled:
+                    continue
+                call.cancelled = True  # 한 번만 실행되도록
+                self._count -= 1
+                if profiler is not None:
+                    profiler.run_scheduled(call, _run_call, self.clock, call, metrics)
+                elif metrics is None:
+                    call.callback(*call.args)
+                else:
+                    _run_measured(self.clock, call, metrics)
+                ran += 1
+        finally:
+            self._running = False
+        self.calls_run += ran
+        return ran
+
+    def _place(self, call):
+        tick = call.tick
+        current = self._current
+        if tick <= current:
+            bucket = self._ready
+            level = None
+        else:
+            slot_bits = self.slot_bits
+            level = ((tick ^ current).bit_length() - 1) // slot_bits
+            if level >= self.levels:
+                bucket = self._overflow
+                level = None
+            else:
+                index = (tick >> (slot_bits * level)) & self._slot_mask
+                bucket = self._wheels[level][index]
+                self._occupied[level] |= 1 << index
+        bucket[call] = None
+        call.bucket = bucket
+        call.level = level
+
+    def _next_event_tick(self):
+        """다음에 처리할 눈금 (예약 실행이나 아래 단으로 내리기), 없으면 None"""
+        current = self._current
+        if self._ready:
+            return current
+        slot_bits = self.slot_bits
+        for level, occupied in enumerate(self._occupied):
+            if not occupied:
+                continue
+            shift = slot_bits * level
+            digit = (current >> shift) & self._slot_mask
+            ahead = occupied >> (digit + 1)
+            if ahead:
+                index = digit + (ahead & -ahead).bit_length()
+                base = (current >> (shift + slot_bits)) << (shift + slot_bits)
+                return base + (index << shift)
+        if self._overflow:
+            span_bits = slot_bits * self.levels
+            return ((current >> span_bits) + 1) << span_bits
+        return None
+
+    def _advance_to(self, tick, due):
+        """눈금 tick으로 옮기면서 시작되는 칸을 아래 단으로 내리고 실행할 예약을 모읍니다."""
+        self._current = tick
+        slot_bits = self.slot_bits
+        if self._overflow and not tick & ((1 << (slot_bits * self.levels)) - 1):
+            overflow = list(self._overflow)
+            self._overflow.clear()
+            for call in overflow:
+                self._place(call)
+        # 칸 경계가 겹치는 단까지만, 위쪽 단부터 내려 보냅니다.
+        top = 1
+        while top < self.levels and not tick & ((1 << (slot_bits * top)) - 1):
+            top += 1
+        for level in range(top - 1, -1, -1):
+            shift = slot_bits * level
+            index = (tick >> shift) & self._slot_mask
+            bit = 1 << index
+            if not self._occupied[level] & bit:
+                continue
+            self._occupied[level] &= ~bit
+            bucket = self._wheels[level][index]
+            calls = list(bucket)
+            bucket.clear()
+            for call in calls:
+                self._place(call)
+        self._take_ready(due)
+
+    def _take_ready(self, due):
+        for call in self._ready:
+            call.bucket = None  # 실행 전에 취소돼도 칸에서 뺄 필요 없음
+            due.append(call)
+        self._ready.clear()
+
+    def _notify(self):
+        # run_due() 중에는 끝난 뒤 한 번에 다시 맞추므로 알리지 않습니다.
+        if self.on_reschedule and not self._running:
+            self.on_reschedule()
+
+
+SCHEDULER_BACKENDS = {
+    SCHEDULER_HEAP: Scheduler,
+    SCHEDULER_WHEEL: TimingWheelScheduler,
+}
+
+
+def create_scheduler(backend=SCHEDULER_HEAP, **kwargs):
+    """이름으로 예약 실행기를 만듭니다. kwargs는 각 클래스의 생성자로 넘깁니다."""
+    try:
+        scheduler_class = SCHEDULER_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"알 수 없는 예약 방식입니다: {backend}") from None
+    return scheduler_class(**kwargs)
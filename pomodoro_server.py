@@ -0,0 +1,468 @@
+"""여러 사용자의 뽀모도로 타이머를 한 프로세스에서 돌리는 서버입니다. (Tk 없이 동작)
+
+사용자마다 PomodoroEngine 하나만 두고, 모든 사용자의 다음 전환 시각은 Scheduler
+하나(마감 시각 힙)에 넣습니다. asyncio 이벤트 루프에는 그중 가장 이른 시각에
+깨어나는 타이머 하나만 걸어 두므로, 사용자가 만 명이어도 깨어나는 횟수는 실제
+전환 횟수만큼입니다.
+
+클라이언트는 유닉스 소켓(또는 127.0.0.1 TCP)으로 JSON을 한 줄씩 보냅니다.
+
+    {"user": "alice", "command": "configure", "settings": {"work_minutes": "50"}}
+    {"user": "alice", "command": "start"}          (stop, skip, query, remove도 같음)
+    {"user": "alice", "command": "answer_long_rest", "accept": false}
+    {"user": "alice", "command": "subscribe"}      -> {"user", "event", "state", "due"}
+
+구독하면 mode_changed, long_rest_suggested, rest_finished, settings_invalid,
+stopped 이벤트를 받습니다.
+
+settings는 refresh_pomodoro_settings.json과 같은 키를 씁니다. due는 전환이
+예정되어 있던 시각(time.time() 기준)이라 받는 쪽에서 알림 지연을 잴 수 있습니다.
+세션 기록은 남기지 않습니다.
+
+    python pomodoro_server.py --port 8765
+    python pomodoro_server.py --scheduler wheel     # 예약을 타이밍 휠로 관리
+"""
+
+import argparse
+import collections
+import datetime
+import functools
+import os
+import sys
+import time
+
+from pomodoro_control import engine_state, send_to_subscriber
+from pomodoro_engine import (
+    DEFAULT_TIMER_SETTINGS,
+    LongRestSuggested,
+    MealSchedule,
+    ModeChanged,
+    PomodoroEngine,
+    RestFinished,
+    SettingsInvalid,
+    Stopped,
+    meal_times_from_dict,
+    parse_timer_settings_dict,
+)
+from pomodoro_instance import decode_message, encode_message
+from pomodoro_scheduler import (
+    SCHEDULER_BACKENDS,
+    SCHEDULER_HEAP,
+    Scheduler,
+    create_scheduler,
+)
+
+SERVER_SOCKET_FILENAME = "refresh_pomodoro_server.sock"
+
+COMMAND_CONFIGURE = "configure"
+COMMAND_START = "start"
+COMMAND_STOP = "stop"
+COMMAND_SKIP = "skip"
+COMMAND_ANSWER_LONG_REST = "answer_long_rest"
+COMMAND_QUERY = "query"
+COMMAND_SUBSCRIBE = "subscribe"
+COMMAND_UNSUBSCRIBE = "unsubscribe"
+COMMAND_REMOVE = "remove"
+# 처음 보는 사용자여도 새로 만드는 명령
+CREATING_COMMANDS = (COMMAND_CONFIGURE, COMMAND_START, COMMAND_SUBSCRIBE)
+
+MAX_LINE_BYTES = 64 * 1024
+LISTEN_BACKLOG = 1024
+# 전환이 예정보다 늦은 시간을 최근 이만큼만 모아 둡니다.
+LATENESS_SAMPLES = 100000
+
+# 구독자에게 보내는 엔진 이벤트. 화면에 보이는 상태가 바뀌는 것만 보내고,
+# SessionCompleted/StatsChanged는 다음 mode_changed의 state에 담겨 갑니다.
+PUSHED_EVENTS = {
+    ModeChanged: "mode_changed",
+    LongRestSuggested: "long_rest_suggested",
+    RestFinished: "rest_finished",
+    SettingsInvalid: "settings_invalid",
+    Stopped: "stopped",
+}
+
+
+class AsyncioScheduler:
+    """Scheduler의 가장 이른 마감 시각에 맞춰 asyncio 타이머를 딱 하나만 걸어 둡니다.
+
+    refresh_pomodoro.TkScheduler와 같은 일을 Tk after 대신 loop.call_later로 합니다.
+    """
+
+    def __init__(self, loop, scheduler):
+        self.loop = loop
+        self.scheduler = scheduler
+        self._handle = None
+        self._armed_for = None
+        scheduler.on_reschedule = self.rearm
+
+    def rearm(self):
+        deadline = self.scheduler.next_deadline()
+        if deadline == self._armed_for and (deadline is None or self._handle):
+            return
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        self._armed_for = deadline
+        if deadline is None:
+            return
+        delay = max(0.0, deadline - self.scheduler.clock())
+        self._handle = self.loop.call_later(delay, self._on_timer)
+
+    def cancel(self):
+        if self._handle:
+            self._handle.cancel()
+        self._handle = None
+        self._armed_for = None
+
+    def _on_timer(self):
+        self._handle = None
+        self._armed_for = None
+        self.scheduler.run_due()
+        self.rearm()
+
+
+class Tenant:
+    """사용자 한 명의 상태. 엔진 말고는 예약 핸들과 구독자만 둡니다."""
+
+    __slots__ = (
+        "user",
+        "engine",
+        "meal_schedule",
+        "engine_call",
+        "meal_check_call",
+        "subscribers",
+    )
+
+    def __init__(self, user, engine):
+        self.user = user
+        self.engine = engine
+        self.meal_schedule = None  # 식사 알림을 켠 사용자만
+        self.engine_call = None
+        self.meal_check_call = None
+        self.subscribers = None  # 구독자가 생길 때 set을 만듭니다.
+
+
+class TimerServer:
+    """여러 Tenant의 엔진을 Scheduler 하나로 돌리고 구독자에게 이벤트를 보냅니다."""
+
+    def __init__(self, scheduler=None, wall_clock=time.time):
+        self.scheduler = Scheduler() if scheduler is None else scheduler
+        self.wall_clock = wall_clock
+        self.tenants = {}
+        self.lateness = collections.deque(maxlen=LATENESS_SAMPLES)
+        self.transitions = 0
+        self.notifications_sent = 0
+        self.subscribers_dropped = 0
+        self._due = None  # 지금 처리 중인 전환의 예정 시각 (time.time() 기준)
+        self._rollover_call = None
+        self.schedule_rollover()
+
+    # --- 사용자 ---
+
+    def add_tenant(self, user, settings=DEFAULT_TIMER_SETTINGS):
+        tenant = self.tenants.get(user)
+        if tenant is not None:
+            return tenant
+        engine = PomodoroEngine(settings, clock=self.scheduler.clock)
+        tenant = Tenant(user, engine)
+        engine.subscribe(functools.partial(self.on_engine_event, tenant))
+        self.tenants[user] = tenant
+        return tenant
+
+    def remove_tenant(self, user):
+        tenant = self.tenants.pop(user, None)
+        if tenant is None:
+            return False
+        self.scheduler.cancel(tenant.engine_call)
+        self.scheduler.cancel(tenant.meal_check_call)
+        tenant.engine_call = tenant.meal_check_call = None
+        tenant.subscribers = None
+        return True
+
+    def configure(self, tenant, settings):
+        """설정 파일과 같은 키의 dict로 설정을 바꾸고 잘못된 필드 이름을 반환합니다."""
+        timer_settings, invalid_fields = parse_timer_settings_dict(
+            settings, previous=tenant.engine.settings
+        )
+        tenant.engine.update_settings(timer_settings)
+        meal_times = meal_times_from_dict(settings, default_enabled=False)
+        self.scheduler.cancel(tenant.meal_check_call)
+        tenant.meal_check_call = None
+        if meal_times:
+            if tenant.meal_schedule is None:
+                tenant.meal_schedule = MealSchedule()
+            tenant.meal_schedule.set_times(meal_times)
+            self.schedule_meal_check(tenant)
+        else:
+            tenant.meal_schedule = None
+        return invalid_fields
+
+    # --- 예약 ---
+
+    def schedule_tenant(self, tenant):
+        """다음 전환 시각(세션 끝 또는 긴 휴식 기본 선택)에 한 번만 깨어납니다."""
+        self.scheduler.cancel(tenant.engine_call)
+        tenant.engine_call = None
+        engine = tenant.engine
+        if engine.awaiting_long_rest_answer:
+            wakeup = engine.decision_deadline
+        elif engine.is_counting_down():
+            wakeup = engine.deadline
+        else:
+            wakeup = None
+        if wakeup is not None:
+            tenant.engine_call = self.scheduler.call_at(
+                wakeup, self.on_tenant_deadline, tenant, wakeup, name="tenant"
+            )
+
+    def on_tenant_deadline(self, tenant, when):
+        tenant.engine_call = None
+        now = self.scheduler.clock()
+        self.lateness.append(now - when)
+        self.transitions += 1
+        self._due = self.wall_clock() - (now - when)
+        try:
+            tenant.engine.poll()
+        finally:
+            self._due = None
+        if tenant.engine_call is None:  # 전환 이벤트에서 이미 다시 예약했으면 그대로
+            self.schedule_tenant(tenant)
+
+    def schedule_meal_check(self, tenant):
+        self.scheduler.cancel(tenant.meal_check_call)
+        tenant.meal_check_call = self.scheduler.call_later(
+            tenant.meal_schedule.seconds_until_next_check(),
+            self.check_meal_time,
+            tenant,
+            name="meal",
+        )
+
+    def check_meal_time(self, tenant):
+        tenant.meal_check_call = None
+        if tenant.meal_schedule is None:
+            return
+        _, due_meals = tenant.meal_schedule.check()  # 날짜 넘김은 서버가 한 번에
+        for meal_name in due_meals:
+            self.notify(tenant, "meal", {"meal": meal_name})
+        self.schedule_meal_check(tenant)
+
+    def schedule_rollover(self):
+        """다음 자정에 모든 사용자의 오늘 통계를 한 번에 초기화합니다."""
+        now = datetime.datetime.now()
+        midnight = datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1), datetime.time.min
+        )
+        self._rollover_call = self.scheduler.call_later(
+            (midnight - now).total_seconds(), self.on_rollover, name="rollover"
+        )
+
+    def on_rollover(self):
+        for tenant in self.tenants.values():
+            tenant.engine.reset_daily_stats()
+        self.schedule_rollover()
+
+    # --- 이벤트 ---
+
+    def on_engine_event(self, tenant, event):
+        name = PUSHED_EVENTS.get(type(event))
+        if name is None:
+            return
+        if isinstance(event, Stopped):
+            self.scheduler.cancel(tenant.engine_call)
+            tenant.engine_call = None
+        elif not isinstance(event, SettingsInvalid):
+            self.schedule_tenant(tenant)
+        self.notify(tenant, name)
+
+    def notify(self, tenant, event, extra=None):
+        subscribers = tenant.subscribers
+        if not subscribers:
+            return
+        message = {
+            "user": tenant.user,
+            "event": event,
+            "state": engine_state(tenant.engine, self.wall_clock),
+            "due": self._due,
+        }
+        if extra:
+            message.update(extra)
+        line = encode_message(message)
+        for writer in tuple(subscribers):
+            if send_to_subscriber(writer, line):
+                self.notifications_sent += 1
+            else:
+                subscribers.discard(writer)
+                self.subscribers_dropped += 1
+
+    # --- 명령 ---
+
+    def handle(self, message, writer=None, subscriptions=None):
+        """요청 한 줄(dict)을 처리하고 답(dict)을 반환합니다."""
+        user = message.get("user")
+        command = message.get("command")
+        if not isinstance(user, str) or not user:
+            return {"ok": False, "error": "user를 적어 주세요."}
+        tenant = self.tenants.get(user)
+        if tenant is None:
+            if command not in CREATING_COMMANDS:
+                return {"ok": False, "error": f"모르는 사용자예요: {user}"}
+            tenant = self.add_tenant(user)
+        engine = tenant.engine
+        reply = {"ok": True}
+        if command == COMMAND_CONFIGURE:
+            settings = message.get("settings")
+            if not isinstance(settings, dict):
+                return {"ok": False, "error": "settings는 JSON 객체여야 해요."}
+            reply["invalid_fields"] = list(self.configure(tenant, settings))
+        elif command == COMMAND_START:
+            if not engine.is_running:
+                engine.start()
+            elif engine.rest_finished:
+                engine.end_rest()
+        elif command == COMMAND_STOP:
+            engine.stop()
+        elif command == COMMAND_SKIP:
+            if not engine.can_end_rest():
+                return {"ok": False, "error": "지금은 휴식을 넘길 수 없어요."}
+            engine.end_rest()
+        elif command == COMMAND_ANSWER_LONG_REST:
+            if not engine.awaiting_long_rest_answer:
+                return {"ok": False, "error": "긴 휴식 제안을 기다리는 중이 아니에요."}
+            engine.answer_long_rest(bool(message.get("accept", True)))
+        elif command == COMMAND_SUBSCRIBE:
+            if writer is not None:
+                if tenant.subscribers is None:
+                    tenant.subscribers = set()
+                tenant.subscribers.add(writer)
+                if subscriptions is not None:
+                    subscriptions.add(user)
+        elif command == COMMAND_UNSUBSCRIBE:
+            if tenant.subscribers:
+                tenant.subscribers.discard(writer)
+            if subscriptions is not None:
+                subscriptions.discard(user)
+        elif command == COMMAND_REMOVE:
+            self.remove_tenant(user)
+            return {"ok": True}
+        elif command != COMMAND_QUERY:
+            return {"ok": False, "error": f"알 수 없는 명령이에요: {command}"}
+        reply["state"] = engine_state(engine, self.wall_clock)
+        return reply
+
+    async def handle_client(self, reader, writer):
+        subscriptions = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # 한 줄이 MAX_LINE_BYTES보다 김
+                    break
+                if not line:
+                    break
+                try:
+                    message = decode_message(line)
+                except ValueError:
+                    reply = {"ok": False, "error": "JSON 객체를 한 줄에 하나씩 보내 주세요."}
+                else:
+                    reply = self.handle(message, writer, subscriptions)
+                    if "id" in message:
+                        reply["id"] = message["id"]
+                writer.write(encode_message(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for user in subscriptions:
+                tenant = self.tenants.get(user)
+                if tenant is not None and tenant.subscribers:
+                    tenant.subscribers.discard(writer)
+            writer.close()
+
+    async def start_serving(self, path=None, host="127.0.0.1", port=None):
+        """이벤트 루프에 스케줄러를 붙이고 소켓을 엽니다. asyncio 서버를 반환합니다."""
+        import asyncio
+
+        AsyncioScheduler(asyncio.get_running_loop(), self.scheduler).rearm()
+        if port is not None:
+            return await asyncio.start_server(
+                self.handle_client,
+                host=host,
+                port=port,
+                limit=MAX_LINE_BYTES,
+                backlog=LISTEN_BACKLOG,
+            )
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        server = await asyncio.start_unix_server(
+            self.handle_client, path=path, limit=MAX_LINE_BYTES, backlog=LISTEN_BACKLOG
+        )
+        os.chmod(path, 0o600)
+        return server
+
+
+async def serve_forever(
+    path=None, port=None, scheduler_backend=SCHEDULER_HEAP, metrics_port=None
+):
+    timer_server = TimerServer(create_scheduler(scheduler_backend))
+    metrics_server = None
+    if metrics_port:
+        from pomodoro_metrics import CallbackMetrics, MetricsServer
+
+        metrics = CallbackMetrics()
+        metrics_server = MetricsServer(metrics, metrics_port)
+        metrics_server.start()
+        timer_server.scheduler.metrics = metrics
+    server = await timer_server.start_serving(path=path, port=port)
+    where = f"127.0.0.1:{port}" if port is not None else path
+    print(f"뽀모도로 서버를 열었어요: {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", help="유닉스 소켓 경로 (기본: 설정 폴더)")
+    parser.add_argument("--port", type=int, help="유닉스 소켓 대신 127.0.0.1 TCP")
+    parser.add_argument(
+        "--scheduler",
+        choices=sorted(SCHEDULER_BACKENDS),
+        default=SCHEDULER_HEAP,
+        help="예약 방식 (wheel: 타이밍 휠)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="전환 콜백의 지연을 재고 localhost의 이 포트로 내보냅니다. (/metrics)",
+    )
+    args = parser.parse_args(argv)
+
+    path = args.socket
+    if path is None and args.port is None:
+        from pomodoro_storage import get_settings_path
+
+        path = os.path.join(
+            os.path.dirname(get_settings_path()), SERVER_SOCKET_FILENAME
+        )
+    import asyncio
+
+    try:
+        asyncio.run(
+            serve_forever(
+                path=path,
+                port=args.port,
+                scheduler_backend=args.scheduler,
+                metrics_port=args.metrics_port,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""끝난 세션을 고정 길이 이진 레코드로 덧붙이는 가벼운 기록 파일입니다. (Tk 없이 동작)
+
+레코드 하나는 24바이트(시작 시각 int64, 걸린 시간/계획/집중 시간 int32,
+모드/중단 이유 uint8)이고, 파일 앞의 8바이트 머리말 뒤에 시간 순으로
+이어 붙입니다. 읽을 때는 파일을 mmap으로 열고 시작 시각으로 이진 탐색해서,
+"최근 30일" 같은 범위 조회가 필요한 페이지만 건드리고 데이터를 복사하지 않습니다.
+"""
+
+import datetime
+import mmap
+import os
+import struct
+import time
+
+from pomodoro_engine import (
+    END_ABANDONED,
+    END_CLOSED,
+    END_SKIPPED,
+    END_STOPPED,
+    MODE_LONG_REST,
+    MODE_REST,
+    MODE_WORK,
+)
+from pomodoro_history import SessionRecord, day_key
+
+SESSION_LOG_FILENAME = "refresh_pomodoro_sessions.bin"
+
+MAGIC = b"RPSL"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")  # magic, version, record size
+# started_at, actual_seconds, planned_seconds, focus_seconds, mode, interruption
+RECORD = struct.Struct("<qiiiBB2x")
+STARTED_AT = struct.Struct("<q")  # 레코드 맨 앞의 시작 시각만 읽을 때
+
+MODE_CODES = {MODE_WORK: 1, MODE_REST: 2, MODE_LONG_REST: 3}
+MODES = {code: mode for mode, code in MODE_CODES.items()}
+INTERRUPTION_CODES = {
+    None: 0,
+    END_SKIPPED: 1,
+    END_STOPPED: 2,
+    END_CLOSED: 3,
+    END_ABANDONED: 4,
+}
+INTERRUPTIONS = {code: reason for reason, code in INTERRUPTION_CODES.items()}
+
+
+class SessionLogError(Exception):
+    """이 형식의 파일이 아니거나 레코드 크기가 다를 때 발생합니다."""
+
+
+def encode_record(record):
+    """SessionRecord를 24바이트 레코드로 바꿉니다."""
+    return RECORD.pack(
+        int(record.started_at),
+        record.actual_seconds,
+        record.planned_seconds,
+        record.focus_seconds,
+        MODE_CODES[record.mode],
+        INTERRUPTION_CODES.get(record.interruption, 0),
+    )
+
+
+def decode_record(buffer, offset=0):
+    """buffer의 offset 위치에 있는 레코드를 SessionRecord로 읽습니다."""
+    started_at, actual, planned, focus, mode, interruption = RECORD.unpack_from(
+        buffer, offset
+    )
+    ended_at = started_at + actual
+    return SessionRecord(
+        day=day_key(ended_at),
+        started_at=started_at,
+        ended_at=ended_at,
+        mode=MODES.get(mode, MODE_WORK),
+        planned_seconds=planned,
+        actual_seconds=actual,
+        focus_seconds=focus,
+        interruption=INTERRUPTIONS.get(interruption),
+    )
+
+
+class SessionLogSlice:
+    """mmap 위의 연속된 레코드 묶음입니다. 데이터를 복사하지 않고 가리키기만 합니다.
+
+    buffer는 memoryview이므로 NumPy가 있으면 np.frombuffer()로 그대로 감쌀 수
+    있습니다. 쓰고 난 뒤에는 release()를 불러 파일을 닫을 수 있게 해 주세요.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def __len__(self):
+        return len(self.buffer) // RECORD.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return decode_record(self.buffer, index * RECORD.size)
+
+    def __iter__(self):
+        for offset in range(0, len(self.buffer), RECORD.size):
+            yield decode_record(self.buffer, offset)
+
+    def iter_raw(self):
+        """(started_at, actual, planned, focus, mode, interruption) 튜플을 차례로 냅니다."""
+        return RECORD.iter_unpack(self.buffer)
+
+    def release(self):
+        self.buffer.release()
+
+
+class SessionLog:
+    """고정 길이 레코드 파일. append()로 덧붙이고 between()/last_days()로 읽습니다.
+
+    레코드는 시작 시각 순으로 덧붙인다고 가정합니다. 마지막 레코드를 쓰다가
+    꺼져서 남은 조각은 다음에 열 때 잘라냅니다.
+    """
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self._map = None
+        self._mapped_size = 0
+        flags = os.O_RDONLY if readonly else os.O_RDWR | os.O_CREAT | os.O_APPEND
+        self._fd = os.open(path, flags | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            self._check_header()
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _check_header(self):
+        size = os.fstat(self._fd).st_size
+        if size == 0 and not self.readonly:
+            os.write(self._fd, HEADER.pack(MAGIC, VERSION, RECORD.size))
+            os.fsync(self._fd)
+            return
+        os.lseek(self._fd, 0, os.SEEK_SET)  # Windows에는 os.pread가 없습니다.
+        header = os.read(self._fd, HEADER.size)
+        if len(header) < HEADER.size:
+            raise SessionLogError(f"세션 기록 파일이 아닙니다: {self.path}")
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise SessionLogError(f"세션 기록 파일 형식이 다릅니다: {self.path}")
+        torn = (size - HEADER.size) % RECORD.size
+        if torn and not self.readonly:
+            os.ftruncate(self._fd, size - torn)
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # 아직 쓰고 있는 조각이 있으면 그것이 사라질 때 닫힙니다.
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def append(self, record, sync=True):
+        """SessionRecord 하나를 파일 끝에 덧붙입니다."""
+        os.write(self._fd, encode_record(record))
+        if sync:
+            os.fsync(self._fd)
+
+    def extend(self, records):
+        """여러 레코드를 한 번의 쓰기로 덧붙입니다."""
+        os.write(self._fd, b"".join(encode_record(record) for record in records))
+        os.fsync(self._fd)
+
+    def __len__(self):
+        size = os.fstat(self._fd).st_size
+        return max(0, size - HEADER.size) // RECORD.size
+
+    def _records_view(self):
+        """헤더를 뺀 전체 레코드 영역의 memoryview. 파일이 커졌으면 다시 매핑합니다."""
+        count = len(self)
+        size = HEADER.size + count * RECORD.size
+        if self._map is None or size > self._mapped_size:
+            # 예전 매핑은 그 위의 조각이 모두 사라지면 저절로 닫힙니다.
+            self._map = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return memoryview(self._map)[HEADER.size : size]
+
+    def _bisect(self, view, started_at):
+        """started_at 이상인 첫 레코드의 번호를 찾습니다. (log n개 페이지만 읽음)"""
+        low, high = 0, len(view) // RECORD.size
+        while low < high:
+            middle = (low + high) // 2
+            if STARTED_AT.unpack_from(view, middle * RECORD.size)[0] < started_at:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def between(self, start, end=None):
+        """start <= 시작 시각 < end 인 레코드 묶음을 복사 없이 반환합니다."""
+        view = self._records_view()
+        first = self._bisect(view, start)
+        last = len(view) // RECORD.size if end is None else self._bisect(view, end)
+        sliced = view[first * RECORD.size : max(first, last) * RECORD.size]
+        view.release()
+        return SessionLogSlice(sliced)
+
+    def last_days(self, days, now=None):
+        """오늘을 포함한 최근 days일(현지 날짜 기준)의 레코드 묶음을 반환합니다."""
+        today = datetime.date.fromtimestamp(time.time() if now is None else now)
+        first_day = today - datetime.timedelta(days=days - 1)
+        start = time.mktime(first_day.timetuple())
+        return self.between(start)
+
+    def all(self):
+        return self.between(float("-inf"))
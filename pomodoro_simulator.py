@@ -0,0 +1,413 @@
+"""가상 시계로 며칠치 뽀모도로를 몇 밀리초 만에 돌려 보는 시뮬레이터입니다. (Tk 없이 동작)
+
+긴 휴식 제안, 자정에 오늘 통계가 초기화되는 것, 식사 알림처럼 실제로 몇 시간을
+기다려야 볼 수 있는 동작을 바로 확인하려고 씁니다. 엔진, 예약 실행기, 식사
+알림은 화면과 데몬이 쓰는 것을 그대로 쓰고, 시계만 가상 시계로 바꿉니다.
+예약 실행기가 다음 마감 시각을 알려 주면 잠들지 않고 시계를 그 시각으로 옮깁니다.
+
+사용자는 정해진 근무 시간에 시작 버튼을 누르고, 강제 휴식이 끝나면 몇 초 뒤
+화면을 클릭하고, 근무가 끝나면 정지 버튼을 누릅니다. 긴 휴식 제안에는 답하지
+않아 설정의 기본 선택이 적용됩니다.
+
+일어난 일은 "시각 종류 내용" 한 줄씩 기록(trace)에 남으므로, 파일로 저장해
+두었다가 --check로 비교하면 동작이 바뀌었는지 알 수 있습니다.
+
+    python pomodoro_simulator.py --days 7 --trace
+    python pomodoro_simulator.py --settings refresh_pomodoro_settings.json --json
+    python pomodoro_simulator.py --trace-out week.trace
+    python pomodoro_simulator.py --check week.trace
+    python pomodoro_simulator.py --days 365 --repeat 5     # 엔진 전환 처리량
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import sys
+import time
+
+from pomodoro_control import event_name
+from pomodoro_engine import (
+    DEFAULT_MEAL_TIMES,
+    DEFAULT_TIMER_SETTINGS,
+    END_COMPLETED,
+    MODE_WORK,
+    LongRestSuggested,
+    MealSchedule,
+    ModeChanged,
+    PomodoroEngine,
+    RestFinished,
+    SessionCompleted,
+    Stopped,
+    Tick,
+    meal_times_from_dict,
+    parse_meal_time,
+    parse_timer_settings_dict,
+)
+from pomodoro_scheduler import Scheduler
+from pomodoro_storage import read_json
+
+SIMULATION_START = datetime.datetime(2024, 1, 1)  # 월요일
+SIMULATION_DAYS = 7
+WORK_START = "09:00"
+WORK_END = "18:00"
+# 강제 휴식이 끝나고 사용자가 화면을 클릭하기까지 걸리는 시간
+REST_CLICK_SECONDS = 10
+# 가상 단조 시계의 시작값 (0이면 "아직 없음"과 헷갈리기 쉬워서)
+VIRTUAL_MONOTONIC_START = 1000.0
+
+TRACE_NEW_DAY = "new_day"
+TRACE_MEAL = "meal"
+TRACE_USER_START = "user_start"
+TRACE_USER_CLICK = "user_click"
+TRACE_USER_STOP = "user_stop"
+
+# 기록 한 줄. at은 가상 시각(datetime), kind는 엔진 이벤트 이름 또는 TRACE_*
+TraceEntry = collections.namedtuple("TraceEntry", "at kind detail")
+
+
+class VirtualClock:
+    """run()이 옮겨 줄 때만 흐르는 시계입니다.
+
+    monotonic()은 엔진과 예약 실행기의 clock, time()은 wall_clock,
+    now()는 MealSchedule의 now로 넘깁니다. 셋은 같은 순간을 가리킵니다.
+    """
+
+    def __init__(self, start=SIMULATION_START):
+        self.start = start
+        self.elapsed = 0.0
+        self._wall_start = start.timestamp()
+
+    def monotonic(self):
+        return VIRTUAL_MONOTONIC_START + self.elapsed
+
+    def time(self):
+        return self._wall_start + self.elapsed
+
+    def now(self):
+        return self.start + datetime.timedelta(seconds=self.elapsed)
+
+    def monotonic_at(self, moment):
+        """datetime moment에 해당하는 monotonic() 값"""
+        return VIRTUAL_MONOTONIC_START + (moment - self.start).total_seconds()
+
+    def datetime_at_wall(self, wall):
+        """time() 값을 datetime으로 바꿉니다. (시간대와 관계없이)"""
+        return self.start + datetime.timedelta(seconds=wall - self._wall_start)
+
+    def advance_to(self, monotonic):
+        """시계를 monotonic 시각으로 옮깁니다. 거꾸로는 가지 않습니다."""
+        self.elapsed = max(self.elapsed, monotonic - VIRTUAL_MONOTONIC_START)
+
+
+class Simulator:
+    """엔진 하나와 가상 사용자 한 명을 가상 시계로 돌립니다.
+
+    깨어나는 방식은 데몬(PomodoroDaemon)과 같습니다. 세션이 끝나는 시각, 긴 휴식
+    기본 선택 시각, 다음 식사 알림 시각에만 예약을 걸고, 식사 알림 확인에서
+    날짜가 바뀐 것을 보면 오늘 통계를 초기화합니다. display_ticks를 켜면 화면처럼
+    남은 시간 표시가 바뀌는 매초 엔진을 깨웁니다.
+    """
+
+    def __init__(
+        self,
+        settings=DEFAULT_TIMER_SETTINGS,
+        meal_times=DEFAULT_MEAL_TIMES,
+        start=SIMULATION_START,
+        work_start=WORK_START,
+        work_end=WORK_END,
+        skip_weekends=False,
+        rest_click_seconds=REST_CLICK_SECONDS,
+        display_ticks=False,
+    ):
+        self.start = start
+        self.work_start = parse_meal_time(work_start)
+        self.work_end = parse_meal_time(work_end)
+        if self.work_start is None or self.work_end is None:
+            raise ValueError("근무 시간은 HH:MM 형식이어야 해요.")
+        self.skip_weekends = skip_weekends
+        self.rest_click_seconds = rest_click_seconds
+        self.display_ticks = display_ticks
+
+        self.clock = VirtualClock(start)
+        self.scheduler = Scheduler(clock=self.clock.monotonic)
+        self.engine = PomodoroEngine(
+            settings, clock=self.clock.monotonic, wall_clock=self.clock.time
+        )
+        self.engine.subscribe(self.on_engine_event)
+        self.meal_schedule = MealSchedule(now=self.clock.now)
+        self.meal_schedule.set_times(meal_times)
+
+        self.trace = []
+        self.counts = collections.Counter()  # 기록 종류 -> 횟수
+        self.ticks = 0
+        self.transitions = 0
+        self.completed_pomodoros = 0
+        self.engine_call = None
+        self.meal_check_call = None
+
+    def record(self, kind, detail=""):
+        self.trace.append(TraceEntry(self.clock.now(), kind, detail))
+        self.counts[kind] += 1
+
+    # --- 가상 사용자 ---
+
+    def schedule_workdays(self, days):
+        for day in range(days):
+            date = self.start.date() + datetime.timedelta(days=day)
+            if self.skip_weekends and date.weekday() >= 5:
+                continue
+            begin = datetime.datetime.combine(date, self.work_start)
+            end = datetime.datetime.combine(date, self.work_end)
+            if end <= begin:
+                continue
+            self.scheduler.call_at(self.clock.monotonic_at(begin), self.on_work_start)
+            self.scheduler.call_at(self.clock.monotonic_at(end), self.on_work_end)
+
+    def on_work_start(self):
+        self.record(TRACE_USER_START)
+        self.engine.start()
+
+    def on_work_end(self):
+        if self.engine.is_running:
+            self.record(TRACE_USER_STOP)
+            self.engine.stop()
+
+    def on_rest_click(self):
+        if self.engine.rest_finished:
+            self.record(TRACE_USER_CLICK)
+            self.engine.end_rest()
+
+    # --- 데몬과 같은 예약 ---
+
+    def schedule_engine(self):
+        self.scheduler.cancel(self.engine_call)
+        self.engine_call = None
+        engine = self.engine
+        if self.display_ticks:
+            wakeup = engine.next_wakeup()
+        elif engine.awaiting_long_rest_answer:
+            wakeup = engine.decision_deadline
+        elif engine.is_counting_down():
+            wakeup = engine.deadline
+        else:
+            wakeup = None
+        if wakeup is not None:
+            self.engine_call = self.scheduler.call_at(wakeup, self.on_engine_deadline)
+
+    def on_engine_deadline(self):
+        self.engine_call = None
+        self.engine.poll()
+        self.schedule_engine()
+
+    def schedule_meal_check(self):
+        self.scheduler.cancel(self.meal_check_call)
+        self.meal_check_call = self.scheduler.call_later(
+            self.meal_schedule.seconds_until_next_check(), self.check_meal_time
+        )
+
+    def check_meal_time(self):
+        self.meal_check_call = None
+        new_day, due_meals = self.meal_schedule.check()
+        if new_day:
+            self.record(TRACE_NEW_DAY, str(self.meal_schedule.today))
+            self.engine.reset_daily_stats()
+        for meal_name in due_meals:
+            self.record(TRACE_MEAL, meal_name)
+        self.schedule_meal_check()
+
+    def on_engine_event(self, event):
+        if isinstance(event, Tick):
+            self.ticks += 1
+            return
+        self.record(event_name(event), self.describe(event))
+        if isinstance(event, SessionCompleted):
+            if event.mode == MODE_WORK and event.reason == END_COMPLETED:
+                self.completed_pomodoros += 1
+        elif isinstance(event, LongRestSuggested):
+            if not event.timeout_seconds:
+                # 답을 기다리는 설정이면 데몬처럼 바로 기본 선택을 적용합니다.
+                self.scheduler.call_later(
+                    0, self.engine.answer_long_rest, event.default_accept
+                )
+            self.schedule_engine()
+        elif isinstance(event, RestFinished):
+            self.scheduler.call_later(self.rest_click_seconds, self.on_rest_click)
+        elif isinstance(event, ModeChanged):
+            self.transitions += 1
+            self.schedule_engine()
+        elif isinstance(event, Stopped):
+            self.scheduler.cancel(self.engine_call)
+            self.engine_call = None
+
+    def describe(self, event):
+        """기록에 남길 이벤트 내용. 시각은 가상 시각 HH:MM:SS로 보여 줍니다."""
+        if isinstance(event, ModeChanged):
+            return (
+                f"{event.previous_mode} -> {event.mode}"
+                f" {event.duration_seconds / 60:g}분"
+            )
+        if isinstance(event, SessionCompleted):
+            started = self.clock.datetime_at_wall(event.started_at)
+            return (
+                f"{event.mode} {event.reason} {started:%H:%M:%S}부터"
+                f" 집중 {event.focus_seconds}초"
+            )
+        return " ".join(str(value) for value in event)
+
+    # --- 실행 ---
+
+    def run(self, days=SIMULATION_DAYS):
+        """days일을 돌리고 요약 dict를 반환합니다. 기록은 self.trace에 쌓입니다."""
+        self.schedule_workdays(days)
+        self.schedule_meal_check()
+        end = self.clock.monotonic_at(self.start + datetime.timedelta(days=days))
+        scheduler = self.scheduler
+        started = time.perf_counter()
+        while True:
+            deadline = scheduler.next_deadline()
+            if deadline is None or deadline > end:
+                break
+            self.clock.advance_to(deadline)
+            scheduler.run_due()
+        self.clock.advance_to(end)
+        elapsed = time.perf_counter() - started
+
+        transitions = self.transitions
+        return {
+            "days": days,
+            "virtual_seconds": self.clock.elapsed,
+            "real_seconds": elapsed,
+            "speedup": self.clock.elapsed / elapsed if elapsed else None,
+            "transitions": transitions,
+            "transitions_per_second": transitions / elapsed if elapsed else None,
+            "completed_pomodoros": self.completed_pomodoros,
+            "meal_alerts": self.counts[TRACE_MEAL],
+            "ticks": self.ticks,
+            "scheduler_wakeups": scheduler.wakeups,
+            "trace_entries": len(self.trace),
+        }
+
+
+def format_trace_entry(entry):
+    line = f"{entry.at:%Y-%m-%d %H:%M:%S} {entry.kind}"
+    return f"{line} {entry.detail}" if entry.detail else line
+
+
+def format_trace(trace):
+    return "\n".join(format_trace_entry(entry) for entry in trace) + "\n"
+
+
+def compare_trace(lines, expected_lines):
+    """처음 달라지는 줄을 (줄 번호, 기대한 줄, 실제 줄)로, 같으면 None을 반환합니다."""
+    for number, (line, expected) in enumerate(zip(lines, expected_lines), 1):
+        if line != expected:
+            return number, expected, line
+    if len(lines) != len(expected_lines):
+        number = min(len(lines), len(expected_lines)) + 1
+        expected = expected_lines[number - 1] if number <= len(expected_lines) else ""
+        line = lines[number - 1] if number <= len(lines) else ""
+        return number, expected, line
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=SIMULATION_DAYS)
+    parser.add_argument(
+        "--start",
+        type=datetime.date.fromisoformat,
+        default=SIMULATION_START.date(),
+        help="시작 날짜 YYYY-MM-DD (기본 2024-01-01, 월요일)",
+    )
+    parser.add_argument(
+        "--settings", metavar="FILE", help="설정 파일(JSON). 없으면 기본 설정"
+    )
+    parser.add_argument("--work-start", default=WORK_START, help="근무 시작 HH:MM")
+    parser.add_argument("--work-end", default=WORK_END, help="근무 끝 HH:MM")
+    parser.add_argument("--skip-weekends", action="store_true", help="주말은 쉼")
+    parser.add_argument(
+        "--rest-click-seconds",
+        type=float,
+        default=REST_CLICK_SECONDS,
+        help="강제 휴식이 끝나고 화면을 클릭하기까지 걸리는 시간",
+    )
+    parser.add_argument(
+        "--display-ticks",
+        action="store_true",
+        help="화면처럼 매초 엔진을 깨웁니다. (처리량 측정용)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="여러 번 돌려 가장 빠른 결과를 보여 줌"
+    )
+    parser.add_argument("--trace", action="store_true", help="기록을 출력")
+    parser.add_argument("--trace-out", metavar="FILE", help="기록을 파일로 저장")
+    parser.add_argument(
+        "--check", metavar="FILE", help="저장해 둔 기록과 다르면 실패로 끝냄"
+    )
+    parser.add_argument("--json", action="store_true", help="요약을 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.settings:
+        try:
+            loaded = read_json(args.settings)
+        except (OSError, ValueError) as e:
+            sys.exit(f"설정 파일을 읽지 못했어요: {e}")
+        settings, invalid_fields = parse_timer_settings_dict(loaded)
+        if invalid_fields:
+            print(
+                f"잘못된 설정은 기본값을 씁니다: {', '.join(invalid_fields)}",
+                file=sys.stderr,
+            )
+        meal_times = meal_times_from_dict(loaded)
+    else:
+        settings = DEFAULT_TIMER_SETTINGS
+        meal_times = DEFAULT_MEAL_TIMES
+
+    best = None
+    for _ in range(max(1, args.repeat)):
+        simulator = Simulator(
+            settings,
+            meal_times,
+            start=datetime.datetime.combine(args.start, datetime.time.min),
+            work_start=args.work_start,
+            work_end=args.work_end,
+            skip_weekends=args.skip_weekends,
+            rest_click_seconds=args.rest_click_seconds,
+            display_ticks=args.display_ticks,
+        )
+        summary = simulator.run(args.days)
+        if best is None or summary["real_seconds"] < best["real_seconds"]:
+            best = summary
+    trace_text = format_trace(simulator.trace)
+
+    if args.trace:
+        sys.stdout.write(trace_text)
+    if args.trace_out:
+        with open(args.trace_out, "w", encoding="utf-8") as f:
+            f.write(trace_text)
+    if args.json:
+        print(json.dumps(best, indent=4, ensure_ascii=False))
+    else:
+        print(
+            f"{args.days}일 ({best['virtual_seconds'] / 3600:g}시간)을"
+            f" {best['real_seconds'] * 1000:.1f}ms에 돌렸습니다."
+            f" (약 {best['speedup']:,.0f}배)"
+        )
+        print(
+            f"  전환 {best['transitions']}번 ({best['transitions_per_second']:,.0f}번/초),"
+            f" 뽀모도로 {best['completed_pomodoros']}개,"
+            f" 식사 알림 {best['meal_alerts']}번, 예약 실행 {best['scheduler_wakeups']}번"
+        )
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            expected_lines = f.read().splitlines()
+        difference = compare_trace(trace_text.splitlines(), expected_lines)
+        if difference is not None:
+            number, expected, line = difference
+            sys.exit(f"{number}번째 줄이 달라요.\n  기대: {expected}\n  실제: {line}")
+        print(f"기록이 {args.check}와 같습니다. ({len(expected_lines)}줄)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""여러 해 동안 쌓인 세션 기록으로 주별/월별/시간대별 통계를 계산합니다. (Tk 없이 동작)
+
+세션을 한 줄씩 다루지 않고 시작 시각, 집중 시간, 완료 여부를 열(column) 배열로
+불러온 뒤, 몇 번의 일괄 계산으로 모든 통계를 한꺼번에 만듭니다. NumPy가 있으면
+NumPy 배열로, 없으면 array 모듈과 순수 파이썬으로 같은 결과를 냅니다.
+"""
+
+import array
+import collections
+import datetime
+import sqlite3
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 없이도 동작합니다. (조금 느릴 뿐)
+    np = None
+
+from pomodoro_engine import MODE_WORK
+from pomodoro_session_log import MODE_CODES, SessionLog
+
+SECONDS_PER_DAY = 86400
+ROLLING_AVERAGE_DAYS = 7
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# 세션 기록을 열 단위로 담은 것. 세 배열의 길이는 같고 시작 시각 순입니다.
+# started_at: time.time() 기준 초, focus_seconds: 집중 시간,
+# cycles: 끝까지 채운 집중 세션이면 1, 아니면 0
+SessionColumns = collections.namedtuple(
+    "SessionColumns", "started_at focus_seconds cycles"
+)
+
+# compute_stats()의 결과. 날짜는 datetime.date, 값은 모두 파이썬 기본형입니다.
+# days/daily_*/rolling_average_seconds는 first_day부터 last_day까지 하루도 빠짐없이
+# 같은 순서로 들어 있고, hour_heatmap은 [요일(월=0)][시(0~23)]의 집중 시간입니다.
+FocusStats = collections.namedtuple(
+    "FocusStats",
+    "backend sessions first_day last_day total_focus_seconds total_cycles"
+    " days daily_focus_seconds daily_cycles rolling_average_seconds"
+    " weekly monthly hour_heatmap current_streak longest_streak",
+)
+
+
+def numpy_available():
+    return np is not None
+
+
+def _use_numpy(use_numpy):
+    if use_numpy is None:
+        return np is not None
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy가 설치되어 있지 않습니다.")
+    return use_numpy
+
+
+def make_columns(started_at, focus_seconds, cycles, use_numpy=None):
+    """세 개의 순서열로 SessionColumns를 만듭니다."""
+    if _use_numpy(use_numpy):
+        return SessionColumns(
+            np.asarray(started_at, dtype=np.float64),
+            np.asarray(focus_seconds, dtype=np.int64),
+            np.asarray(cycles, dtype=np.int8),
+        )
+    return SessionColumns(
+        array.array("d", started_at),
+        array.array("q", focus_seconds),
+        array.array("b", cycles),
+    )
+
+
+def columns_from_records(records, use_numpy=None):
+    """pomodoro_history.SessionRecord 목록을 열 배열로 바꿉니다."""
+    return make_columns(
+        [record.started_at for record in records],
+        [record.focus_seconds for record in records],
+        [
+            int(record.mode == MODE_WORK and record.interruption is None)
+            for record in records
+        ],
+        use_numpy,
+    )
+
+
+def load_columns(history_path, first_day=None, use_numpy=None):
+    """기록 파일에서 필요한 열만 읽어 옵니다.
+
+    sqlite3 연결은 만든 스레드에서만 쓸 수 있으므로 여기서 따로 열고 닫습니다.
+    그래서 화면이 멈추지 않게 작업 스레드에서 불러도 됩니다.
+    """
+    started_at = array.array("d")
+    focus_seconds = array.array("q")
+    cycles = array.array("b")
+    conn = sqlite3.connect(history_path)
+    try:
+        rows = conn.execute(
+            "SELECT started_at, focus_seconds,"
+            " mode = ? AND interruption IS NULL FROM sessions"
+            " WHERE day >= ? ORDER BY started_at",
+            (MODE_WORK, first_day or ""),
+        )
+        for started, focus, cycle in rows:
+            started_at.append(started)
+            focus_seconds.append(focus)
+            cycles.append(cycle)
+    except sqlite3.Error:
+        pass  # 아직 세션 표가 없는 새 파일
+    finally:
+        conn.close()
+    if _use_numpy(use_numpy):
+        # array의 버퍼를 그대로 감싸므로 복사하지 않습니다.
+        return SessionColumns(
+            np.frombuffer(started_at, dtype=np.float64),
+            np.frombuffer(focus_seconds, dtype=np.int64),
+            np.frombuffer(cycles, dtype=np.int8),
+        )
+    return SessionColumns(started_at, focus_seconds, cycles)
+
+
+def load_log_columns(log_path, days=None, use_numpy=None):
+    """이진 세션 기록(pomodoro_session_log)에서 열을 읽어 옵니다.
+
+    days를 주면 최근 days일만 읽습니다. NumPy가 있으면 mmap 위의 레코드를
+    복사 없이 구조체 배열로 감싼 뒤 필요한 열만 뽑아냅니다.
+    """
+    log = SessionLog(log_path, readonly=True)
+    try:
+        records = log.all() if days is None else log.last_days(days)
+        try:
+            if _use_numpy(use_numpy):
+                table = np.frombuffer(records.buffer, dtype=_LOG_DTYPE)
+                columns = SessionColumns(
+                    table["started_at"].astype(np.float64),
+                    table["focus_seconds"].astype(np.int64),
+                    (
+                        (table["mode"] == MODE_CODES[MODE_WORK])
+                        & (table["interruption"] == 0)
+                    ).astype(np.int8),
+                )
+                del table  # mmap을 닫을 수 있도록 참조를 놓습니다.
+                return columns
+            started_at = array.array("d")
+            focus_seconds = array.array("q")
+            cycles = array.array("b")
+            work = MODE_CODES[MODE_WORK]
+            for started, _, _, focus, mode, interruption in records.iter_raw():
+                started_at.append(started)
+                focus_seconds.append(focus)
+                cycles.append(mode == work and interruption == 0)
+            return SessionColumns(started_at, focus_seconds, cycles)
+        finally:
+            records.release()
+    finally:
+        log.close()
+
+
+if np is not None:
+    # pomodoro_session_log.RECORD와 같은 배치 ("<qiiiBB2x")
+    _LOG_DTYPE = np.dtype(
+        [
+            ("started_at", "<i8"),
+            ("actual_seconds", "<i4"),
+            ("planned_seconds", "<i4"),
+            ("focus_seconds", "<i4"),
+            ("mode", "u1"),
+            ("interruption", "u1"),
+            ("padding", "V2"),
+        ]
+    )
+
+
+def _utc_offset(utc_day):
+    # 그 날 정오의 현지 시간대 차이. 서머타임이 바뀌는 날 새벽의 세션은
+    # 한 시간 어긋날 수 있지만, 날짜별로 한 번만 계산하므로 빠릅니다.
+    return time.localtime(utc_day * SECONDS_PER_DAY + SECONDS_PER_DAY // 2).tm_gmtoff
+
+
+def _date(epoch_day):
+    return datetime.date.fromordinal(EPOCH_ORDINAL + epoch_day)
+
+
+def _epoch_day(date):
+    return date.toordinal() - EPOCH_ORDINAL
+
+
+def compute_stats(columns, today=None, rolling_days=ROLLING_AVERAGE_DAYS):
+    """모든 통계를 한 번에 계산해 FocusStats로 반환합니다. 기록이 없으면 None."""
+    if not len(columns.started_at):
+        return None
+    if today is None:
+        today = datetime.date.today()
+    if np is not None and isinstance(columns.started_at, np.ndarray):
+        return _compute_numpy(columns, _epoch_day(today), rolling_days)
+    return _compute_python(columns, _epoch_day(today), rolling_days)
+
+
+def _compute_numpy(columns, today, rolling_days):
+    started_at = columns.started_at
+    focus = columns.focus_seconds.astype(np.float64)
+    cycles = columns.cycles.astype(np.float64)
+
+    # 1) 현지 날짜와 시각: 시간대 차이는 (UTC) 날짜별로 한 번만 구합니다.
+    utc_days = np.floor_divide(started_at, SECONDS_PER_DAY).astype(np.int64)
+    unique_days, inverse = np.unique(utc_days, return_inverse=True)
+    offsets = np.array([_utc_offset(int(day)) for day in unique_days], np.float64)
+    local = started_at + offsets[inverse]
+    days = np.floor_divide(local, SECONDS_PER_DAY).astype(np.int64)
+    hours = (np.floor_divide(local, 3600) % 24).astype(np.int64)
+
+    # 2) 날짜별 합계 (오늘까지 빈 날 없이)
+    first_day = int(days.min())
+    last_day = max(int(days.max()), today)
+    span = last_day - first_day + 1
+    day_index = days - first_day
+    daily_focus = np.bincount(day_index, weights=focus, minlength=span)
+    daily_cycles = np.bincount(day_index, weights=cycles, minlength=span)
+
+    # 3) 요일 x 시간대 (세션을 시작한 시각 기준, 1970-01-01은 목요일)
+    weekdays = (days + 3) % 7
+    heatmap = np.bincount(weekdays * 24 + hours, weights=focus, minlength=7 * 24)
+
+    # 4) 이동 평균: 누적합의 차이로 한 번에 계산
+    cumulative = np.concatenate(([0.0], np.cumsum(daily_focus)))
+    window = np.minimum(np.arange(1, span + 1), rolling_days)
+    ends = np.arange(1, span + 1)
+    rolling = (cumulative[ends] - cumulative[ends - window]) / window
+
+    # 5) 주별(월요일 시작), 월별 합계는 날짜별 합계에서 다시 묶습니다.
+    epoch_days = np.arange(first_day, last_day + 1)
+    weeks = (epoch_days + 3) // 7
+    week_index = weeks - weeks[0]
+    weekly_focus = np.bincount(week_index, weights=daily_focus)
+    weekly_cycles = np.bincount(week_index, weights=daily_cycles)
+    months = epoch_days.astype("datetime64[D]").astype("datetime64[M]")
+    month_numbers = months.astype(np.int64)
+    month_index = month_numbers - month_numbers[0]
+    monthly_focus = np.bincount(month_index, weights=daily_focus)
+    monthly_cycles = np.bincount(month_index, weights=daily_cycles)
+
+    # 6) 연속 기록: 집중한 날이 이어지는 구간의 시작과 끝
+    active = np.concatenate(([0], (daily_focus > 0).astype(np.int8), [0]))
+    edges = np.diff(active)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)  # 구간 끝 다음 칸
+    runs = run_ends - run_starts
+    longest_streak = int(runs.max()) if len(runs) else 0
+    current_streak = 0
+    if len(runs):
+        # 오늘 아직 집중하지 않았어도 어제까지 이어졌으면 끊긴 것으로 보지 않습니다.
+        last_end = int(run_ends[-1]) - 1 + first_day
+        if last_end >= today - 1:
+            current_streak = int(runs[-1])
+
+    first_month = int(month_numbers[0])
+    return FocusStats(
+        backend="numpy",
+        sessions=len(started_at),
+        first_day=_date(first_day),
+        last_day=_date(last_day),
+        total_focus_seconds=int(daily_focus.sum()),
+        total_cycles=int(daily_cycles.sum()),
+        days=[_date(day) for day in range(first_day, last_day + 1)],
+        daily_focus_seconds=daily_focus.astype(np.int64).tolist(),
+        daily_cycles=daily_cycles.astype(np.int64).tolist(),
+        rolling_average_seconds=rolling.tolist(),
+        weekly=[
+            (_date(int(weeks[0] + index) * 7 - 3), int(seconds), int(count))
+            for index, (seconds, count) in enumerate(zip(weekly_focus, weekly_cycles))
+        ],
+        monthly=[
+            (_month_key(first_month + index), int(seconds), int(count))
+            for index, (seconds, count) in enumerate(
+                zip(monthly_focus, monthly_cycles)
+            )
+        ],
+        hour_heatmap=heatmap.reshape(7, 24).astype(np.int64).tolist(),
+        current_streak=current_streak,
+        longest_streak=longest_streak,
+    )
+
+
+def _compute_python(columns, today, rolling_days):
+    # 1) 세션을 한 번 훑으면서 날짜별, 요일x시간대별 합계를 함께 냅니다.
+    offsets = {}
+    daily_focus_map = collections.defaultdict(int)
+    daily_cycles_map = collections.defaultdict(int)
+    heatmap = [0] * (7 * 24)
+    for started_at, focus, cycle in zip(
+        columns.started_at, columns.focus_seconds, columns.cycles
+    ):
+        utc_day = int(started_at // SECONDS_PER_DAY)
+        offset = offsets.get(utc_day)
+        if offset is None:
+            offset = offsets[utc_day] = _utc_offset(utc_day)
+        local = started_at + offset
+        day = int(local // SECONDS_PER_DAY)
+        daily_focus_map[day] += focus
+        daily_cycles_map[day] += cycle
+        heatmap[((day + 3) % 7) * 24 + int(local // 3600) % 24] += focus
+
+    # 2) 날짜 범위 전체를 한 번 훑으며 이동 평균, 주별/월별, 연속 기록을 냅니다.
+    first_day = min(daily_focus_map)
+    last_day = max(max(daily_focus_map), today)
+    daily_focus = []
+    daily_cycles = []
+    rolling = []
+    weekly = []
+    monthly = []
+    window_sum = 0
+    run = 0
+    longest_streak = 0
+    for index, day in enumerate(range(first_day, last_day + 1)):
+        focus = daily_focus_map.get(day, 0)
+        cycle = daily_cycles_map.get(day, 0)
+        daily_focus.append(focus)
+        daily_cycles.append(cycle)
+
+        window_sum += focus
+        if index >= rolling_days:
+            window_sum -= daily_focus[index - rolling_days]
+        rolling.append(window_sum / min(index + 1, rolling_days))
+
+        date = _date(day)
+        week_start = _date(day - (day + 3) % 7)
+        if not weekly or weekly[-1][0] != week_start:
+            weekly.append([week_start, 0, 0])
+        weekly[-1][1] += focus
+        weekly[-1][2] += cycle
+        month = f"{date.year:04d}-{date.month:02d}"
+        if not monthly or monthly[-1][0] != month:
+            monthly.append([month, 0, 0])
+        monthly[-1][1] += focus
+        monthly[-1][2] += cycle
+
+        if focus > 0:
+            run += 1
+            longest_streak = max(longest_streak, run)
+        elif day != today:  # 오늘은 아직 끝나지 않았으므로 끊긴 것으로 보지 않습니다.
+            run = 0
+
+    return FocusStats(
+        backend="python",
+        sessions=len(columns.started_at),
+        first_day=_date(first_day),
+        last_day=_date(last_day),
+        total_focus_seconds=sum(daily_focus),
+        total_cycles=sum(daily_cycles),
+        days=[_date(day) for day in range(first_day, last_day + 1)],
+        daily_focus_seconds=daily_focus,
+        daily_cycles=daily_cycles,
+        rolling_average_seconds=rolling,
+        weekly=[tuple(week) for week in weekly],
+        monthly=[tuple(month) for month in monthly],
+        hour_heatmap=[heatmap[row * 24 : row * 24 + 24] for row in range(7)],
+        current_streak=run,
+        longest_streak=longest_streak,
+    )
+
+
+def _month_key(months_since_epoch):
+    year, month = divmod(months_since_epoch, 12)
+    return f"{1970 + year:04d}-{month + 1:02d}"
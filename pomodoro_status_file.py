@@ -0,0 +1,252 @@
+"""상태 표시줄(waybar, polybar, tmux)이 읽는 공유 메모리 상태 파일입니다. (Tk 없이 동작)
+
+켜져 있는 창(또는 데몬)은 상태가 바뀔 때마다 56바이트짜리 고정 형식 파일을 mmap으로
+고쳐 씁니다. 읽는 쪽은 같은 파일을 mmap으로 열어 두고 원하는 만큼 자주 읽으면
+되므로, 프로그램에 소켓으로 묻거나 프로그램을 깨울 필요가 없습니다.
+
+쓰는 도중에 읽어도 어긋난 값을 보지 않도록 시퀀스 잠금(seqlock)을 씁니다.
+쓰는 쪽은 시퀀스를 홀수로 올린 뒤 내용을 쓰고 다시 짝수로 올리며, 읽는 쪽은
+내용을 읽기 전과 후의 시퀀스가 같은 짝수일 때만 그 값을 씁니다.
+(파이썬에서는 메모리 배리어를 걸 수 없으므로 x86처럼 쓰기 순서가 지켜지는 CPU를
+가정합니다. 다른 CPU에서도 updated_at으로 오래된 값은 알아챌 수 있습니다.)
+
+    python pomodoro_status_file.py                      # 한 번 읽기: "집중 12:34"
+    python pomodoro_status_file.py --watch --format '{mode} {remaining} ({cycles})'
+"""
+
+import argparse
+import collections
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+
+from pomodoro_engine import (
+    MODE_LONG_REST,
+    MODE_READY,
+    MODE_REST,
+    MODE_STOPPED,
+    MODE_WORK,
+)
+
+STATUS_FILENAME = "refresh_pomodoro_status.bin"
+
+MAGIC = b"RPST"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")  # magic, version, payload size
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = HEADER.size
+# deadline(time.time() 기준, 없으면 0), updated_at, remaining_seconds,
+# pomodoro_cycles_today, total_work_seconds_today, pid, mode, flags
+PAYLOAD = struct.Struct("<ddiIIIBB6x")
+PAYLOAD_OFFSET = SEQUENCE_OFFSET + SEQUENCE.size
+FILE_SIZE = PAYLOAD_OFFSET + PAYLOAD.size
+
+MODE_CODES = {
+    MODE_READY: 0,
+    MODE_WORK: 1,
+    MODE_REST: 2,
+    MODE_LONG_REST: 3,
+    MODE_STOPPED: 4,
+}
+MODES = {code: mode for mode, code in MODE_CODES.items()}
+
+FLAG_ALIVE = 1  # 쓰는 프로그램이 켜져 있음 (정상 종료할 때 지움)
+FLAG_RUNNING = 2
+FLAG_REST_FINISHED = 4
+FLAG_AWAITING_LONG_REST_ANSWER = 8
+
+# 쓰는 중이라 읽지 못했을 때 잠깐 쉬었다가 다시 시도합니다.
+READ_RETRIES = 100
+READ_RETRY_SLEEP_SECONDS = 0.0005
+
+StatusSnapshot = collections.namedtuple(
+    "StatusSnapshot",
+    "mode alive running rest_finished awaiting_long_rest_answer deadline"
+    " remaining_seconds pomodoro_cycles_today total_work_seconds_today pid"
+    " updated_at sequence",
+)
+
+
+class StatusFileError(Exception):
+    """상태 파일 형식이 다르거나 일관된 값을 읽지 못했을 때 발생합니다."""
+
+
+def status_file_path(settings_path):
+    """상태 파일 경로. 설정 파일과 같은 폴더를 씁니다."""
+    return os.path.join(os.path.dirname(settings_path), STATUS_FILENAME)
+
+
+class StatusWriter:
+    """상태 파일을 mmap으로 열어 두고 write()마다 시퀀스 잠금으로 고쳐 씁니다."""
+
+    def __init__(self, path, wall_clock=time.time):
+        self.path = path
+        self.wall_clock = wall_clock
+        self.writes = 0
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, FILE_SIZE)
+            self._map = mmap.mmap(fd, FILE_SIZE)
+        finally:
+            os.close(fd)
+        self._sequence = SEQUENCE.unpack_from(self._map, SEQUENCE_OFFSET)[0]
+        if self._sequence % 2:  # 쓰다가 꺼진 경우
+            self._sequence += 1
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, PAYLOAD.size)
+
+    def write(self, state, alive=True):
+        """pomodoro_control.engine_state()와 같은 형식의 dict를 씁니다."""
+        flags = FLAG_ALIVE if alive else 0
+        if state.get("running"):
+            flags |= FLAG_RUNNING
+        if state.get("rest_finished"):
+            flags |= FLAG_REST_FINISHED
+        if state.get("awaiting_long_rest_answer"):
+            flags |= FLAG_AWAITING_LONG_REST_ANSWER
+        payload = PAYLOAD.pack(
+            state.get("deadline") or 0.0,
+            self.wall_clock(),
+            state.get("remaining_seconds", 0),
+            state.get("pomodoro_cycles_today", 0),
+            state.get("total_work_seconds_today", 0),
+            os.getpid(),
+            MODE_CODES.get(state.get("mode"), 0),
+            flags,
+        )
+        self._sequence += 1  # 홀수: 쓰는 중
+        SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+        self._map[PAYLOAD_OFFSET:FILE_SIZE] = payload
+        self._sequence += 1  # 짝수: 다 씀
+        SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+        self.writes += 1
+
+    def close(self, state=None):
+        """마지막 상태를 '꺼짐'으로 남기고 닫습니다."""
+        if self._map is None:
+            return
+        self.write(state or {"mode": MODE_STOPPED}, alive=False)
+        self._map.close()
+        self._map = None
+
+
+class StatusReader:
+    """상태 파일을 mmap으로 열어 두고 read()마다 시스템 호출 없이 읽습니다."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), FILE_SIZE, access=mmap.ACCESS_READ)
+        magic, version, payload_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or payload_size != PAYLOAD.size:
+            self._map.close()
+            raise StatusFileError(f"상태 파일 형식이 다릅니다: {path}")
+
+    def read(self):
+        status_map = self._map
+        for _ in range(READ_RETRIES):
+            before = SEQUENCE.unpack_from(status_map, SEQUENCE_OFFSET)[0]
+            if not before % 2:
+                payload = PAYLOAD.unpack_from(status_map, PAYLOAD_OFFSET)
+                if SEQUENCE.unpack_from(status_map, SEQUENCE_OFFSET)[0] == before:
+                    return _snapshot(payload, before)
+            time.sleep(READ_RETRY_SLEEP_SECONDS)
+        raise StatusFileError("상태 파일을 일관되게 읽지 못했습니다.")
+
+    def close(self):
+        self._map.close()
+
+
+def _snapshot(payload, sequence):
+    deadline, updated_at, remaining, cycles, focus, pid, mode, flags = payload
+    return StatusSnapshot(
+        mode=MODES.get(mode, MODE_READY),
+        alive=bool(flags & FLAG_ALIVE),
+        running=bool(flags & FLAG_RUNNING),
+        rest_finished=bool(flags & FLAG_REST_FINISHED),
+        awaiting_long_rest_answer=bool(flags & FLAG_AWAITING_LONG_REST_ANSWER),
+        deadline=deadline or None,
+        remaining_seconds=remaining,
+        pomodoro_cycles_today=cycles,
+        total_work_seconds_today=focus,
+        pid=pid,
+        updated_at=updated_at,
+        sequence=sequence,
+    )
+
+
+def remaining_seconds(snapshot, now=None):
+    """마감 시각이 있으면 지금 시각 기준으로 남은 시간을 계산합니다."""
+    if snapshot.deadline is None:
+        return snapshot.remaining_seconds
+    if now is None:
+        now = time.time()
+    return max(0, math.ceil(snapshot.deadline - now))
+
+
+def seconds_until_next_change(snapshot, now=None):
+    """남은 시간 표시가 바뀌는 다음 초 경계까지의 시간 (없으면 1초)"""
+    if now is None:
+        now = time.time()
+    if snapshot.deadline is None or snapshot.deadline <= now:
+        return 1.0
+    return (snapshot.deadline - now) % 1 + 0.001
+
+
+def format_status(snapshot, template, now=None):
+    remaining = remaining_seconds(snapshot, now)
+    mins, secs = divmod(remaining, 60)
+    mode = snapshot.mode if snapshot.alive else "꺼짐"
+    return template.format(
+        mode=mode,
+        remaining=f"{mins:02d}:{secs:02d}",
+        remaining_seconds=remaining,
+        cycles=snapshot.pomodoro_cycles_today,
+        focus_minutes=snapshot.total_work_seconds_today // 60,
+    )
+
+
+def main(argv=None):
+    """참고용 읽기 프로그램. 상태 표시줄의 명령으로 그대로 써도 됩니다."""
+    parser = argparse.ArgumentParser(description="리프레시 뽀모도로 상태 읽기")
+    parser.add_argument("--path", help="상태 파일 경로 (기본: 설정 폴더)")
+    parser.add_argument(
+        "--format",
+        default="{mode} {remaining}",
+        help="사용할 수 있는 값: mode, remaining, remaining_seconds, cycles,"
+        " focus_minutes",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    parser.add_argument("--watch", action="store_true", help="1초마다 다시 출력")
+    args = parser.parse_args(argv)
+
+    path = args.path
+    if path is None:
+        from pomodoro_storage import get_settings_path
+
+        path = status_file_path(get_settings_path())
+    try:
+        reader = StatusReader(path)
+    except (OSError, ValueError, StatusFileError) as e:
+        sys.exit(f"상태 파일을 열지 못했어요: {e}")
+    try:
+        while True:
+            snapshot = reader.read()
+            if args.json:
+                print(json.dumps(snapshot._asdict(), ensure_ascii=False), flush=True)
+            else:
+                print(format_status(snapshot, args.format), flush=True)
+            if not args.watch:
+                break
+            time.sleep(seconds_until_next_change(snapshot))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""설정 파일 위치와 안전한 저장을 맡습니다. (Tk 없이 동작)
+
+설정은 임시 파일에 다 쓴 뒤 fsync 하고 이름을 바꿔 끼우므로, 저장 도중에
+프로그램이 꺼져도 예전 파일이나 새 파일 중 하나는 온전히 남습니다.
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+
+from pomodoro_engine import MODE_LONG_REST, MODE_REST, MODE_WORK, SessionCheckpoint
+from pomodoro_scheduler import SCHEDULER_BACKENDS, SCHEDULER_HEAP
+
+SETTINGS_FILENAME = "refresh_pomodoro_settings.json"  # 설정 파일 이름 변경
+APP_NAME_FOR_SETTINGS = "RefreshPomodoro"  # 설정 폴더 이름 변경
+SETTINGS_SAVE_DEBOUNCE_SECONDS = 3  # 마지막 변경 후 이만큼 조용하면 저장
+CHECKPOINT_FILENAME = "refresh_pomodoro_checkpoint.json"  # 진행 중인 세션
+CHECKPOINT_INTERVAL_SECONDS = 30  # 진행 중인 세션을 다시 기록하는 간격
+
+
+def get_settings_path():
+    """설정 파일 경로를 반환합니다. (OS별 사용자 데이터 폴더 우선)"""
+    if sys.platform == "win32":
+        path = os.path.join(
+            os.environ.get("APPDATA", os.path.expanduser("~")), APP_NAME_FOR_SETTINGS
+        )
+    elif sys.platform == "darwin":  # macOS
+        path = os.path.join(
+            os.path.expanduser("~"),
+            "Library",
+            "Application Support",
+            APP_NAME_FOR_SETTINGS,
+        )
+    else:  # Linux 등 기타
+        path = os.path.join(
+            os.environ.get(
+                "XDG_CONFIG_HOME", os.path.join(os.path.expanduser("~"), ".config")
+            ),
+            APP_NAME_FOR_SETTINGS,
+        )
+
+    if not os.path.exists(path):
+        try:
+            os.makedirs(path, exist_ok=True)  # exist_ok=True 추가
+        except OSError:
+            if getattr(sys, "frozen", False):
+                path = os.path.dirname(sys.executable)
+            else:
+                path = os.path.dirname(os.path.abspath(__file__))
+            return os.path.join(path, SETTINGS_FILENAME)
+
+    return os.path.join(path, SETTINGS_FILENAME)
+
+
+def read_json(path):
+    """JSON 파일을 읽습니다. 없으면 FileNotFoundError, 깨졌으면 ValueError가 납니다."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def read_scheduler_backend(path):
+    """설정 파일의 예약 방식(scheduler_backend)을 읽습니다.
+
+    파일이 없거나 깨졌거나 값이 없으면 SCHEDULER_HEAP, 모르는 이름이면 ValueError.
+    예약을 걸기 전에 정해야 하므로 다른 설정보다 먼저 따로 읽습니다.
+    """
+    try:
+        settings = read_json(path)
+    except (OSError, ValueError):
+        return SCHEDULER_HEAP
+    if not isinstance(settings, dict):
+        return SCHEDULER_HEAP
+    backend = settings.get("scheduler_backend", SCHEDULER_HEAP)
+    if not isinstance(backend, str) or backend not in SCHEDULER_BACKENDS:
+        raise ValueError(f"알 수 없는 예약 방식입니다: {backend}")
+    return backend
+
+
+def atomic_write_bytes(path, data):
+    """임시 파일 + fsync + 이름 바꾸기로 path의 내용을 한 번에 바꿔 끼웁니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_json(path, obj):
+    atomic_write_bytes(path, json.dumps(obj, indent=4).encode("utf-8"))
+
+
+def save_checkpoint(path, checkpoint):
+    """진행 중인 세션을 기록합니다. checkpoint가 None이면 기록을 지웁니다."""
+    if checkpoint is None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    atomic_write_json(path, checkpoint._asdict())
+
+
+def load_checkpoint(path):
+    """남아 있는 세션 기록을 SessionCheckpoint로 반환합니다. 없거나 깨졌으면 None."""
+    try:
+        with open(path, "r") as f:
+            checkpoint = SessionCheckpoint(**json.load(f))
+    except (OSError, ValueError, TypeError):  # UnicodeDecodeError도 ValueError
+        return None
+    if checkpoint.mode not in (MODE_WORK, MODE_REST, MODE_LONG_REST):
+        return None
+    for value in checkpoint[1:]:
+        if not _is_finite_number(value):
+            return None
+    return checkpoint
+
+
+def _is_finite_number(value):
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+def _fsync_directory(directory):
+    # 이름 바꾸기 자체도 디스크에 남도록 폴더를 fsync 합니다. (Windows는 지원 안 함)
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SettingsPersister:
+    """바뀐 설정을 모아 두었다가 한 번에 저장합니다. (write-behind)
+
+    mark_dirty()는 저장을 예약만 하고, 마지막 변경 뒤 debounce_seconds 동안
+    더 바뀌지 않으면 그때 snapshot()의 결과를 씁니다. 세션이 끝날 때나 프로그램을
+    닫을 때는 flush()로 바로 저장합니다. 내용이 마지막 저장과 같으면 쓰지 않습니다.
+    """
+
+    def __init__(
+        self,
+        scheduler,
+        path,
+        snapshot,
+        debounce_seconds=SETTINGS_SAVE_DEBOUNCE_SECONDS,
+    ):
+        self.scheduler = scheduler
+        self.path = path
+        self.snapshot = snapshot
+        self.debounce_seconds = debounce_seconds
+        self.writes = 0
+        self._pending_call = None
+        self._last_written = None
+
+    def is_dirty(self):
+        return self._pending_call is not None
+
+    def mark_dirty(self, *args):  # Tk 변수의 trace에서도 바로 부를 수 있게 *args
+        self.scheduler.cancel(self._pending_call)
+        self._pending_call = self.scheduler.call_later(
+            self.debounce_seconds, self.flush, name="save_settings"
+        )
+
+    def flush(self):
+        """예약된 저장을 지금 바로 실행합니다. 저장했으면 True를 반환합니다."""
+        self.scheduler.cancel(self._pending_call)
+        self._pending_call = None
+        data = json.dumps(self.snapshot(), indent=4).encode("utf-8")
+        if data == self._last_written:
+            return False
+        try:
+            atomic_write_bytes(self.path, data)
+        except Exception as e:
+            # 사용자에게 오류를 알리는 대신 콘솔에만 출력합니다.
+            print(f"설정 저장 중 오류: {e}")
+            return False
+        self._last_written = data
+        self.writes += 1
+        return True
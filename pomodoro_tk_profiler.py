@@ -0,0 +1,239 @@
+"""--profile-callbacks: Tk 이벤트 루프를 막는 느린 콜백을 찾습니다.
+
+설치하는 동안 tkinter.Misc._register와 Variable._register를 감싸므로 after,
+after_idle, trace_add, 위젯의 command=, bind로 등록하는 모든 파이썬 콜백
+(PomodoroApp, CollapsibleFrame, 오버레이 등)이 한 곳에서 재어집니다.
+
+- 콜백 하나가 threshold_seconds보다 오래 걸리면 걸린 시간과 그동안 가장 많이
+  잡힌 스택을 stderr에 남깁니다.
+- 콜백이 도는 동안 따로 스레드가 sample_interval마다 메인 스레드의 스택을
+  잡아 두었다가, close()할 때 flamegraph.pl/speedscope가 읽는 접힌 스택
+  (collapsed stack) 형식으로 씁니다. 한 줄이 "콜백;함수;함수 샘플 수"입니다.
+- 시간 예약은 모두 Tk after 하나(TkScheduler._on_timer)로 모이므로,
+  Scheduler.profiler에 넣어 두면 한 번에 실행하는 예약도 콜백 이름(카운트다운,
+  오버레이, 식사 알림 등)별로 따로 잽니다. 느린 예약이 있으면 그 예약만
+  알리고, 감싼 _on_timer는 다시 알리지 않습니다.
+
+    python refresh_pomodoro.py --profile-callbacks callbacks.folded
+    flamegraph.pl callbacks.folded > callbacks.svg
+"""
+
+import collections
+import os
+import sys
+import threading
+import time
+
+SLOW_CALLBACK_SECONDS = 0.05
+SAMPLE_INTERVAL_SECONDS = 0.001
+# 느린 콜백 기록에 보여줄 스택 깊이 (안쪽부터)
+LOGGED_STACK_DEPTH = 12
+# 콜백을 부르기만 하는 tkinter 내부와 이 모듈의 프레임은 스택에서 뺍니다.
+SKIPPED_FRAMES = (
+    "Misc.after.<locals>.callit",
+    "CallWrapper.__call__",
+    "CallbackProfiler.wrap.<locals>.profiled",
+    "CallbackProfiler.run_scheduled",
+)
+
+
+def callback_label(func):
+    """flamegraph 맨 아래 칸에 쓸 콜백 이름. 메서드는 클래스 이름을 붙입니다."""
+    if getattr(func, "__qualname__", "").endswith("after.<locals>.callit"):
+        # tkinter.Misc.after가 감싼 함수 대신 원래 함수 이름을 씁니다.
+        cells = dict(zip(func.__code__.co_freevars, func.__closure__ or ()))
+        if "func" in cells:
+            func = cells["func"].cell_contents
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", None) or type(func).__name__
+    if owner is not None:
+        return f"{type(owner).__name__}.{name}"
+    code = getattr(func, "__code__", None)
+    if name == "<lambda>" and code is not None:
+        return f"<lambda {os.path.basename(code.co_filename)}:{code.co_firstlineno}>"
+    return getattr(func, "__qualname__", name)
+
+
+def _frame_label(code):
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+class _Invocation:
+    __slots__ = ("label", "samples", "slow_inside")
+
+    def __init__(self, label):
+        self.label = label
+        self.samples = collections.Counter()
+        self.slow_inside = False  # 안쪽 콜백을 이미 느리다고 알렸음
+
+
+class CallbackProfiler:
+    """Tk 콜백을 감싸 시간을 재고 스택을 표본으로 모읍니다."""
+
+    def __init__(
+        self,
+        output_path=None,
+        threshold_seconds=SLOW_CALLBACK_SECONDS,
+        sample_interval=SAMPLE_INTERVAL_SECONDS,
+        stream=None,
+        clock=time.perf_counter,
+    ):
+        self.output_path = output_path
+        self.threshold_seconds = threshold_seconds
+        self.sample_interval = sample_interval
+        self.stream = stream
+        self.clock = clock
+        self.callbacks = 0
+        self.slow_callbacks = 0
+        self.folded = collections.Counter()  # 접힌 스택 -> 샘플 수
+        self._active = []  # 실행 중인 _Invocation (콜백 안에서 이벤트 루프가 돌면 쌓임)
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.get_ident()
+        self._sampler = None
+        self._running = False
+        self._original_registers = None
+        self._previous_switch_interval = None
+
+    # --- 설치 ---
+
+    def install(self):
+        """tkinter의 _register를 감싸고 표본 스레드를 띄웁니다."""
+        import tkinter
+
+        if self._original_registers is not None:
+            return
+        misc_register = tkinter.Misc._register
+        variable_register = tkinter.Variable._register
+        profiler = self
+
+        def register_widget_callback(widget, func, subst=None, needcleanup=1):
+            return misc_register(widget, profiler.wrap(func), subst, needcleanup)
+
+        def register_trace_callback(variable, callback):
+            return variable_register(variable, profiler.wrap(callback))
+
+        tkinter.Misc._register = register_widget_callback
+        tkinter.Variable._register = register_trace_callback
+        self._original_registers = (misc_register, variable_register)
+        # 메인 스레드가 GIL을 오래 쥐고 있어도 표본 스레드가 제때 깨어나도록
+        self._previous_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._previous_switch_interval, self.sample_interval))
+        self._running = True
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="pomodoro-tk-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    def close(self):
+        """원래대로 되돌리고 output_path가 있으면 접힌 스택을 씁니다."""
+        if self._original_registers is not None:
+            import tkinter
+
+            tkinter.Misc._register, tkinter.Variable._register = (
+                self._original_registers
+            )
+            self._original_registers = None
+            sys.setswitchinterval(self._previous_switch_interval)
+        self._running = False
+        if self._sampler is not None:
+            self._sampler.join(1.0)
+            self._sampler = None
+        if self.output_path:
+            self.write_folded(self.output_path)
+
+    # --- 콜백 감싸기 ---
+
+    def wrap(self, func):
+        label = callback_label(func)
+        profiler = self
+
+        def profiled(*args):
+            return profiler.measure(label, func, *args)
+
+        # tkinter는 Tcl 명령 이름에 __name__을 붙입니다.
+        profiled.__name__ = getattr(func, "__name__", "callback")
+        return profiled
+
+    def run_scheduled(self, call, func, *args):
+        """Scheduler.run_due()가 예약 하나를 실행할 때 예약의 콜백 이름으로 잽니다."""
+        return self.measure(callback_label(call.callback), func, *args)
+
+    def measure(self, label, func, *args):
+        """func(*args)를 label이라는 콜백 하나로 재며 부릅니다."""
+        invocation = _Invocation(label)
+        active = self._active
+        active.append(invocation)
+        started = self.clock()
+        try:
+            return func(*args)
+        finally:
+            elapsed = self.clock() - started
+            active.pop()
+            self.callbacks += 1
+            slow = invocation.slow_inside or elapsed >= self.threshold_seconds
+            if slow and not invocation.slow_inside:
+                self.report_slow(invocation, elapsed)
+            if slow and active:
+                active[-1].slow_inside = True
+
+    def report_slow(self, invocation, elapsed):
+        self.slow_callbacks += 1
+        with self._lock:
+            sample = invocation.samples.most_common(1)
+        lines = [f"느린 콜백 {invocation.label}: {elapsed * 1000:.1f}ms"]
+        if sample:
+            stack, count = sample[0]
+            frames = stack.split(";")[1:]
+            total = sum(invocation.samples.values())
+            lines.append(f"  가장 많이 잡힌 스택 ({count}/{total} 샘플):")
+            for frame in frames[-LOGGED_STACK_DEPTH:]:
+                lines.append(f"    {frame}")
+        print("\n".join(lines), file=self.stream or sys.stderr, flush=True)
+
+    # --- 표본 ---
+
+    def _sample_loop(self):
+        measure_code = CallbackProfiler.measure.__code__
+        while self._running:
+            time.sleep(self.sample_interval)
+            active = list(self._active)
+            if not active:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            frames = []
+            depth = 0
+            # 가장 바깥 콜백의 measure() 프레임까지 거슬러 올라가며, measure()
+            # 프레임 자리에는 그 콜백의 이름을 넣습니다.
+            while frame is not None and depth < len(active):
+                if frame.f_code is measure_code:
+                    depth += 1
+                    frames.append(active[-depth].label)
+                else:
+                    label = _frame_label(frame.f_code)
+                    if not label.endswith(SKIPPED_FRAMES):
+                        frames.append(label)
+                frame = frame.f_back
+            if depth < len(active):  # 그 사이에 콜백이 끝남
+                continue
+            stack = ";".join(reversed(frames))
+            with self._lock:
+                for invocation in active:
+                    invocation.samples[stack] += 1
+                self.folded[stack] += 1
+
+    # --- 출력 ---
+
+    def folded_lines(self):
+        with self._lock:
+            return [f"{stack} {count}" for stack, count in sorted(self.folded.items())]
+
+    def write_folded(self, path):
+        lines = self.folded_lines()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        print(
+            f"콜백 {self.callbacks}번 중 느린 콜백 {self.slow_callbacks}번,"
+            f" 스택 샘플 {sum(self.folded.values())}개를 {path}에 썼습니다.",
+            file=self.stream or sys.stderr,
+        )
@@ -1,10 +1,76 @@
 # 필요한 라이브러리들을 가져옵니다.
-import tkinter as tk
-from tkinter import messagebox, ttk
-import datetime
-import json  # 설정 저장/불러오기를 위한 json 모듈
-import os  # 운영체제 관련 기능 사용 (파일 경로 등)
-import sys  # 실행 파일 경로 확인용
+import time
+
+# --profile-startup에서 import에 걸린 시간을 재는 기준 시각
+IMPORT_STARTED_AT = time.perf_counter()
+
+import sys  # noqa: E402
+
+if __name__ == "__main__":
+    # 이미 켜져 있으면 Tk를 불러오기 전에 명령(show/start/stop)만 넘기고 끝냅니다.
+    import pomodoro_instance
+
+    INSTANCE_SERVER = pomodoro_instance.claim_or_hand_off(sys.argv[1:])
+else:
+    INSTANCE_SERVER = None
+
+# 창을 띄우는 데 필요 없는 모듈(ttk, messagebox, 통계용 NumPy 등)은 쓰는
+# 곳에서 가져옵니다.
+import tkinter as tk  # noqa: E402
+import collections  # noqa: E402
+import datetime  # noqa: E402
+import math  # noqa: E402
+# 운영체제 관련 기능 사용 (파일 경로 등)
+import os  # noqa: E402
+import queue  # noqa: E402
+import threading  # noqa: E402
+
+from pomodoro_engine import (  # noqa: E402
+    END_CLOSED,
+    LONG_REST_PROMPT_DEFAULT_ACCEPT,
+    LONG_REST_PROMPT_TIMEOUT_SECONDS,
+    MODE_LONG_REST,
+    MODE_REST,
+    MODE_WORK,
+    RESUME_DEFAULT_POLICY,
+    RESUME_MAX_DOWNTIME_SECONDS,
+    RESUME_POLICIES,
+    TIMER_ENTRY_FIELDS,
+    TIMER_SETTING_LABELS,
+    LongRestSuggested,
+    MealSchedule,
+    ModeChanged,
+    PomodoroEngine,
+    RestFinished,
+    SessionCompleted,
+    SettingsInvalid,
+    StatsChanged,
+    Stopped,
+    Tick,
+    TimerSettings,
+    parse_timer_settings,
+)
+from pomodoro_control import (  # noqa: E402
+    ControlServer,
+    MainThreadCalls,
+    control_socket_path,
+    engine_state,
+    event_name,
+)
+from pomodoro_history import HISTORY_FILENAME, SessionHistory  # noqa: E402
+from pomodoro_render import WidgetRenderer  # noqa: E402
+from pomodoro_scheduler import SCHEDULER_HEAP, create_scheduler  # noqa: E402
+from pomodoro_status_file import StatusWriter, status_file_path  # noqa: E402
+from pomodoro_storage import (  # noqa: E402
+    CHECKPOINT_FILENAME,
+    CHECKPOINT_INTERVAL_SECONDS,
+    SettingsPersister,
+    get_settings_path,
+    load_checkpoint,
+    read_json,
+    read_scheduler_backend,
+    save_checkpoint,
+)
 
 # --- 스타일 색상 (유지) ---
 COLOR_BACKGROUND = "#15202B"
@@ -37,46 +103,21 @@ FONT_SIZE_OVERLAY_CLICK_PROMPT = FONT_SIZE_NORMAL
 CHECK_CHAR = "✓"
 UNCHECK_CHAR = "☐"
 
-MEAL_CHECK_INTERVAL_MS = 10000
-SETTINGS_FILENAME = "refresh_pomodoro_settings.json"  # 설정 파일 이름 변경
-APP_NAME_FOR_SETTINGS = "RefreshPomodoro"  # 설정 폴더 이름 변경
-
+OVERLAY_LATENCY_SAMPLES = 50  # 오버레이가 뜨는 데 걸린 시간 기록 개수
+PROMPT_NOTICE_SECONDS = 15  # 알림 배너가 저절로 닫히기까지의 시간
+STATS_POLL_SECONDS = 0.1  # 통계 계산이 끝났는지 확인하는 간격
+STATS_RECENT_WEEKS = 8
+STATS_RECENT_MONTHS = 6
+WEEKDAY_NAMES = "월화수목금토일"
 
-def get_settings_path():
-    """설정 파일 경로를 반환합니다. (OS별 사용자 데이터 폴더 우선)"""
-    if sys.platform == "win32":
-        path = os.path.join(
-            os.environ.get("APPDATA", os.path.expanduser("~")), APP_NAME_FOR_SETTINGS
-        )
-    elif sys.platform == "darwin":  # macOS
-        path = os.path.join(
-            os.path.expanduser("~"),
-            "Library",
-            "Application Support",
-            APP_NAME_FOR_SETTINGS,
-        )
-    else:  # Linux 등 기타
-        path = os.path.join(
-            os.environ.get(
-                "XDG_CONFIG_HOME", os.path.join(os.path.expanduser("~"), ".config")
-            ),
-            APP_NAME_FOR_SETTINGS,
-        )
 
-    if not os.path.exists(path):
-        try:
-            os.makedirs(path, exist_ok=True)  # exist_ok=True 추가
-        except OSError:
-            if getattr(sys, "frozen", False):
-                path = os.path.dirname(sys.executable)
-            else:
-                path = os.path.dirname(os.path.abspath(__file__))
-            return os.path.join(path, SETTINGS_FILENAME)
-
-    return os.path.join(path, SETTINGS_FILENAME)
+class CollapsibleFrame(tk.Frame):
+    """제목을 눌러 내용을 접고 펼치는 프레임입니다.
 
+    content_builder를 주면 처음 펼칠 때 content_builder(content_frame)을 불러
+    내용을 만듭니다. 접힌 채로 시작하면 창을 띄울 때 내용을 만들지 않습니다.
+    """
 
-class CollapsibleFrame(tk.Frame):
     def __init__(
         self,
         parent,
@@ -88,10 +129,12 @@ class CollapsibleFrame(tk.Frame):
         content_bg=COLOR_BACKGROUND,
         on_toggle=None,
         font_size_title=FONT_SIZE_COLLAPSIBLE_TITLE,
+        content_builder=None,
     ):
         super().__init__(parent, bg=bg_color)
         self.parent_root = parent.winfo_toplevel()
         self.on_toggle = on_toggle
+        self.content_builder = content_builder
         self._is_collapsed = initial_collapsed
         self.title_frame = tk.Frame(
             self, relief=tk.FLAT, bd=0, bg=title_bg, padx=5, pady=2
@@ -125,14 +168,26 @@ class CollapsibleFrame(tk.Frame):
             self, relief=tk.FLAT, bd=0, bg=content_bg, padx=0, pady=0
         )
         if not self._is_collapsed:
+            self.ensure_built()
             self.content_frame.pack(fill=tk.X)
 
+    def is_built(self):
+        return self.content_builder is None
+
+    def ensure_built(self):
+        """내용을 아직 만들지 않았으면 지금 만듭니다."""
+        builder = self.content_builder
+        if builder is not None:
+            self.content_builder = None
+            builder(self.content_frame)
+
     def toggle(self):
         self._is_collapsed = not self._is_collapsed
         if self._is_collapsed:
             self.content_frame.pack_forget()
             self.toggle_button_text.set("▶ ")
         else:
+            self.ensure_built()
             self.content_frame.pack(fill=tk.X)
             self.toggle_button_text.set("▼ ")
         if self.on_toggle:
@@ -142,6 +197,406 @@ class CollapsibleFrame(tk.Frame):
         return self.content_frame
 
 
+class PromptBanner(tk.Frame):
+    """모달 창 대신 메인 창 안에 띄우는 알림/질문 배너입니다.
+
+    한 번 만들어 두고 ask()/notify()로 내용만 바꿔 재사용합니다. 이벤트
+    루프를 막지 않으므로 떠 있는 동안에도 타이머와 알림 예약은 계속 돕니다.
+    """
+
+    def __init__(
+        self, parent, scheduler, after_widget=None, bg=COLOR_SECTION_TITLE_BG
+    ):
+        super().__init__(parent, bg=bg, padx=8, pady=6)
+        self.scheduler = scheduler
+        self.after_widget = after_widget  # 이 위젯 바로 아래에 배너를 띄웁니다.
+        self._on_answer = None
+        self._hide_call = None
+        self.message_label = tk.Label(
+            self,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_NORMAL, "bold"),
+            bg=bg,
+            fg=COLOR_TEXT,
+            justify="center",
+            wraplength=300,
+        )
+        self.message_label.pack(fill=tk.X)
+        self.note_label = tk.Label(
+            self,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            bg=bg,
+            fg=COLOR_LABEL_MUTED,
+            justify="center",
+            wraplength=300,
+        )
+        self.note_label.pack(fill=tk.X)
+        buttons_frame = tk.Frame(self, bg=bg)
+        buttons_frame.pack(pady=(4, 0))
+        self.yes_button = self._create_button(buttons_frame, lambda: self._answer(True))
+        self.yes_button.pack(side=tk.LEFT, padx=3)
+        self.no_button = self._create_button(
+            buttons_frame, lambda: self._answer(False)
+        )
+        self.no_button.pack(side=tk.LEFT, padx=3)
+
+    def _create_button(self, parent, command):
+        return tk.Button(
+            parent,
+            text="",
+            command=command,
+            bg=COLOR_BUTTON,
+            fg=COLOR_BUTTON_TEXT,
+            activebackground=COLOR_BUTTON_ACTIVE,
+            activeforeground=COLOR_BUTTON_TEXT,
+            font=(FONT_FAMILY, FONT_SIZE_SMALL, "bold"),
+            relief=tk.FLAT,
+            borderwidth=0,
+            padx=8,
+            pady=2,
+        )
+
+    def ask(self, message, on_answer, yes_text="네", no_text="아니요", note=""):
+        """예/아니요 질문을 띄웁니다. 답은 on_answer(True/False)로 전달됩니다."""
+        self._show(message, note)
+        self._on_answer = on_answer
+        self.yes_button.config(text=yes_text)
+        self.no_button.config(text=no_text)
+        self.no_button.pack(side=tk.LEFT, padx=3)
+
+    def notify(self, message, timeout=PROMPT_NOTICE_SECONDS):
+        """확인 버튼 하나짜리 알림을 띄우고 timeout초 뒤에 저절로 닫습니다."""
+        self._show(message, "")
+        self._on_answer = None
+        self.yes_button.config(text="확인")
+        self.no_button.pack_forget()
+        if timeout:
+            self._hide_call = self.scheduler.call_later(timeout, self.hide)
+
+    def is_asking(self):
+        return self._on_answer is not None
+
+    def hide(self):
+        self.scheduler.cancel(self._hide_call)
+        self._hide_call = None
+        self._on_answer = None
+        self.pack_forget()
+
+    def _show(self, message, note):
+        self.scheduler.cancel(self._hide_call)
+        self._hide_call = None
+        self.message_label.config(text=message)
+        self.note_label.config(text=note)
+        if note:
+            self.note_label.pack(fill=tk.X, after=self.message_label)
+        else:
+            self.note_label.pack_forget()
+        if self.after_widget is not None:
+            self.pack(fill=tk.X, pady=(0, 8), after=self.after_widget)
+        else:
+            self.pack(fill=tk.X, pady=(0, 8))
+
+    def _answer(self, accepted):
+        on_answer = self._on_answer
+        self.hide()
+        if on_answer:
+            on_answer(accepted)
+
+
+class RestOverlay:
+    """휴식 시간에 화면을 덮는 오버레이 창입니다.
+
+    창과 라벨은 처음 한 번만 만들고, 휴식마다 withdraw/deiconify로 숨겼다
+    보여주기만 합니다. 라벨 글자, 커서, 클릭 바인딩은 renderer(WidgetRenderer)를
+    거쳐 실제로 바뀔 때만 다시 설정합니다.
+    """
+
+    def __init__(self, root, on_click, renderer=None):
+        self.on_click = on_click
+        self.renderer = WidgetRenderer() if renderer is None else renderer
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.attributes("-fullscreen", True)
+        self.window.attributes("-topmost", True)
+        self.window.attributes("-alpha", 0.92)
+        self.window.configure(bg="black")
+        self.message_label = tk.Label(
+            self.window,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_OVERLAY_MESSAGE, "bold"),
+            fg="white",
+            bg="black",
+            justify="center",
+        )
+        self.message_label.pack(
+            expand=False, pady=(self.window.winfo_screenheight() // 4.5, 15)
+        )
+        self.time_label = tk.Label(
+            self.window,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_OVERLAY_TIME, "bold"),
+            fg="white",
+            bg="black",
+        )
+        self.time_label.pack(pady=15)
+        self.click_to_close_label = tk.Label(
+            self.window,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_OVERLAY_CLICK_PROMPT),
+            fg=COLOR_LABEL_MUTED,
+            bg="black",
+            justify="center",
+        )
+        self.click_to_close_label.pack(pady=(20, 0))
+        self._visible = False
+        self._show_started_at = None
+        # show()부터 창이 실제로 화면에 매핑될 때까지 걸린 시간(초)
+        self.show_latencies = collections.deque(maxlen=OVERLAY_LATENCY_SAMPLES)
+        self.window.bind("<Map>", self._on_map)
+
+    def show(self, message):
+        self.set_text(self.message_label, message)
+        if self._visible:
+            return
+        self._visible = True
+        self._show_started_at = time.perf_counter()
+        self.window.deiconify()
+        self.window.attributes("-topmost", True)
+        self.window.lift()
+
+    def hide(self):
+        if not self._visible:
+            return
+        self._visible = False
+        self._show_started_at = None
+        self.window.withdraw()
+
+    def is_visible(self):
+        return self._visible
+
+    def set_text(self, label, text):
+        self.renderer.configure(label, text=text)
+
+    def set_clickable(self, clickable):
+        self.renderer.bind(
+            self.window, "<Button-1>", self.on_click if clickable else None
+        )
+        self.renderer.configure(self.window, cursor="hand2" if clickable else "")
+
+    def last_show_latency_ms(self):
+        if not self.show_latencies:
+            return None
+        return self.show_latencies[-1] * 1000
+
+    def _on_map(self, event):
+        if event.widget is not self.window or self._show_started_at is None:
+            return
+        self.show_latencies.append(time.perf_counter() - self._show_started_at)
+        self._show_started_at = None
+
+
+class StatsWindow:
+    """주별/월별 집중 시간, 연속 기록, 시간대별 히트맵을 보여주는 창입니다.
+
+    통계 계산은 작업 스레드에서 하고, 끝났는지는 스케줄러로 가끔 확인해서
+    기록이 아무리 많아도 메인 창이 멈추지 않습니다.
+    """
+
+    HEATMAP_CELL = 14
+
+    def __init__(self, root, scheduler, history, session_log_path=None, on_close=None):
+        self.scheduler = scheduler
+        self.history = history
+        self.session_log_path = session_log_path
+        self.on_close = on_close
+        self._results = queue.Queue()
+        self._poll_call = None
+        self.window = tk.Toplevel(root)
+        self.window.title("집중 통계")
+        self.window.configure(bg=COLOR_BACKGROUND)
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.summary_label = tk.Label(
+            self.window,
+            text="통계를 계산하고 있어요...",
+            font=(FONT_FAMILY, FONT_SIZE_NORMAL),
+            bg=COLOR_BACKGROUND,
+            fg=COLOR_TEXT,
+            justify="left",
+            anchor="w",
+        )
+        self.summary_label.pack(fill=tk.X, padx=12, pady=(12, 6))
+        self.periods_label = tk.Label(
+            self.window,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            bg=COLOR_BACKGROUND,
+            fg=COLOR_LABEL_MUTED,
+            justify="left",
+            anchor="w",
+        )
+        self.periods_label.pack(fill=tk.X, padx=12)
+        cell = self.HEATMAP_CELL
+        self.heatmap = tk.Canvas(
+            self.window,
+            width=cell * 25,
+            height=cell * 8,
+            bg=COLOR_BACKGROUND,
+            highlightthickness=0,
+        )
+        self.heatmap.pack(padx=12, pady=(6, 12))
+        self.refresh()
+
+    def refresh(self):
+        """기록을 다시 읽어 통계를 새로 계산합니다."""
+        import pomodoro_stats  # NumPy를 불러오므로 통계 창을 열 때 가져옵니다.
+
+        if self.session_log_path:
+            source = (pomodoro_stats.load_log_columns, self.session_log_path)
+        elif self.history.path == ":memory:":
+            # 메모리 기록은 다른 스레드에서 열 수 없으므로 여기서 바로 계산합니다.
+            records = self.history.sessions_between("", "9999-12-31")
+            columns = pomodoro_stats.columns_from_records(records)
+            self._show(pomodoro_stats.compute_stats(columns))
+            return
+        else:
+            source = (pomodoro_stats.load_columns, self.history.path)
+        threading.Thread(target=self._compute, args=source, daemon=True).start()
+        self._schedule_poll()
+
+    def close(self):
+        self.scheduler.cancel(self._poll_call)
+        self._poll_call = None
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
+
+    def _compute(self, load, path):
+        from pomodoro_stats import compute_stats
+
+        try:
+            self._results.put(compute_stats(load(path)))
+        except Exception as e:
+            self._results.put(e)
+
+    def _schedule_poll(self):
+        self.scheduler.cancel(self._poll_call)
+        self._poll_call = self.scheduler.call_later(STATS_POLL_SECONDS, self._poll)
+
+    def _poll(self):
+        self._poll_call = None
+        try:
+            result = self._results.get_nowait()
+        except queue.Empty:
+            self._schedule_poll()
+            return
+        if isinstance(result, Exception):
+            self.summary_label.config(text=f"통계를 불러오지 못했어요: {result}")
+            return
+        self._show(result)
+
+    def _show(self, stats):
+        if stats is None:
+            self.summary_label.config(text="아직 기록된 세션이 없어요.")
+            return
+        rolling_minutes = stats.rolling_average_seconds[-1] / 60
+        self.summary_label.config(
+            text=(
+                f"연속 {stats.current_streak}일째 집중 중 "
+                f"(최장 {stats.longest_streak}일)\n"
+                f"최근 7일 하루 평균 {rolling_minutes:.0f}분\n"
+                f"{stats.first_day}부터 총 {stats.total_focus_seconds / 3600:.1f}시간 / "
+                f"뽀모도로 {stats.total_cycles}회"
+            )
+        )
+        lines = ["최근 주 (월요일 시작)"]
+        for week_start, seconds, cycles in stats.weekly[-STATS_RECENT_WEEKS:]:
+            lines.append(f"  {week_start:%m/%d}  {seconds // 60:5d}분  {cycles:3d}회")
+        lines.append("최근 달")
+        for month, seconds, cycles in stats.monthly[-STATS_RECENT_MONTHS:]:
+            lines.append(f"  {month}  {seconds / 3600:6.1f}시간  {cycles:4d}회")
+        self.periods_label.config(text="\n".join(lines))
+        self._draw_heatmap(stats.hour_heatmap)
+
+    def _draw_heatmap(self, heatmap):
+        canvas = self.heatmap
+        cell = self.HEATMAP_CELL
+        canvas.delete("all")
+        peak = max(max(row) for row in heatmap) or 1
+        for hour in range(0, 24, 6):
+            canvas.create_text(
+                cell * (hour + 1.5),
+                cell // 2,
+                text=str(hour),
+                fill=COLOR_LABEL_MUTED,
+                font=(FONT_FAMILY, FONT_SIZE_SMALL - 2),
+            )
+        for weekday, row in enumerate(heatmap):
+            y = cell * (weekday + 1)
+            canvas.create_text(
+                cell // 2,
+                y + cell // 2,
+                text=WEEKDAY_NAMES[weekday],
+                fill=COLOR_LABEL_MUTED,
+                font=(FONT_FAMILY, FONT_SIZE_SMALL - 2),
+            )
+            for hour, seconds in enumerate(row):
+                x = cell * (hour + 1)
+                canvas.create_rectangle(
+                    x,
+                    y,
+                    x + cell - 1,
+                    y + cell - 1,
+                    fill=_blend_color(COLOR_SECTION_BG, COLOR_BUTTON, seconds / peak),
+                    width=0,
+                )
+
+
+def _blend_color(color_from, color_to, ratio):
+    """두 #RRGGBB 색 사이를 ratio(0~1)만큼 섞습니다."""
+    start = [int(color_from[i : i + 2], 16) for i in (1, 3, 5)]
+    end = [int(color_to[i : i + 2], 16) for i in (1, 3, 5)]
+    mixed = [round(a + (b - a) * ratio) for a, b in zip(start, end)]
+    return "#{:02X}{:02X}{:02X}".format(*mixed)
+
+
+class TkScheduler:
+    """Scheduler의 가장 이른 마감 시각에 맞춰 Tk after를 딱 하나만 걸어 둡니다."""
+
+    def __init__(self, root, scheduler):
+        self.root = root
+        self.scheduler = scheduler
+        self._after_id = None
+        self._armed_for = None
+        scheduler.on_reschedule = self.rearm
+
+    def rearm(self):
+        deadline = self.scheduler.next_deadline()
+        if deadline == self._armed_for and (deadline is None or self._after_id):
+            return
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._armed_for = deadline
+        if deadline is None:
+            return
+        delay_ms = max(0, math.ceil((deadline - self.scheduler.clock()) * 1000))
+        self._after_id = self.root.after(delay_ms, self._on_timer)
+
+    def cancel(self):
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+        self._after_id = None
+        self._armed_for = None
+
+    def _on_timer(self):
+        self._after_id = None
+        self._armed_for = None
+        self.scheduler.run_due()
+        self.rearm()
+
+
 class CustomCheckbutton(tk.Frame):
     def __init__(
         self, parent, variable, text="", command=None, description="", **kwargs
@@ -181,11 +636,15 @@ class CustomCheckbutton(tk.Frame):
 
 
 class PomodoroApp:
-    def __init__(self, root_window):
+    def __init__(self, root_window, profiler=None):
         self.root = root_window
         self.root.title("리프레시 뽀모도로")  # 프로그램 이름 변경
         self.root.configure(bg=COLOR_BACKGROUND)
+        if profiler is None:
+            profiler = StartupProfiler(enabled=False)
+        self.profiler = profiler
         self.settings_path = get_settings_path()
+        profiler.mark("get_settings_path")
 
         self.work_minutes_default = 25
         self.rest_minutes_default = 5
@@ -196,15 +655,33 @@ class PomodoroApp:
         self.meal_times_default = {"점심": "12:00", "저녁": "17:30"}
         self.long_rest_cycle_default = "4"
         self.long_rest_duration_default = "15"
-
-        self.current_mode = "준비"
-        self.remaining_seconds = 0
-        self.timer_id = None
-        self.is_running = False
-        self.overlay_window = None
-        self.total_work_seconds_today = 0
-        self.last_session_work_seconds = 0
-        self.pomodoro_cycles_today = 0
+        # 설정 파일에서만 바꿀 수 있는 값 (긴 휴식 제안에 답이 없을 때의 처리)
+        self.long_rest_prompt_timeout = LONG_REST_PROMPT_TIMEOUT_SECONDS
+        self.long_rest_prompt_default = LONG_REST_PROMPT_DEFAULT_ACCEPT
+        # 세션 중에 꺼졌다가 다시 켰을 때 진행 중이던 세션을 어떻게 이어갈지
+        self.resume_policy = RESUME_DEFAULT_POLICY
+        self.resume_max_downtime = RESUME_MAX_DOWNTIME_SECONDS
+        # 켜면 끝난 세션을 고정 길이 이진 파일에도 남기고 통계를 거기서 읽습니다.
+        self.use_binary_session_log = False
+        self.session_log = None
+        # 상태 표시줄/스크립트용 제어 소켓 (pomodoro_control)
+        self.use_control_socket = True
+        self.control_server = None
+        self.main_thread_calls = None
+        # 상태 표시줄이 mmap으로 읽는 상태 파일 (pomodoro_status_file)
+        self.use_status_file = True
+        self.status_writer = None
+        # 설정하면 예약 콜백의 지연을 재고 localhost의 이 포트로 내보냅니다.
+        self.metrics_port = None
+        self.metrics_server = None
+
+        self.countdown_call = None
+        self.meal_check_call = None
+        self.checkpoint_call = None
+        self.instance_server = None
+        self.rest_overlay = None  # 처음 쉬는 시간 전에 미리 만들어 둡니다.
+        self.stats_window = None
+        self.overlay_is_long_rest = False
 
         self.always_on_top_var = tk.BooleanVar()
         self.force_rest_var = tk.BooleanVar()
@@ -218,12 +695,61 @@ class PomodoroApp:
         self.work_minutes_var = tk.StringVar()
         self.rest_minutes_var = tk.StringVar()
 
+        # 설정 패널은 처음 펼칠 때 만들어지므로 그 전까지는 None 입니다.
         self.always_on_top_check = None
         self.force_rest_check = None
         self.meal_alert_check = None
         self.long_rest_check = None
+        self.work_entry = None
+        self.rest_entry = None
+        self.long_rest_cycle_entry = None
+        self.long_rest_duration_entry = None
+        self.lunch_time_entry = None
+        self.dinner_time_entry = None
+        self.long_rest_settings_frame = None
+        self.meal_entries_frame = None
+
+        # 카운트다운, 식사 알림 등 시간 예약은 모두 이 스케줄러 하나가 맡습니다.
+        # 예약 방식은 켤 때만 정하므로 설정 파일에서 이 값만 먼저 읽습니다.
+        try:
+            self.scheduler_backend = read_scheduler_backend(self.settings_path)
+        except ValueError as e:
+            print(f"{e} ({SCHEDULER_HEAP}을 씁니다.)")
+            self.scheduler_backend = SCHEDULER_HEAP
+        self.scheduler = create_scheduler(self.scheduler_backend)
+        self.tk_scheduler = TkScheduler(self.root, self.scheduler)
+        # 매초 바뀌는 라벨과 버튼은 이걸 거쳐서 글자가 바뀔 때만 Tk를 부릅니다.
+        self.renderer = WidgetRenderer()
+        # 타이머 규칙은 엔진이 맡고, 이 클래스는 엔진 이벤트를 화면에 그리기만 합니다.
+        self.engine = PomodoroEngine(clock=self.scheduler.clock)
+        self.engine.subscribe(self.on_engine_event)
+        self.meal_schedule = MealSchedule()
+        self.history = SessionHistory(
+            os.path.join(os.path.dirname(self.settings_path), HISTORY_FILENAME)
+        )
+        profiler.mark("open history")
+        self.checkpoint_path = os.path.join(
+            os.path.dirname(self.settings_path), CHECKPOINT_FILENAME
+        )
 
         self.load_settings()
+        self.load_today_stats()
+        self.open_session_log()
+        profiler.mark("load_settings")
+        # 설정은 바뀔 때마다 바로 쓰지 않고 모아 두었다가 한 번에 저장합니다.
+        self.settings_persister = SettingsPersister(
+            self.scheduler, self.settings_path, self.settings_snapshot
+        )
+        # 타이머는 입력칸 문자열 대신 이 스냅샷만 읽습니다. (trace에서 갱신)
+        self.timer_settings = TimerSettings(
+            work_minutes=self.work_minutes_default,
+            rest_minutes=self.rest_minutes_default,
+            force_rest=self.force_rest_default,
+            long_rest_cycle_threshold=int(self.long_rest_cycle_default),
+            long_rest_duration=int(self.long_rest_duration_default),
+        )
+        self.invalid_timer_settings = ()
+        self.refresh_timer_settings()
 
         self.always_on_top_var.trace_add(
             "write",
@@ -239,7 +765,12 @@ class PomodoroApp:
         self.force_rest_var.trace_add(
             "write",
             lambda *args: (
-                self.force_rest_check.update_symbol() if self.force_rest_check else None
+                (
+                    self.force_rest_check.update_symbol()
+                    if self.force_rest_check
+                    else None
+                ),
+                self.refresh_timer_settings(),
             ),
         )
         self.use_meal_alert_var.trace_add(
@@ -251,6 +782,7 @@ class PomodoroApp:
                     else None
                 ),
                 self.toggle_meal_time_entries_visibility(),
+                self.rebuild_meal_alerts(),
             ),
         )
         self.use_long_rest_suggestion_var.trace_add(
@@ -258,19 +790,46 @@ class PomodoroApp:
             lambda *args: (
                 self.long_rest_check.update_symbol() if self.long_rest_check else None,
                 self.toggle_long_rest_settings_visibility(),
+                self.refresh_timer_settings(),
             ),
         )
-
-        self.meal_alert_shown_today = {meal: False for meal in self.meal_times_default}
-        self.today_date = datetime.date.today()
+        for timer_var in (
+            self.work_minutes_var,
+            self.rest_minutes_var,
+            self.long_rest_cycle_threshold_var,
+            self.long_rest_duration_var,
+        ):
+            timer_var.trace_add("write", self.refresh_timer_settings)
+
+        for meal_time_var in self.meal_times_vars.values():
+            meal_time_var.trace_add("write", self.rebuild_meal_alerts)
+
+        for settings_var in (
+            self.always_on_top_var,
+            self.force_rest_var,
+            self.use_meal_alert_var,
+            self.use_long_rest_suggestion_var,
+            self.long_rest_cycle_threshold_var,
+            self.long_rest_duration_var,
+            self.work_minutes_var,
+            self.rest_minutes_var,
+            *self.meal_times_vars.values(),
+        ):
+            settings_var.trace_add("write", self.settings_persister.mark_dirty)
 
         self.setup_ui()
+        profiler.mark("setup_ui")
         self.update_stats_display()
-        self.check_meal_time_periodically()
+        self.rebuild_meal_alerts()
         self.toggle_always_on_top_action()
         self.root.update_idletasks()
+        profiler.mark("first update_idletasks")
         self.adjust_window_size()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.resume_session()
+        profiler.mark("resume_session")
+        # 첫 휴식 때 버벅이지 않도록 창이 뜬 뒤 한가할 때 오버레이를 미리 만듭니다.
+        self.root.after_idle(self.get_rest_overlay)
 
     def adjust_window_size(self):
         self.root.update_idletasks()
@@ -329,14 +888,30 @@ class PomodoroApp:
             pady=5,
         )
         self.stop_button.pack(side=tk.LEFT, padx=5)
+        stats_frame = tk.Frame(main_frame, bg=COLOR_BACKGROUND)
+        stats_frame.pack(pady=(0, 8), anchor="center")
         self.stats_label = tk.Label(
-            main_frame,
+            stats_frame,
             text="오늘 집중 0분 / 뽀모도로 0회",
             font=(FONT_FAMILY, FONT_SIZE_SMALL),
             bg=COLOR_BACKGROUND,
             fg=COLOR_LABEL_MUTED,
         )
-        self.stats_label.pack(pady=(0, 8), anchor="center")
+        self.stats_label.pack(side=tk.LEFT)
+        self.stats_view_label = tk.Label(
+            stats_frame,
+            text="📊 통계",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL, "underline"),
+            bg=COLOR_BACKGROUND,
+            fg=COLOR_BUTTON,
+            cursor="hand2",
+        )
+        self.stats_view_label.pack(side=tk.LEFT, padx=(6, 0))
+        self.stats_view_label.bind("<Button-1>", self.show_stats_window)
+        # 긴 휴식 제안, 오류 알림 등은 모달 창 대신 이 배너로 보여줍니다.
+        self.prompt_banner = PromptBanner(
+            main_frame, self.scheduler, after_widget=buttons_frame
+        )
 
         self.all_settings_collapsible = CollapsibleFrame(
             main_frame,
@@ -346,9 +921,13 @@ class PomodoroApp:
             content_bg=COLOR_BACKGROUND,
             on_toggle=self.adjust_window_size,
             font_size_title=FONT_SIZE_COLLAPSIBLE_TITLE,
+            content_builder=self.setup_settings_panel,
         )
         self.all_settings_collapsible.pack(fill=tk.X, pady=(0, 3))
-        all_settings_content = self.all_settings_collapsible.get_content_frame()
+
+    def setup_settings_panel(self, all_settings_content):
+        """설정 패널의 위젯을 만듭니다. (설정을 처음 펼칠 때 한 번)"""
+        from tkinter import ttk
 
         time_settings_labelframe = ttk.Labelframe(
             all_settings_content, text="시간 설정", style="Custom.TLabelframe"
@@ -606,11 +1185,12 @@ class PomodoroApp:
         )
         self.dinner_time_entry.grid(row=1, column=1, padx=5)
         self.toggle_meal_time_entries_visibility()
+        if self.engine.is_running:  # 타이머가 도는 중에 처음 펼친 경우
+            self.disable_timer_entries()
 
     def load_settings(self):
         try:
-            with open(self.settings_path, "r") as f:
-                settings = json.load(f)
+            settings = read_json(self.settings_path)
             self.work_minutes_var.set(
                 settings.get("work_minutes", str(self.work_minutes_default))
             )
@@ -640,17 +1220,32 @@ class PomodoroApp:
             self.long_rest_duration_var.set(
                 settings.get("long_rest_duration", self.long_rest_duration_default)
             )
+            self.long_rest_prompt_timeout = settings.get(
+                "long_rest_prompt_timeout_seconds", LONG_REST_PROMPT_TIMEOUT_SECONDS
+            )
+            self.long_rest_prompt_default = settings.get(
+                "long_rest_prompt_default_accept", LONG_REST_PROMPT_DEFAULT_ACCEPT
+            )
+            self.resume_policy = settings.get("resume_policy", RESUME_DEFAULT_POLICY)
+            if self.resume_policy not in RESUME_POLICIES:
+                self.resume_policy = RESUME_DEFAULT_POLICY
+            self.resume_max_downtime = settings.get(
+                "resume_max_downtime_seconds", RESUME_MAX_DOWNTIME_SECONDS
+            )
+            self.use_binary_session_log = settings.get("use_binary_session_log", False)
+            self.use_control_socket = settings.get("use_control_socket", True)
+            self.use_status_file = settings.get("use_status_file", True)
+            self.metrics_port = settings.get("metrics_port")
             if settings.get("last_saved_date") == str(datetime.date.today()):
-                self.total_work_seconds_today = settings.get(
-                    "total_work_seconds_today", 0
+                # 기록 파일이 없던 버전에서 쌓은 오늘 통계를 옮겨 옵니다.
+                self.history.import_daily_totals(
+                    str(datetime.date.today()),
+                    settings.get("total_work_seconds_today", 0),
+                    settings.get("pomodoro_cycles_today", 0),
                 )
-                self.pomodoro_cycles_today = settings.get("pomodoro_cycles_today", 0)
-            else:  # 날짜가 다르면 통계 초기화
-                self.total_work_seconds_today = 0
-                self.pomodoro_cycles_today = 0
         except (
             FileNotFoundError,
-            json.JSONDecodeError,
+            ValueError,  # 깨진 JSON (json.JSONDecodeError)
             TypeError,
         ):  # TypeError 추가 (키 부재 시 기본값 처리 위함)
             self.work_minutes_var.set(str(self.work_minutes_default))
@@ -663,11 +1258,9 @@ class PomodoroApp:
             self.use_long_rest_suggestion_var.set(self.use_long_rest_suggestion_default)
             self.long_rest_cycle_threshold_var.set(self.long_rest_cycle_default)
             self.long_rest_duration_var.set(self.long_rest_duration_default)
-            self.total_work_seconds_today = 0
-            self.pomodoro_cycles_today = 0
 
-    def save_settings(self):
-        settings = {
+    def settings_snapshot(self):
+        return {
             "work_minutes": self.work_minutes_var.get(),
             "rest_minutes": self.rest_minutes_var.get(),
             "always_on_top": self.always_on_top_var.get(),
@@ -679,34 +1272,251 @@ class PomodoroApp:
             "use_long_rest_suggestion": self.use_long_rest_suggestion_var.get(),
             "long_rest_cycle_threshold": self.long_rest_cycle_threshold_var.get(),
             "long_rest_duration": self.long_rest_duration_var.get(),
-            "total_work_seconds_today": self.total_work_seconds_today,
-            "pomodoro_cycles_today": self.pomodoro_cycles_today,
+            "long_rest_prompt_timeout_seconds": self.long_rest_prompt_timeout,
+            "long_rest_prompt_default_accept": self.long_rest_prompt_default,
+            "resume_policy": self.resume_policy,
+            "resume_max_downtime_seconds": self.resume_max_downtime,
+            "use_binary_session_log": self.use_binary_session_log,
+            "use_control_socket": self.use_control_socket,
+            "use_status_file": self.use_status_file,
+            "metrics_port": self.metrics_port,
+            "scheduler_backend": self.scheduler_backend,
+            "total_work_seconds_today": self.engine.total_work_seconds_today,
+            "pomodoro_cycles_today": self.engine.pomodoro_cycles_today,
             "last_saved_date": str(datetime.date.today()),
         }
+
+    def save_settings(self):
+        """미뤄 둔 저장을 지금 바로 합니다. (임시 파일에 쓴 뒤 바꿔 끼우기)"""
+        self.settings_persister.flush()
+
+    def load_today_stats(self):
+        totals = self.history.daily_totals(str(datetime.date.today()))
+        self.engine.total_work_seconds_today = totals.focus_seconds
+        self.engine.pomodoro_cycles_today = totals.pomodoro_cycles
+
+    def open_session_log(self):
+        if not self.use_binary_session_log:
+            return
+        from pomodoro_session_log import (
+            SESSION_LOG_FILENAME,
+            SessionLog,
+            SessionLogError,
+        )
+
+        path = os.path.join(os.path.dirname(self.settings_path), SESSION_LOG_FILENAME)
         try:
-            with open(self.settings_path, "w") as f:
-                json.dump(settings, f, indent=4)
-        except Exception as e:
-            # 사용자에게 오류를 알리는 대신 콘솔에만 출력하거나 로그 파일에 기록할 수 있습니다.
-            # messagebox.showerror("오류", f"설정을 저장하는 데 실패했어요: {e}", parent=self.root) # 필요시 주석 해제
-            print(f"설정 저장 중 오류: {e}")
+            self.session_log = SessionLog(path)
+        except (OSError, SessionLogError) as e:
+            print(f"세션 기록 파일을 열지 못했어요: {e}")
+            return
+        if not len(self.session_log):
+            # 처음 켰을 때는 지금까지의 기록을 한 번에 옮겨 둡니다.
+            self.session_log.extend(self.history.sessions_between("", "9999-12-31"))
+
+    def resume_session(self):
+        """지난번에 끝나지 않은 세션 기록이 있으면 resume_policy대로 이어갑니다."""
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint is None:
+            return
+        resumed = self.engine.resume(
+            checkpoint, self.resume_policy, self.resume_max_downtime
+        )
+        # 이어가지 않은 세션도 기록에는 남으므로 오늘 통계를 다시 맞춥니다.
+        self.load_today_stats()
+        self.update_stats_display()
+        if resumed:
+            self.disable_timer_entries()
+            self.set_timer_buttons(running=True)
+            self.prompt_banner.notify("끝나지 않은 세션을 이어서 진행해요.")
+        self.save_checkpoint()
+
+    def save_checkpoint(self):
+        """진행 중인 세션을 파일에 남기고, 진행 중이면 잠시 뒤 다시 남깁니다."""
+        self.scheduler.cancel(self.checkpoint_call)
+        self.checkpoint_call = None
+        checkpoint = self.engine.checkpoint()
+        try:
+            save_checkpoint(self.checkpoint_path, checkpoint)
+        except OSError as e:
+            print(f"세션 기록 중 오류: {e}")
+        if checkpoint is not None:
+            self.checkpoint_call = self.scheduler.call_later(
+                CHECKPOINT_INTERVAL_SECONDS, self.save_checkpoint
+            )
+
+    def attach_instance_server(self, server):
+        """나중에 켠 프로그램이 보내는 명령(pomodoro_instance)을 받기 시작합니다."""
+        self.instance_server = server
+        self.root.tk.createfilehandler(
+            server.sock, tk.READABLE, self.on_instance_server_ready
+        )
+
+    def on_instance_server_ready(self, file, mask):
+        self.instance_server.accept_ready(self.handle_instance_command)
+
+    def handle_instance_command(self, command, message):
+        if command == "show":
+            self.show_window()
+        elif command == "start":
+            self.show_window()
+            self.start_timer()
+        elif command == "stop":
+            self.stop_timer()
+        else:
+            return {"ok": False, "error": f"알 수 없는 명령이에요: {command}"}
+        return {
+            "ok": True,
+            "mode": self.engine.mode,
+            "remaining_seconds": self.engine.remaining_seconds,
+            "total_work_seconds_today": self.engine.total_work_seconds_today,
+            "pomodoro_cycles_today": self.engine.pomodoro_cycles_today,
+        }
+
+    def start_control_server(self):
+        """상태 표시줄/스크립트가 쓰는 제어 소켓을 엽니다. (pomodoro_control)"""
+        if not self.use_control_socket or self.control_server is not None:
+            return
+        self.main_thread_calls = MainThreadCalls()
+        self.root.tk.createfilehandler(
+            self.main_thread_calls, tk.READABLE, self.on_main_thread_calls_ready
+        )
+        self.control_server = ControlServer(
+            control_socket_path(self.settings_path),
+            self.handle_control_command,
+            self.main_thread_calls,
+        )
+        self.control_server.publish("ready", engine_state(self.engine))
+        self.control_server.start()
+
+    def open_status_file(self):
+        """상태 표시줄이 읽을 상태 파일을 엽니다. (pomodoro_status_file)"""
+        if not self.use_status_file or self.status_writer is not None:
+            return
+        try:
+            self.status_writer = StatusWriter(status_file_path(self.settings_path))
+        except (OSError, ValueError) as e:
+            print(f"상태 파일을 열지 못했어요: {e}")
+            return
+        self.status_writer.write(engine_state(self.engine))
+
+    def start_metrics(self):
+        """예약 콜백의 지연을 재기 시작하고 /metrics를 엽니다. (pomodoro_metrics)"""
+        if not self.metrics_port or self.metrics_server is not None:
+            return
+        from pomodoro_metrics import CallbackMetrics, MetricsServer
+
+        metrics = CallbackMetrics()
+        metrics_server = MetricsServer(metrics, self.metrics_port)
+        try:
+            metrics_server.start()
+        except OSError as e:
+            print(f"지연 측정 포트를 열지 못했어요: {e}")
+            return
+        self.scheduler.metrics = metrics
+        self.metrics_server = metrics_server
+
+    def publish_state(self, event):
+        """제어 소켓 구독자와 상태 파일에 바뀐 상태를 알립니다."""
+        if self.control_server is None and self.status_writer is None:
+            return
+        state = engine_state(self.engine)
+        if self.control_server is not None:
+            self.control_server.publish(event_name(event), state)
+        if self.status_writer is not None:
+            self.status_writer.write(state)
+
+    def on_main_thread_calls_ready(self, file, mask):
+        self.main_thread_calls.run_pending()
+
+    def handle_control_command(self, command, message):
+        """제어 소켓의 start/stop/skip/metrics를 메인 스레드에서 실행합니다."""
+        if command == "metrics":
+            # 화면 갱신을 건너뛴 횟수는 metrics_port와 관계없이 늘 셉니다.
+            reply = {"ok": True, "render": self.renderer.counters()}
+            if self.scheduler.metrics is not None:
+                reply["metrics"] = self.scheduler.metrics.snapshot()
+            return reply
+        if command == "start":
+            if self.invalid_timer_settings:  # 경고창 대신 오류로 답합니다.
+                field = TIMER_SETTING_LABELS[self.invalid_timer_settings[0]]
+                return {"ok": False, "error": f"{field}을 확인해주세요."}
+            self.start_timer()
+        elif command == "stop":
+            self.stop_timer()
+        elif command == "skip":
+            if not self.engine.can_end_rest():
+                return {"ok": False, "error": "지금은 휴식을 넘길 수 없어요."}
+            self.engine.end_rest()
+        return {"ok": True, "state": engine_state(self.engine)}
+
+    def show_window(self):
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
 
     def on_closing(self):
+        if self.engine.is_counting_down():
+            # 진행 중인 세션은 끝내지 않고 기록만 남겨 두고, 다음에 켤 때
+            # resume_policy대로 이어갑니다. 기록을 지우는 것은 멈춤뿐입니다.
+            self.save_checkpoint()
+        elif self.engine.is_running:  # 이어갈 카운트다운이 없는 경우
+            self.engine.stop(END_CLOSED)
+        if self.instance_server is not None:
+            self.root.tk.deletefilehandler(self.instance_server.sock)
+            self.instance_server.close()
+            self.instance_server = None
+        if self.control_server is not None:
+            self.control_server.close()
+            self.control_server = None
+            self.root.tk.deletefilehandler(self.main_thread_calls)
+            self.main_thread_calls.close()
+        if self.status_writer is not None:
+            self.status_writer.close(engine_state(self.engine))
+            self.status_writer = None
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+            self.metrics_server = None
+        self.tk_scheduler.cancel()
         self.save_settings()
+        self.history.close()
+        if self.session_log is not None:
+            self.session_log.close()
         self.root.destroy()
 
     def update_stats_display(self):
-        total_mins = self.total_work_seconds_today // 60
-        if total_mins == 0 and self.total_work_seconds_today > 0:
-            time_str = f"{self.total_work_seconds_today}초"
+        # 날짜별 합계는 기록할 때 함께 갱신되므로 여기서는 찾아보기만 합니다.
+        totals = self.history.daily_totals(str(datetime.date.today()))
+        total_work_seconds_today = totals.focus_seconds
+        total_mins = total_work_seconds_today // 60
+        if total_mins == 0 and total_work_seconds_today > 0:
+            time_str = f"{total_work_seconds_today}초"
         elif total_mins < 60:
             time_str = f"{total_mins}분"
         else:
             hours = total_mins // 60
             mins = total_mins % 60
             time_str = f"{hours}시간 {mins}분"
-        cycle_str = f"{self.pomodoro_cycles_today}회"
-        self.stats_label.config(text=f"오늘 집중 {time_str} / 뽀모도로 {cycle_str}")
+        cycle_str = f"{totals.pomodoro_cycles}회"
+        self.renderer.configure(
+            self.stats_label, text=f"오늘 집중 {time_str} / 뽀모도로 {cycle_str}"
+        )
+
+    def show_stats_window(self, event=None):
+        if self.stats_window is not None:
+            self.stats_window.window.lift()
+            self.stats_window.refresh()
+            return
+        self.stats_window = StatsWindow(
+            self.root,
+            self.scheduler,
+            self.history,
+            session_log_path=self.session_log and self.session_log.path,
+            on_close=self.on_stats_closed,
+        )
+
+    def on_stats_closed(self):
+        self.stats_window = None
 
     def update_total_work_time_display(self):
         self.update_stats_display()
@@ -738,6 +1548,8 @@ class PomodoroApp:
             self.adjust_window_size()
 
     def validate_positive_integer(self, val_str, field_name="값"):
+        from tkinter import messagebox
+
         try:
             value = int(val_str)
         except ValueError:
@@ -752,47 +1564,55 @@ class PomodoroApp:
             return None
         return value
 
-    def validate_time_input(self, time_str, field_name="시간"):
-        return self.validate_positive_integer(time_str, field_name)
-
-    def validate_cycle_input(self, cycle_str, field_name="횟수"):
-        return self.validate_positive_integer(cycle_str, field_name)
-
-    def validate_meal_time_format(self, time_str, meal_name):
-        try:
-            return datetime.datetime.strptime(time_str, "%H:%M").time()
-        except ValueError:
-            messagebox.showwarning(
-                "시간 형식 오류",
-                f"{meal_name} 시간은 HH:MM 형식으로 입력해주세요 (예: 12:30).",
-                parent=self.root,
-            )
-            return None
+    def refresh_timer_settings(self, *args):
+        """입력값이 바뀔 때 한 번만 검사해서 타이머 설정 스냅샷을 바꿔 끼웁니다."""
+        settings, invalid_fields = parse_timer_settings(
+            self.work_minutes_var.get(),
+            self.rest_minutes_var.get(),
+            self.force_rest_var.get(),
+            self.use_long_rest_suggestion_var.get(),
+            self.long_rest_cycle_threshold_var.get(),
+            self.long_rest_duration_var.get(),
+            previous=self.timer_settings,
+            long_rest_prompt_timeout=self.long_rest_prompt_timeout,
+            long_rest_prompt_default=self.long_rest_prompt_default,
+        )
+        self.timer_settings = settings
+        for field in invalid_fields:
+            if field in TIMER_ENTRY_FIELDS:
+                continue
+            # 설정 파일에만 있는 값은 입력칸으로 고칠 수 없으므로 이전 값을 쓰고,
+            # 다음 저장 때 잘못된 값을 다시 쓰지 않도록 바꿔 둡니다.
+            label = TIMER_SETTING_LABELS.get(field, field)
+            print(f"설정의 {label} 값이 잘못되어 이전 값을 씁니다.")
+            if field == "long_rest_prompt_timeout":
+                self.long_rest_prompt_timeout = settings.long_rest_prompt_timeout
+        self.invalid_timer_settings = tuple(
+            field for field in invalid_fields if field in TIMER_ENTRY_FIELDS
+        )
+        self.engine.update_settings(settings)
 
     def start_timer(self):
-        if self.is_running:
+        if self.engine.is_running:
             return
-        work_minutes = self.validate_time_input(
-            self.work_minutes_var.get(), "집중 시간"
-        )
-        rest_minutes = self.validate_time_input(
-            self.rest_minutes_var.get(), "휴식 시간"
-        )
-        if work_minutes is None or rest_minutes is None:
+        if self.invalid_timer_settings:
+            # 시작 버튼을 누른 경우에만 잘못된 입력을 알려줍니다.
+            field = self.invalid_timer_settings[0]
+            raw_values = {
+                "work_minutes": self.work_minutes_var,
+                "rest_minutes": self.rest_minutes_var,
+                "long_rest_cycle_threshold": self.long_rest_cycle_threshold_var,
+                "long_rest_duration": self.long_rest_duration_var,
+            }
+            self.validate_positive_integer(
+                raw_values[field].get(), TIMER_SETTING_LABELS[field]
+            )
             return
 
-        long_rest_threshold = None
-        long_rest_duration = None
-        if self.use_long_rest_suggestion_var.get():
-            long_rest_threshold = self.validate_cycle_input(
-                self.long_rest_cycle_threshold_var.get(), "긴 휴식 반복 횟수"
-            )
-            long_rest_duration = self.validate_time_input(
-                self.long_rest_duration_var.get(), "긴 휴식 추천 시간"
-            )
-            if long_rest_threshold is None or long_rest_duration is None:
-                return
+        self.disable_timer_entries()
+        self.engine.start()
 
+    def disable_timer_entries(self):
         entry_list_to_disable = [
             self.work_entry,
             self.rest_entry,
@@ -807,112 +1627,111 @@ class PomodoroApp:
             if entry_widget:
                 entry_widget.config(state=tk.DISABLED, fg=COLOR_LABEL_MUTED)
 
-        self.current_mode = "집중"
-        self.remaining_seconds = work_minutes * 60
-        self.last_session_work_seconds = 0
-        self.is_running = True
-        self.start_button.config(state=tk.DISABLED, bg=COLOR_LABEL_MUTED)
-        self.stop_button.config(state=tk.NORMAL, bg=COLOR_BUTTON)
-        self.status_label.config(text=f"집중! 🔥")
-        self.update_timer_display()
-        self.countdown()
-
     def countdown(self):
-        if not self.is_running or self.remaining_seconds < 0:
+        self.countdown_call = None
+        if not self.engine.is_running:
             return
-        if self.current_mode == "집중":
-            self.last_session_work_seconds += 1
-        if self.remaining_seconds == 0:
-            if self.current_mode == "집중":
-                self.total_work_seconds_today += self.last_session_work_seconds
-                self.pomodoro_cycles_today += 1
-                self.update_stats_display()
-                if self.use_long_rest_suggestion_var.get():
-                    long_rest_threshold = self.validate_cycle_input(
-                        self.long_rest_cycle_threshold_var.get(), "긴 휴식 반복 횟수"
-                    )  # 값 다시 가져오기
-                    long_rest_duration = self.validate_time_input(
-                        self.long_rest_duration_var.get(), "긴 휴식 추천 시간"
-                    )  # 값 다시 가져오기
-                    if (
-                        long_rest_threshold is not None
-                        and long_rest_duration is not None
-                        and self.pomodoro_cycles_today > 0
-                        and self.pomodoro_cycles_today % long_rest_threshold == 0
-                    ):
-                        if messagebox.askyesno(
-                            "긴 휴식 시간!",
-                            f"벌써 {self.pomodoro_cycles_today}번째 뽀모도로를 마쳤어요! 대단해요! 👍\n{long_rest_duration}분 동안 긴 휴식을 가져보는 건 어때요?",
-                            parent=self.root,
-                        ):
-                            self.current_mode = "긴 휴식"
-                            self.remaining_seconds = long_rest_duration * 60
-                            self.status_label.config(text="긴 휴식 중... 😌")
-                            self.update_timer_display()
-                            self.show_overlay_window(
-                                long_rest_duration, is_long_rest=True
-                            )
-                            return
-            self.switch_mode()
-        else:
-            self.remaining_seconds -= 1
+        self.engine.poll()
+        self.schedule_countdown()
+
+    def schedule_countdown(self):
+        """엔진이 알려준 다음 초 경계에 맞춰 countdown을 예약합니다."""
+        self.scheduler.cancel(self.countdown_call)
+        self.countdown_call = None
+        wakeup = self.engine.next_wakeup()
+        if wakeup is None:
+            return
+        self.countdown_call = self.scheduler.call_at(wakeup, self.countdown)
+
+    def on_engine_event(self, event):
+        """엔진 이벤트를 받아 화면에 반영합니다."""
+        if isinstance(event, Tick):
+            # 메인 타이머와 오버레이는 같은 Tick으로 함께 갱신되어 어긋나지 않습니다.
             self.update_timer_display()
-            self.timer_id = self.root.after(1000, self.countdown)
+            self.update_overlay_elements()
+        elif isinstance(event, ModeChanged):
+            self.on_mode_changed(event)
+            self.save_checkpoint()
+        elif isinstance(event, SessionCompleted):
+            record = self.history.record_session(event)
+            if self.session_log is not None:
+                self.session_log.append(record)
+        elif isinstance(event, StatsChanged):
+            self.update_stats_display()
+            # 세션이 끝날 때마다 오늘 통계를 바로 저장해 둡니다.
+            self.save_settings()
+        elif isinstance(event, LongRestSuggested):
+            note = ""
+            if event.timeout_seconds:
+                choice = "긴 휴식" if event.default_accept else "짧은 휴식"
+                note = f"{event.timeout_seconds:g}초 동안 답이 없으면 {choice}으로 넘어가요."
+            self.prompt_banner.ask(
+                f"벌써 {event.cycles}번째 뽀모도로를 마쳤어요! 대단해요! 👍\n{event.duration_minutes}분 동안 긴 휴식을 가져보는 건 어때요?",
+                self.engine.answer_long_rest,
+                yes_text="긴 휴식할래요",
+                no_text="짧게 쉴게요",
+                note=note,
+            )
+            self.root.lift()
+            self.save_checkpoint()
+        elif isinstance(event, RestFinished):
+            self.update_overlay_elements()
+            self.save_checkpoint()
+        elif isinstance(event, SettingsInvalid):
+            if event.field == "rest_minutes":
+                message = "휴식 시간을 확인해주세요. 타이머를 멈춥니다."
+            else:
+                message = "집중 시간을 확인해주세요. 타이머를 멈춥니다."
+            self.prompt_banner.notify(message)
+        elif isinstance(event, Stopped):
+            self.on_timer_stopped()
+            self.save_checkpoint()
+        if not isinstance(event, Tick):
+            self.publish_state(event)
+
+    def on_mode_changed(self, event):
+        if self.prompt_banner.is_asking():  # 시간이 지나 기본 선택이 적용된 경우
+            self.prompt_banner.hide()
+        if event.mode == MODE_WORK:
+            self.close_overlay_window()
+            self.renderer.configure(self.status_label, text=f"집중! 🔥")
+            self.set_timer_buttons(running=True)
+        elif event.mode == MODE_REST:
+            self.renderer.configure(self.status_label, text=f"휴식 시간 🧘")
+            self.show_overlay_window(event.duration_seconds // 60)
+        elif event.mode == MODE_LONG_REST:
+            self.renderer.configure(self.status_label, text="긴 휴식 중... 😌")
+            self.show_overlay_window(event.duration_seconds // 60, is_long_rest=True)
+        self.update_timer_display()
+        self.schedule_countdown()
 
     def update_timer_display(self):
-        mins, secs = divmod(self.remaining_seconds, 60)
-        self.time_label.config(text=f"{mins:02d}:{secs:02d}")
-
-    def switch_mode(self):
-        if self.current_mode == "집중":
-            self.current_mode = "휴식"
-            rest_minutes = self.validate_time_input(
-                self.rest_minutes_var.get(), "휴식 시간"
+        mins, secs = divmod(self.engine.remaining_seconds, 60)
+        self.renderer.configure(self.time_label, text=f"{mins:02d}:{secs:02d}")
+
+    def set_timer_buttons(self, running):
+        """타이머가 도는 중이면 시작 버튼을, 멈춰 있으면 정지 버튼을 끕니다."""
+        if running:
+            self.renderer.configure(
+                self.start_button, state=tk.DISABLED, bg=COLOR_LABEL_MUTED
             )
-            if rest_minutes is None:
-                self.stop_timer()
-                messagebox.showerror(
-                    "오류 발생",
-                    "휴식 시간을 확인해주세요. 타이머를 멈춥니다.",
-                    parent=self.root,
-                )
-                return
-            self.remaining_seconds = rest_minutes * 60
-            self.status_label.config(text=f"휴식 시간 🧘")
-            self.show_overlay_window(rest_minutes)
-        elif self.current_mode == "휴식" or self.current_mode == "긴 휴식":
-            self.current_mode = "집중"
-            work_minutes = self.validate_time_input(
-                self.work_minutes_var.get(), "집중 시간"
+            self.renderer.configure(self.stop_button, state=tk.NORMAL, bg=COLOR_BUTTON)
+        else:
+            self.renderer.configure(self.start_button, state=tk.NORMAL, bg=COLOR_BUTTON)
+            self.renderer.configure(
+                self.stop_button, state=tk.DISABLED, bg=COLOR_LABEL_MUTED
             )
-            if work_minutes is None:
-                self.stop_timer()
-                messagebox.showerror(
-                    "오류 발생",
-                    "집중 시간을 확인해주세요. 타이머를 멈춥니다.",
-                    parent=self.root,
-                )
-                return
-            self.remaining_seconds = work_minutes * 60
-            self.last_session_work_seconds = 0
-            self.status_label.config(text=f"집중! 🔥")
-            self.update_timer_display()
-            if self.is_running:
-                self.timer_id = self.root.after(1000, self.countdown)
 
     def stop_timer(self):
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
-        if self.is_running and self.current_mode == "집중":
-            self.total_work_seconds_today += self.last_session_work_seconds
-            self.update_stats_display()
-        self.is_running = False
-        self.current_mode = "정지됨"
-        self.last_session_work_seconds = 0
-        self.status_label.config(text="잠시 멈춤 ⏸️")
-        self.start_button.config(state=tk.NORMAL, bg=COLOR_BUTTON)
-        self.stop_button.config(state=tk.DISABLED, bg=COLOR_LABEL_MUTED)
+        self.engine.stop()
+
+    def on_timer_stopped(self):
+        if self.prompt_banner.is_asking():
+            self.prompt_banner.hide()
+        self.scheduler.cancel(self.countdown_call)
+        self.countdown_call = None
+        self.renderer.configure(self.status_label, text="잠시 멈춤 ⏸️")
+        self.set_timer_buttons(running=False)
 
         entry_list_to_enable = [
             self.work_entry,
@@ -930,185 +1749,80 @@ class PomodoroApp:
 
         self.toggle_meal_time_entries_visibility()
         self.toggle_long_rest_settings_visibility()
-        if self.overlay_window and self.overlay_window.winfo_exists():
-            self.overlay_window.destroy()
-            self.overlay_window = None
-
-    def close_overlay_and_start_work(self, event=None, next_mode="집중"):
-        if self.overlay_window and self.overlay_window.winfo_exists():
-            self.overlay_window.destroy()
-            self.overlay_window = None
-        if next_mode == "집중":
-            self.current_mode = "집중"
-            work_minutes = self.validate_time_input(
-                self.work_minutes_var.get(), "집중 시간"
+        self.close_overlay_window()
+
+    def get_rest_overlay(self):
+        if self.rest_overlay is None:
+            self.rest_overlay = RestOverlay(
+                self.root, self.close_overlay_and_start_work, self.renderer
             )
-            if work_minutes is None:
-                self.stop_timer()
-                messagebox.showerror(
-                    "앗!",
-                    "집중 시간을 확인해주세요. 타이머를 시작할 수 없어요.",
-                    parent=self.root,
-                )
-                return
-            self.remaining_seconds = work_minutes * 60
-            self.last_session_work_seconds = 0
-            self.status_label.config(text=f"집중! 🔥")
-        self.update_timer_display()
-        if not self.is_running:
-            self.is_running = True
-            self.start_button.config(state=tk.DISABLED, bg=COLOR_LABEL_MUTED)
-            self.stop_button.config(state=tk.NORMAL, bg=COLOR_BUTTON)
-        self.timer_id = self.root.after(1000, self.countdown)
+        return self.rest_overlay
+
+    def close_overlay_window(self):
+        if self.rest_overlay is not None:
+            self.rest_overlay.hide()
+
+    def close_overlay_and_start_work(self, event=None):
+        self.engine.end_rest()
 
     def show_overlay_window(self, duration_minutes, is_long_rest=False):
-        if self.overlay_window and self.overlay_window.winfo_exists():
-            self.overlay_window.destroy()
-        duration_seconds = duration_minutes * 60
-        self.overlay_window = tk.Toplevel(self.root)
-        self.overlay_window.attributes("-fullscreen", True)
-        self.overlay_window.attributes("-topmost", True)
-        self.overlay_window.attributes("-alpha", 0.92)
-        self.overlay_window.configure(bg="black")
+        self.overlay_is_long_rest = is_long_rest
         if is_long_rest:
             main_message = f"수고했어요! 긴 휴식 시간이에요.\n{duration_minutes}분 동안 편안하게 쉬세요. ☕"
         else:
             main_message = (
                 f"쉬는 시간이에요!\n{duration_minutes}분 동안 잠시 쉬어가세요."
             )
-        self.overlay_message_label = tk.Label(
-            self.overlay_window,
-            text=main_message,
-            font=(FONT_FAMILY, FONT_SIZE_OVERLAY_MESSAGE, "bold"),
-            fg="white",
-            bg="black",
-            justify="center",
-        )
-        self.overlay_message_label.pack(
-            expand=False, pady=(self.overlay_window.winfo_screenheight() // 4.5, 15)
-        )
-        self.overlay_time_label = tk.Label(
-            self.overlay_window,
-            text="",
-            font=(FONT_FAMILY, FONT_SIZE_OVERLAY_TIME, "bold"),
-            fg="white",
-            bg="black",
-        )
-        self.overlay_time_label.pack(pady=15)
-        self.click_to_close_label = tk.Label(
-            self.overlay_window,
-            text="",
-            font=(FONT_FAMILY, FONT_SIZE_OVERLAY_CLICK_PROMPT),
-            fg=COLOR_LABEL_MUTED,
-            bg="black",
-            justify="center",
+        overlay = self.get_rest_overlay()
+        overlay.show(main_message)
+        self.update_overlay_elements()
+
+    def update_overlay_elements(self):
+        """엔진의 남은 휴식 시간과 상태에 맞춰 오버레이를 갱신합니다."""
+        overlay = self.rest_overlay
+        if overlay is None or not overlay.is_visible():
+            return
+        seconds_left = max(self.engine.remaining_seconds, 0)
+        mins, secs = divmod(seconds_left, 60)
+        overlay.set_text(overlay.time_label, f"{mins:02d}:{secs:02d}")
+        click_message = "화면을 클릭하면 휴식이 끝나고, 바로 다음 집중 시간이 시작돼요."
+        if self.overlay_is_long_rest:
+            click_message = "긴 휴식 중... 화면을 클릭하여 종료할 수 있어요."
+        elif self.engine.rest_finished:
+            overlay.set_text(
+                overlay.message_label,
+                "휴식 끝! 다음 집중을 위해 화면을 클릭해주세요.",
+            )
+        elif self.force_rest_var.get():
+            click_message = "정해진 시간 동안은 화면을 클릭해도 닫히지 않아요."
+        overlay.set_text(overlay.click_to_close_label, click_message)
+        overlay.set_clickable(self.engine.can_end_rest())
+
+    def rebuild_meal_alerts(self, *args):
+        """식사 시간 설정이 바뀌었을 때만 알림 목록을 다시 만들고 예약합니다."""
+        if self.use_meal_alert_var.get():
+            meal_times = {
+                name: var.get() for name, var in self.meal_times_vars.items()
+            }
+        else:
+            meal_times = {}  # 알림을 꺼도 자정의 통계 초기화는 예약됩니다.
+        self.meal_schedule.set_times(meal_times)
+        self.schedule_meal_check()
+
+    def schedule_meal_check(self):
+        self.scheduler.cancel(self.meal_check_call)
+        self.meal_check_call = self.scheduler.call_later(
+            self.meal_schedule.seconds_until_next_check(), self.check_meal_time
         )
-        self.click_to_close_label.pack(pady=(20, 0))
 
-        def update_overlay_elements(seconds_left):
-            if not (self.overlay_window and self.overlay_window.winfo_exists()):
-                return
-            if seconds_left >= 0:
-                mins, secs = divmod(seconds_left, 60)
-                self.overlay_time_label.config(text=f"{mins:02d}:{secs:02d}")
-                click_message = (
-                    "화면을 클릭하면 휴식이 끝나고, 바로 다음 집중 시간이 시작돼요."
-                )
-                if is_long_rest and seconds_left == 0:
-                    self.overlay_message_label.config(
-                        text="긴 휴식 끝! 다시 시작할 준비가 되면 화면을 클릭하세요."
-                    )
-                if self.force_rest_var.get() and not is_long_rest:
-                    if seconds_left == 0:
-                        self.overlay_message_label.config(
-                            text="휴식 끝! 다음 집중을 위해 화면을 클릭해주세요."
-                        )
-                        self.click_to_close_label.config(text=click_message)
-                        self.overlay_window.bind(
-                            "<Button-1>", self.close_overlay_and_start_work
-                        )
-                        self.overlay_window.config(cursor="hand2")
-                    else:
-                        self.click_to_close_label.config(
-                            text="정해진 시간 동안은 화면을 클릭해도 닫히지 않아요."
-                        )
-                        self.overlay_window.unbind("<Button-1>")
-                        self.overlay_window.config(cursor="")
-                else:
-                    self.click_to_close_label.config(
-                        text=(
-                            click_message
-                            if not (is_long_rest and seconds_left > 0)
-                            else "긴 휴식 중... 화면을 클릭하여 종료할 수 있어요."
-                        )
-                    )
-                    self.overlay_window.bind(
-                        "<Button-1>", self.close_overlay_and_start_work
-                    )
-                    self.overlay_window.config(cursor="hand2")
-                if self.force_rest_var.get() and not is_long_rest and seconds_left == 0:
-                    pass
-                elif seconds_left == 0 and not (
-                    self.force_rest_var.get() and not is_long_rest
-                ):
-                    self.close_overlay_and_start_work()
-                else:
-                    self.overlay_window.after(
-                        1000, update_overlay_elements, seconds_left - 1
-                    )
-
-        update_overlay_elements(duration_seconds)
-        initial_click_prompt = (
-            "화면을 클릭하면 휴식이 끝나고, 바로 다음 집중 시간이 시작돼요."
-        )
-        if is_long_rest:
-            initial_click_prompt = "긴 휴식 중... 화면을 클릭하여 종료할 수 있어요."
-        if not (self.force_rest_var.get() and not is_long_rest):
-            self.click_to_close_label.config(text=initial_click_prompt)
-            self.overlay_window.bind("<Button-1>", self.close_overlay_and_start_work)
-            self.overlay_window.config(cursor="hand2")
-        else:
-            self.click_to_close_label.config(
-                text="정해진 시간 동안은 화면을 클릭해도 닫히지 않아요."
-            )
-            self.overlay_window.unbind("<Button-1>")
-            self.overlay_window.config(cursor="")
-
-    def check_meal_time_periodically(self):
-        now = datetime.datetime.now()
-        current_date = now.date()
-        if current_date != self.today_date:
-            self.today_date = current_date
-            self.total_work_seconds_today = 0
-            self.pomodoro_cycles_today = 0
-            self.update_stats_display()
-            for meal in self.meal_alert_shown_today:
-                self.meal_alert_shown_today[meal] = False
-        if not self.use_meal_alert_var.get():
-            self.root.after(MEAL_CHECK_INTERVAL_MS, self.check_meal_time_periodically)
-            return
-        user_defined_times = {}
-        valid_times = True
-        for meal_name, time_var in self.meal_times_vars.items():
-            time_obj = self.validate_meal_time_format(time_var.get(), meal_name)
-            if time_obj is None:
-                valid_times = False
-                break
-            user_defined_times[meal_name] = time_obj
-        if not valid_times:
-            self.root.after(MEAL_CHECK_INTERVAL_MS, self.check_meal_time_periodically)
-            return
-        for meal_name, meal_time_obj in user_defined_times.items():
-            target_meal_dt = datetime.datetime.combine(current_date, meal_time_obj)
-            if (
-                target_meal_dt.hour == now.hour
-                and target_meal_dt.minute == now.minute
-                and not self.meal_alert_shown_today[meal_name]
-            ):
-                self.show_meal_alert(f"{meal_name} 시간이에요! 🍚 맛있는 식사 하세요!")
-                self.meal_alert_shown_today[meal_name] = True
-                break
-        self.root.after(MEAL_CHECK_INTERVAL_MS, self.check_meal_time_periodically)
+    def check_meal_time(self):
+        self.meal_check_call = None
+        new_day, due_meals = self.meal_schedule.check()
+        if new_day:
+            self.engine.reset_daily_stats()
+        for meal_name in due_meals:
+            self.show_meal_alert(f"{meal_name} 시간이에요! 🍚 맛있는 식사 하세요!")
+        self.schedule_meal_check()
 
     def show_meal_alert(self, message):
         meal_alert_win = tk.Toplevel(self.root)
@@ -1146,21 +1860,143 @@ class PomodoroApp:
             padx=6,
             pady=3,
         ).pack(pady=(0, 10))
+        # 소리는 창이 그려진 다음에 냅니다.
+        self.root.after_idle(play_notification_sound)
+
+
+def play_notification_sound():
+    """알림음을 냅니다. winsound가 없는 OS(맥, 리눅스)에서는 조용히 넘어갑니다."""
+    global _winsound
+    if _winsound is None:
         try:
-            import winsound
+            import winsound as _winsound
+        except ImportError:
+            _winsound = False
+    if not _winsound:
+        return
+    try:
+        _winsound.PlaySound(
+            "SystemNotification", _winsound.SND_ALIAS | _winsound.SND_ASYNC
+        )
+    except Exception:
+        pass
 
-            winsound.PlaySound(
-                "SystemNotification", winsound.SND_ALIAS | winsound.SND_ASYNC
-            )
-        except Exception:
-            pass
 
+_winsound = None  # play_notification_sound()가 처음 불릴 때 찾습니다.
+
+
+class StartupProfiler:
+    """--profile-startup: 켜질 때 단계별로 걸린 시간을 모아 보여줍니다.
+
+    enabled가 False이면 mark()는 아무것도 하지 않습니다.
+    """
+
+    def __init__(self, started_at=None, enabled=True):
+        self.enabled = enabled
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases = []
+        self._last = self.started_at
+
+    def mark(self, phase):
+        """직전 mark()부터 지금까지를 phase에 걸린 시간으로 기록합니다."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.started_at
+
+    def format(self):
+        lines = ["시작 단계별 시간"]
+        for phase, seconds in self.phases:
+            lines.append(f"  {phase:<24} {seconds * 1000:8.1f}ms")
+        lines.append(f"  {'합계':<24} {self.total() * 1000:8.1f}ms")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    profiler = StartupProfiler(IMPORT_STARTED_AT, enabled=False)
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:  # 인자가 있을 때만 argparse를 불러옵니다.
+        import argparse
+
+        parser = argparse.ArgumentParser(description="리프레시 뽀모도로")
+        parser.add_argument(
+            "command",
+            nargs="?",
+            choices=("show", "start", "stop"),
+            default="show",
+            help="이미 켜져 있으면 그 창에 넘길 명령 (start는 바로 타이머 시작)",
+        )
+        parser.add_argument(
+            "--profile-startup",
+            action="store_true",
+            help="켜질 때 단계별로 걸린 시간을 출력합니다.",
+        )
+        parser.add_argument(
+            "--profile-callbacks",
+            metavar="FILE",
+            help="느린 Tk 콜백을 stderr에 알리고 끌 때 FILE에 flamegraph용 스택을 씁니다.",
+        )
+        parser.add_argument(
+            "--slow-callback-ms",
+            type=float,
+            default=50.0,
+            help="--profile-callbacks에서 느리다고 볼 콜백 시간 (기본 50ms)",
+        )
+        args = parser.parse_args(argv)
+        profiler.enabled = args.profile_startup
+        command = args.command
+        if args.profile_callbacks:
+            from pomodoro_tk_profiler import CallbackProfiler
+
+            callback_profiler = CallbackProfiler(
+                args.profile_callbacks, threshold_seconds=args.slow_callback_ms / 1000
+            )
+            # Tk()보다 먼저 설치해야 PomodoroApp이 등록하는 콜백까지 감싸집니다.
+            callback_profiler.install()
+        else:
+            callback_profiler = None
+    else:
+        command = "show"
+        callback_profiler = None
+    profiler.mark("imports")
 
-if __name__ == "__main__":
     root = tk.Tk()
-    app = PomodoroApp(root)
+    profiler.mark("Tk()")
+    app = PomodoroApp(root, profiler=profiler)
+    if callback_profiler is not None:
+        # 예약은 Tk after 하나로 모여 실행되므로 예약마다 따로 잽니다.
+        app.scheduler.profiler = callback_profiler
     # 창 최소 크기 설정 (선택적) - 내용이 너무 작아져도 유지할 최소 크기
     # root.minsize(360, 480) # 예시: 너비 360, 높이 480
     root.update_idletasks()
     app.adjust_window_size()  # 초기 창 크기 조절
-    root.mainloop()
+    profiler.mark("adjust_window_size")
+    if INSTANCE_SERVER is not None:
+        app.attach_instance_server(INSTANCE_SERVER)
+        # 제어 소켓과 상태 파일은 잠금을 잡은 쪽만 씁니다.
+        app.open_status_file()
+        root.after_idle(app.start_control_server)
+        app.start_metrics()
+    if command == "start":
+        app.start_timer()
+    if profiler.enabled:
+
+        def on_first_idle():
+            profiler.mark("first mainloop idle")  # 오버레이 미리 만들기 포함
+            print(profiler.format(), file=sys.stderr)
+
+        root.after_idle(on_first_idle)
+    try:
+        root.mainloop()
+    finally:
+        if callback_profiler is not None:
+            callback_profiler.close()
+
+
+if __name__ == "__main__":
+    main()